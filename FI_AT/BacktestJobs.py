@@ -0,0 +1,201 @@
+import hashlib
+import inspect
+import itertools
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+import pandas as pd
+
+"""
+백테스트 결과 캐시와 백그라운드 실행
+
+- ResultCache: (전략, 파라미터, 데이터 fingerprint, 코드 버전) 키의 LRU 캐시, 전체 크기(byte) 기준으로 오래된 결과부터 제거
+  directory를 주면 결과를 pickle로 디스크에도 보관해서 프로세스 재시작 후에도 재사용
+- JobManager: 백테스트를 worker pool에서 실행하고 진행률을 조회할 수 있게 함 (Dash callback이 막히지 않도록)
+"""
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    # 데이터 내용 기반 hash (같은 데이터면 같은 값)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(df.columns), df.shape)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def code_version(*objects) -> str:
+    # 결과를 만드는 코드(전략/지표/체결/평가 모듈)의 소스 hash, 로직이 바뀌면 디스크에 남은 결과도 다른 키가 됨
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted({inspect.getsourcefile(obj) for obj in objects}):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def make_key(strategy_name: str, parameters: Dict[str, Any], fingerprint: str, version: str = "") -> str:
+    params = repr(sorted(parameters.items()))
+    return hashlib.blake2b(f"{strategy_name}|{params}|{fingerprint}|{version}".encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, directory: str = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (result, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        result = self._load(key)
+        if result is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        self.put(key, result, persist=False)
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result, persist: bool = True):
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(payload)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size <= self.max_bytes:
+                self._entries[key] = (result, size)
+                self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+        if persist and self.directory:
+            tmp = self._path(key) + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, self._path(key))
+
+    def __contains__(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                return True
+        return bool(self.directory) and os.path.exists(self._path(key))
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _load(self, key: str):
+        if not self.directory or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+
+class Job:
+    __slots__ = ("id", "key", "state", "progress", "result", "error", "started", "finished")
+
+    def __init__(self, job_id: str, key: str):
+        self.id = job_id
+        self.key = key
+        self.state = "pending"  # pending -> running -> done / failed
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.started = time.time()
+        self.finished = None
+
+
+class JobManager:
+    def __init__(self, cache: ResultCache = None, max_workers: int = 2, keep_jobs: int = 100):
+        self.cache = cache or ResultCache()
+        self.keep_jobs = keep_jobs
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="backtest")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._running: Dict[str, Job] = {}  # key -> 실행 중인 job (같은 요청 중복 실행 방지)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, fn: Callable[[Callable[[float], None]], Any]) -> str:
+        """
+        fn(progress)을 백그라운드에서 실행하고 job id를 반환. progress(0~1)로 진행률을 보고한다.
+        캐시에 결과가 있으면 실행 없이 즉시 완료된 job을, 같은 key가 실행 중이면 그 job을 반환한다.
+        """
+        cached = self.cache.get(key)
+        with self._lock:
+            if cached is None and key in self._running:
+                return self._running[key].id
+            job = Job(str(next(self._ids)), key)
+            self._jobs[job.id] = job
+            self._evict()
+            if cached is not None:
+                job.state, job.progress, job.result, job.finished = "done", 1.0, cached, time.time()
+                return job.id
+            self._running[key] = job
+        self._pool.submit(self._run, job, fn)
+        return job.id
+
+    def _run(self, job: Job, fn):
+        job.state = "running"
+
+        def progress(value: float):
+            job.progress = min(max(float(value), 0.0), 1.0)
+
+        try:
+            job.result = fn(progress)
+            self.cache.put(job.key, job.result)
+            job.progress = 1.0
+            job.state = "done"
+        except Exception as exc:
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.state = "failed"
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                self._running.pop(job.key, None)
+                self._evict()
+
+    def _evict(self):
+        # keep_jobs를 넘으면 오래된 job부터 끝난 것만 제거 (대기/실행 중인 job은 끝난 뒤에 제거 대상)
+        excess = len(self._jobs) - self.keep_jobs
+        if excess <= 0:
+            return
+        active = {job.id for job in self._running.values()}
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished is not None and job_id not in active]
+        for job_id in finished[:excess]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Job:
+        return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,153 @@
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+"""
+1분(또는 tick) bar를 받아 여러 상위 주기의 OHLCV bar를 동시에 만드는 스트리밍 집계기
+
+- 입력 bar 1개당 주기 수만큼의 O(1) 갱신
+- 버킷이 바뀌면 완성된 bar를 subscribe 한 callback에 1-row DataFrame으로 전달
+- 결과는 load_price의 resample(f"{interval}min").agg(...).dropna()와 같다 (trade_date의 datetime64 단위 포함)
+  (기준 시각 origin='start_day', volume 합계는 pandas와 같은 Kahan 보정 합)
+"""
+
+NS_PER_MIN = 60 * 10**9
+BAR_COLUMNS = ['trade_date', 'open', 'high', 'low', 'close', 'volume']
+
+
+class _PartialBar:
+    __slots__ = ("bucket", "open", "high", "low", "close", "volume", "_comp")
+
+    def __init__(self, bucket, o, h, l, c, v):
+        self.bucket = bucket
+        self.open, self.high, self.low, self.close = o, h, l, c
+        self.volume = 0.0
+        self._comp = 0.0
+        self.add_volume(v)
+
+    def update(self, h, l, c, v):
+        if h > self.high:
+            self.high = h
+        if l < self.low:
+            self.low = l
+        self.close = c
+        self.add_volume(v)
+
+    def add_volume(self, v):
+        # pandas group_sum과 같은 Kahan 보정 합
+        y = v - self._comp
+        t = self.volume + y
+        self._comp = t - self.volume - y
+        if self._comp != self._comp:
+            self._comp = 0.0
+        self.volume = t
+
+
+class BarAggregator:
+    def __init__(self, intervals: List[int], origin=None, unit: str = None):
+        """
+        intervals: 집계할 주기(분) 목록, 예) [5, 60, 1440]
+        origin: 버킷 기준 시각. None이면 첫 입력 bar 날짜의 자정 (pandas resample 기본값 'start_day')
+        unit: 출력 trade_date의 datetime64 단위 ('ns', 'us', ...). None이면 첫 입력의 단위를 따름
+              (resample 결과도 입력 단위를 유지하므로 같은 dtype이 됨, int 입력은 'ns')
+        """
+        self.intervals = list(dict.fromkeys(intervals))
+        self._steps = {iv: iv * NS_PER_MIN for iv in self.intervals}
+        self._origin = None if origin is None else pd.Timestamp(origin).value
+        self.unit = unit
+        self._bars: Dict[int, _PartialBar] = {}
+        self._subscribers: Dict[int, List[Callable[[pd.DataFrame], None]]] = {iv: [] for iv in self.intervals}
+
+    def subscribe(self, interval: int, callback: Callable[[pd.DataFrame], None]):
+        # 예) aggregator.subscribe(60, lambda bar: stream.append('60m', 'KTB3F', bar))
+        if interval not in self._subscribers:
+            raise ValueError(f"interval {interval} is not aggregated (intervals={self.intervals})")
+        self._subscribers[interval].append(callback)
+
+    def update(self, t, o, h, l, c, v=0.0):
+        """입력 bar 1개 반영. t는 Timestamp/datetime/int(ns) 모두 가능."""
+        if not isinstance(t, (int, np.integer)):
+            t = pd.Timestamp(t)
+            if self.unit is None:
+                self.unit = t.unit
+            t = t.value
+        t = int(t)
+        if self._origin is None:
+            self._origin = t - t % (1440 * NS_PER_MIN)
+        for iv in self.intervals:
+            step = self._steps[iv]
+            bucket = self._origin + ((t - self._origin) // step) * step
+            bar = self._bars.get(iv)
+            if bar is None or bar.bucket != bucket:
+                if bar is not None:
+                    if bucket < bar.bucket:
+                        raise ValueError("input bars must be in time order")
+                    self._emit(iv, bar)
+                self._bars[iv] = _PartialBar(bucket, o, h, l, c, v)
+            else:
+                bar.update(h, l, c, v)
+
+    def update_frame(self, df: pd.DataFrame, time_column: str = 'trade_date'):
+        # DataFrame의 여러 bar를 순서대로 반영 (row마다 pandas 접근을 하지 않도록 list로 변환)
+        times = pd.to_datetime(df[time_column])
+        if self.unit is None:
+            self.unit = times.dt.unit
+        times = times.to_numpy(dtype='datetime64[ns]').view(np.int64).tolist()
+        columns = [df[c].to_numpy(dtype=float).tolist() for c in BAR_COLUMNS[1:]]
+        for row in zip(times, *columns):
+            self.update(*row)
+
+    def close_until(self, t):
+        # 실시간용: 버킷 종료 시각이 t 이하인 진행 중 bar를 다음 입력을 기다리지 않고 완성 처리
+        t = pd.Timestamp(t).value
+        for iv in self.intervals:
+            bar = self._bars.get(iv)
+            if bar is not None and bar.bucket + self._steps[iv] <= t:
+                self._emit(iv, bar)
+                del self._bars[iv]
+
+    def flush(self):
+        # 데이터 끝: 마지막(미완성) 버킷까지 내보냄 (resample 결과의 마지막 행에 해당)
+        for iv in self.intervals:
+            bar = self._bars.pop(iv, None)
+            if bar is not None:
+                self._emit(iv, bar)
+
+    def current(self, interval: int) -> pd.DataFrame:
+        bar = self._bars.get(interval)
+        return self._to_frame(bar) if bar is not None else self._empty_frame()
+
+    def _emit(self, interval, bar):
+        callbacks = self._subscribers[interval]
+        if callbacks:
+            frame = self._to_frame(bar)
+            for callback in callbacks:
+                callback(frame)
+
+    def _empty_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame({c: np.empty(0) for c in BAR_COLUMNS[1:]})
+        frame.insert(0, 'trade_date', np.empty(0, dtype=f'datetime64[{self.unit or "ns"}]'))
+        return frame
+
+    def _to_frame(self, bar) -> pd.DataFrame:
+        return pd.DataFrame({
+            'trade_date': [pd.Timestamp(bar.bucket).as_unit(self.unit or 'ns')],
+            'open': [bar.open],
+            'high': [bar.high],
+            'low': [bar.low],
+            'close': [bar.close],
+            'volume': [bar.volume],
+        })
+
+
+def aggregate(df: pd.DataFrame, interval: int, time_column: str = 'trade_date') -> pd.DataFrame:
+    """DataFrame 전체를 BarAggregator로 집계 (resample 대체/검증용)."""
+    bars = []
+    aggregator = BarAggregator([interval])
+    aggregator.subscribe(interval, bars.append)
+    aggregator.update_frame(df, time_column)
+    aggregator.flush()
+    if not bars:
+        return aggregator._empty_frame()
+    return pd.concat(bars, ignore_index=True)
@@ -0,0 +1,269 @@
+import argparse
+import os
+import struct
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .BarStore import BarSeries
+from .DataStream import HistoricalDataStream, TIME_COLUMNS
+
+"""
+바이너리 bar 파일 (.bars)
+
+- 64 byte header: magic, version, record 크기, interval, asset
+- 이후 고정 크기(48 byte) record의 연속: time(int64 ns), open, high, low, close, volume(float64), little-endian
+- 기록은 파일 끝에 덧붙이기만 한다 (bar 개수는 파일 크기로 계산하므로 header 갱신 없음, 잘린 마지막 record는 무시)
+- 읽기는 np.memmap: 컬럼은 record 배열의 strided view라 복사 없이 BarSeries/DataFrame으로 사용
+
+예) python -m FI_AT.BarFile import-csv FI_AT/data/KTB_1d.csv FI_AT/data/KTB_1d.bars --interval 1d --asset KTB
+"""
+
+MAGIC = b"FIATBAR\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHH16s32s4x")
+HEADER_SIZE = HEADER.size  # 64
+BAR_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+PRICE_FIELDS = BAR_DTYPE.names[1:]
+
+
+def _text(raw: bytes) -> str:
+    return raw.rstrip(b"\x00").decode()
+
+
+def read_header(path: str) -> Tuple[str, str]:
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"{path}: not a bar file (header too short)")
+    magic, version, record_size, interval, asset = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a bar file")
+    if version != VERSION or record_size != BAR_DTYPE.itemsize:
+        raise ValueError(f"{path}: unsupported bar file version {version} (record size {record_size})")
+    return _text(interval), _text(asset)
+
+
+def to_records(df: pd.DataFrame, time_column: str = None) -> np.ndarray:
+    # DataFrame -> record 배열. open/high/low가 없으면 close, volume이 없으면 0
+    time_column = time_column or next((c for c in TIME_COLUMNS if c in df), None)
+    if time_column is None:
+        raise ValueError(f"no time column in {list(df.columns)}")
+    records = np.empty(len(df), dtype=BAR_DTYPE)
+    records["time"] = pd.to_datetime(df[time_column]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    close = df["close"].to_numpy(dtype=float)
+    for field in PRICE_FIELDS:
+        if field in df:
+            records[field] = df[field].to_numpy(dtype=float)
+        else:
+            records[field] = 0.0 if field == "volume" else close
+    return records
+
+
+class BarFileWriter:
+    """append 전용 writer. 시각은 파일의 마지막 bar 이후여야 한다."""
+
+    def __init__(self, path: str, interval: str = "", asset: str = ""):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE
+        if exists:
+            self.interval, self.asset = read_header(path)
+            if (interval and interval != self.interval) or (asset and asset != self.asset):
+                raise ValueError(f"{path} holds {self.asset} {self.interval}, not {asset} {interval}")
+            # 기록 도중 중단되어 잘린 마지막 record는 버림
+            size = os.path.getsize(path)
+            whole = HEADER_SIZE + (size - HEADER_SIZE) // BAR_DTYPE.itemsize * BAR_DTYPE.itemsize
+            if whole != size:
+                os.truncate(path, whole)
+            self.count = (whole - HEADER_SIZE) // BAR_DTYPE.itemsize
+            self.last_time = None
+            if self.count:
+                with open(path, "rb") as f:
+                    f.seek(whole - BAR_DTYPE.itemsize)
+                    self.last_time = int(np.frombuffer(f.read(BAR_DTYPE.itemsize), dtype=BAR_DTYPE)["time"][0])
+            self._file = open(path, "ab")
+        else:
+            self.interval, self.asset = interval, asset
+            self.count = 0
+            self.last_time = None
+            self._file = open(path, "wb")
+            self._file.write(HEADER.pack(MAGIC, VERSION, BAR_DTYPE.itemsize,
+                                         interval.encode()[:16], asset.encode()[:32]))
+
+    def append(self, records: np.ndarray):
+        records = np.asarray(records, dtype=BAR_DTYPE)
+        if len(records) == 0:
+            return
+        times = records["time"]
+        if np.any(np.diff(times) < 0) or (self.last_time is not None and times[0] < self.last_time):
+            raise ValueError("bars must be appended in time order")
+        self._file.write(records.tobytes())
+        self.count += len(records)
+        self.last_time = int(times[-1])
+
+    def append_frame(self, df: pd.DataFrame, time_column: str = None):
+        self.append(to_records(df, time_column))
+
+    def append_bar(self, t, o, h, l, c, v=0.0):
+        t = t if isinstance(t, (int, np.integer)) else pd.Timestamp(t).value
+        self.append(np.array([(t, o, h, l, c, v)], dtype=BAR_DTYPE))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BarFileReader:
+    """memory-map reader. records/column()/times는 파일을 그대로 가리키는 read-only view."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interval, self.asset = read_header(path)
+        self.records = None
+        self.refresh()
+
+    def refresh(self) -> int:
+        # writer가 덧붙인 bar까지 다시 map (완성된 record만), 새 bar 수 반환
+        old = len(self.records) if self.records is not None else 0
+        n = (os.path.getsize(self.path) - HEADER_SIZE) // BAR_DTYPE.itemsize
+        if n == 0:
+            self.records = np.empty(0, dtype=BAR_DTYPE)
+        elif n != old:
+            self.records = np.memmap(self.path, dtype=BAR_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n,))
+        return n - old
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.records["time"]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.records[name]
+
+    def index_of(self, t, side: str = "left") -> int:
+        return int(np.searchsorted(self.times, pd.Timestamp(t).value, side=side))
+
+    def slice(self, start=None, end=None) -> np.ndarray:
+        # [start, end) 구간 record view
+        lo = 0 if start is None else self.index_of(start)
+        hi = len(self) if end is None else self.index_of(end)
+        return self.records[lo:hi]
+
+    def to_series(self, time_column: str = "trade_date") -> BarSeries:
+        return BarSeries.from_arrays(self.times, {f: self.column(f) for f in PRICE_FIELDS}, time_column)
+
+    def to_frame(self, lo: int = 0, hi: int = None, time_column: str = "trade_date") -> pd.DataFrame:
+        return self.to_series(time_column).frame(lo, hi)
+
+
+class BarFileStream(HistoricalDataStream):
+    """
+    .bars 파일들을 재생하는 DataProvider. 파일마다 (interval, asset) 피드가 되고,
+    BarSeries가 memmap 컬럼을 복사 없이 그대로 사용한다 (append 하면 그때 메모리로 복사됨).
+    vectorized 백테스트의 get_history는 파일 전체를 view로 반환하므로 bar 수에 비례한 pandas 작업이 없다.
+    """
+
+    def __init__(self, paths: Iterable[str], time_column: str = 'trade_date', reuse_frames: bool = False):
+        super().__init__(time_column=time_column, reuse_frames=reuse_frames)
+        self.readers: Dict[Tuple[str, str], BarFileReader] = {}
+        for path in ([paths] if isinstance(paths, str) else paths):
+            reader = BarFileReader(path)
+            self.readers[(reader.interval, reader.asset)] = reader
+            self.store.add_series(reader.interval, reader.asset, reader.to_series(time_column))
+
+    @classmethod
+    def from_directory(cls, directory: str, time_column: str = 'trade_date',
+                       reuse_frames: bool = False) -> "BarFileStream":
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".bars"))
+        return cls(paths, time_column, reuse_frames)
+
+
+def import_frames(frames: Iterable[pd.DataFrame], out_path: str, interval: str, asset: str,
+                  time_column: str = None) -> int:
+    # DataFrame chunk들을 순서대로 .bars 파일에 덧붙임 (기존 파일이면 이어서 기록)
+    with BarFileWriter(out_path, interval, asset) as writer:
+        before = writer.count
+        for frame in frames:
+            if len(frame):
+                writer.append_frame(frame, time_column)
+        return writer.count - before
+
+
+def import_csv(csv_path: str, out_path: str, interval: str, asset: str, time_column: str = None,
+               chunksize: int = 1_000_000) -> int:
+    return import_frames(pd.read_csv(csv_path, chunksize=chunksize), out_path, interval, asset, time_column)
+
+
+def import_db(symbol: str, from_dt: str, to_dt: str, out_path: str, interval: int = None,
+              asset: str = None, chunk_size: int = 50_000) -> int:
+    # DB 원시 가격(interval 지정 시 분 단위 리샘플)을 chunk 단위로 기록 (전체를 메모리에 올리지 않음)
+    from .DBConnection import stream_price
+    label = f"{interval}m" if interval else "raw"
+    return import_frames(stream_price(symbol, from_dt, to_dt, interval, chunk_size), out_path, label,
+                         asset or symbol, 'trade_date')
+
+
+def info(path: str) -> Dict:
+    reader = BarFileReader(path)
+    times = reader.times
+    return {
+        "path": path,
+        "interval": reader.interval,
+        "asset": reader.asset,
+        "bars": len(reader),
+        "start": str(pd.Timestamp(times[0])) if len(times) else None,
+        "end": str(pd.Timestamp(times[-1])) if len(times) else None,
+    }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="FI_AT binary bar files")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("import-csv", help="CSV -> .bars")
+    p.add_argument("csv")
+    p.add_argument("out")
+    p.add_argument("--interval", required=True)
+    p.add_argument("--asset", required=True)
+    p.add_argument("--time-column")
+    p = sub.add_parser("import-db", help="DB 가격 -> .bars")
+    p.add_argument("symbol")
+    p.add_argument("from_dt")
+    p.add_argument("to_dt")
+    p.add_argument("out")
+    p.add_argument("--interval", type=int, help="리샘플 주기(분), 생략 시 원시 가격")
+    p.add_argument("--asset")
+    p = sub.add_parser("info", help=".bars 파일 정보")
+    p.add_argument("paths", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "import-csv":
+        n = import_csv(args.csv, args.out, args.interval, args.asset, args.time_column)
+        print(f"{args.out}: {n} bars written")
+    elif args.command == "import-db":
+        n = import_db(args.symbol, args.from_dt, args.to_dt, args.out, args.interval, args.asset)
+        print(f"{args.out}: {n} bars written")
+    else:
+        for path in args.paths:
+            print(info(path))
+
+
+if __name__ == "__main__":
+    main()
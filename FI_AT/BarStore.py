@@ -0,0 +1,210 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+"""
+(asset, interval)별 시계열 저장소
+
+- 로드 시 한 번만 분할해서 피드마다 시간순으로 정렬된 연속 numpy 배열에 보관
+- 시간 구간 조회는 timestamp 배열에 대한 searchsorted (O(log n)), 반환 frame은 배열 view (복사 없음)
+- append()는 미리 잡아 둔 용량에 제자리 기록하고, 부족하면 2배로 늘린다 (분할상환 O(1))
+- from_frame은 숫자 컬럼을 float64로 저장한다 (정수 volume도 빠진 값 NaN과 소수 값을 받을 수 있도록)
+- BarCursor: bar-by-bar 재생용. 시각 순서 조회는 searchsorted 없이 한 칸씩 전진하고,
+  미리 만든 1-row frame에 값만 덮어써서 bar마다 DataFrame을 새로 만들지 않는다
+"""
+
+
+class BarSeries:
+    def __init__(self, columns: Dict[str, np.dtype], capacity: int = 1024, time_column: str = 'trade_date'):
+        self.time_column = time_column
+        self.capacity = max(1, capacity)
+        self.length = 0
+        self._times = np.empty(self.capacity, dtype=np.int64)
+        self._columns = {name: np.empty(self.capacity, dtype=dtype) for name, dtype in columns.items()}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, time_column: str = 'trade_date') -> "BarSeries":
+        df = df.sort_values(time_column, kind='stable')
+        columns = {c: np.float64 for c in df.columns
+                   if c != time_column and df[c].to_numpy().dtype.kind in 'biuf'}
+        series = cls(columns, capacity=len(df), time_column=time_column)
+        series.append(df)
+        return series
+
+    @classmethod
+    def from_arrays(cls, times: np.ndarray, columns: Dict[str, np.ndarray], time_column: str = 'trade_date') -> "BarSeries":
+        """이미 있는 배열(예: memmap view)을 복사 없이 사용. append로 용량이 늘어날 때 메모리로 복사된다."""
+        series = cls.__new__(cls)
+        series.time_column = time_column
+        series.length = series.capacity = len(times)
+        series._times = times
+        series._columns = dict(columns)
+        return series
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[:self.length]
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name][:self.length]
+
+    def append(self, df: pd.DataFrame):
+        # 신규 bar는 마지막 bar 이후 시각이어야 함 (시간순 유지)
+        if len(df) == 0:
+            return
+        times = pd.to_datetime(df[self.time_column]).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        if np.any(np.diff(times) < 0):
+            order = np.argsort(times, kind='stable')
+            times, df = times[order], df.iloc[order]
+        if self.length and times[0] < self._times[self.length - 1]:
+            raise ValueError("bars must be appended in time order")
+        self._reserve(self.length + len(times))
+        end = self.length + len(times)
+        self._times[self.length:end] = times
+        for name, values in self._columns.items():
+            if name in df:
+                source = df[name].to_numpy()
+                if not np.can_cast(source.dtype, values.dtype, casting='same_kind'):
+                    raise ValueError(f"column {name!r} of dtype {source.dtype} cannot be stored as {values.dtype}")
+                values[self.length:end] = source
+            elif values.dtype.kind == 'f':
+                values[self.length:end] = np.nan
+            else:
+                raise ValueError(f"column {name!r} ({values.dtype}) is missing and cannot be filled with NaN")
+        self.length = end
+
+    def _reserve(self, size: int):
+        if size <= self.capacity:
+            return
+        capacity = max(size, self.capacity * 2)
+        # 기존에 반환된 view는 이전 버퍼를 계속 참조하므로 그대로 유효하다
+        times = np.empty(capacity, dtype=np.int64)
+        times[:self.length] = self._times[:self.length]
+        self._times = times
+        for name, values in self._columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self.length] = values[:self.length]
+            self._columns[name] = grown
+        self.capacity = capacity
+
+    def index_of(self, t, side: str = 'left') -> int:
+        return int(np.searchsorted(self.times, pd.Timestamp(t).value, side=side))
+
+    def frame(self, lo: int = 0, hi: int = None) -> pd.DataFrame:
+        hi = self.length if hi is None else min(hi, self.length)
+        data = {self.time_column: self._times[lo:hi].view('datetime64[ns]')}
+        for name, values in self._columns.items():
+            data[name] = values[lo:hi]
+        return pd.DataFrame(data, copy=False)
+
+    def slice(self, start=None, end=None) -> pd.DataFrame:
+        # [start, end) 구간
+        lo = 0 if start is None else self.index_of(start)
+        hi = self.length if end is None else self.index_of(end)
+        return self.frame(lo, hi)
+
+    def upto(self, t) -> pd.DataFrame:
+        # t 시각까지(포함)의 bar
+        return self.frame(0, self.index_of(t, side='right'))
+
+
+class BarCursor:
+    """
+    BarSeries 1개를 시각 순서대로 읽는 커서.
+    frame()이 반환하는 1-row frame은 2개를 번갈아 재사용하므로 다음 bar를 읽은 뒤에는 내용이 바뀐다
+    (같은 bar를 다시 읽으면 같은 객체를 반환, 직전 bar의 frame까지는 유효).
+    """
+
+    def __init__(self, series: BarSeries):
+        self.series = series
+        self.pos = 0  # 직전 조회 시각의 삽입 위치 (times[pos - 1] < t <= times[pos])
+        self._frames = None
+        self._buffers = None
+        self._turn = 0
+        self._loaded = -1
+
+    def seek(self, t: int) -> int:
+        # 시각 t(int ns)의 bar index, 없으면 -1. 직전 조회보다 뒤의 시각이면 보통 1칸 전진으로 끝남
+        times, n = self.series._times, self.series.length
+        i = self.pos
+        if i < n and times[i] < t:
+            i += 1
+        if (i < n and times[i] < t) or (i > 0 and times[i - 1] >= t):
+            i = int(np.searchsorted(times[:n], t))
+        self.pos = i
+        return i if i < n and times[i] == t else -1
+
+    def frame(self, i: int) -> pd.DataFrame:
+        if i == self._loaded:
+            return self._frames[self._turn]
+        if self._frames is None:
+            self._allocate()
+        self._turn ^= 1
+        series = self.series
+        buffers = self._buffers[self._turn]
+        buffers[0][0] = series._times[i]
+        for buffer, values in zip(buffers[1:], series._columns.values()):
+            buffer[0] = values[i]
+        self._loaded = i
+        return self._frames[self._turn]
+
+    def _allocate(self):
+        # frame 컬럼은 BarSeries.frame과 같은 순서/dtype, 값은 numpy 버퍼를 복사 없이 참조
+        columns = self.series._columns
+        self._buffers, self._frames = [], []
+        for _ in range(2):
+            buffers = [np.empty(1, dtype=np.int64)] + [np.empty(1, dtype=values.dtype) for values in columns.values()]
+            data = {self.series.time_column: buffers[0].view('datetime64[ns]')}
+            data.update(zip(columns, buffers[1:]))
+            self._buffers.append(buffers)
+            self._frames.append(pd.DataFrame(data, copy=False))
+
+
+class BarStore:
+    def __init__(self, time_column: str = 'trade_date'):
+        self.time_column = time_column
+        self._series: Dict[Tuple[str, str], BarSeries] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, time_column: str = 'trade_date') -> "BarStore":
+        """interval, asset 컬럼을 가진 긴 형식 DataFrame을 피드별로 한 번만 분할."""
+        store = cls(time_column)
+        for (interval, asset), part in df.groupby(['interval', 'asset'], sort=False):
+            store._series[(interval, asset)] = BarSeries.from_frame(
+                part.drop(columns=['interval', 'asset']), time_column)
+        return store
+
+    def add_series(self, interval, asset, series: BarSeries):
+        self._series[(interval, asset)] = series
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self._series)
+
+    def get(self, interval, asset) -> BarSeries:
+        return self._series.get((interval, asset))
+
+    def append(self, interval, asset, df: pd.DataFrame):
+        series = self._series.get((interval, asset))
+        if series is None:
+            self._series[(interval, asset)] = BarSeries.from_frame(df, self.time_column)
+        else:
+            series.append(df)
+
+    def timeline(self) -> np.ndarray:
+        # 모든 피드의 bar 시각을 합친 정렬된 고유 시각 (int64 ns)
+        if not self._series:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate([s.times for s in self._series.values()]))
+
+    def to_frame(self) -> pd.DataFrame:
+        frames = []
+        for (interval, asset), series in self._series.items():
+            df = series.frame().copy()
+            df['interval'] = interval
+            df['asset'] = asset
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
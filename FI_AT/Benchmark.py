@@ -0,0 +1,408 @@
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .DataStream import HistoricalDataStream
+from .Strategy import MomentumStrategy, SmaCrossStrategy
+from .Position import PositionManager
+from .SignalHub import SignalHub
+from .Execution import BacktestExecution
+from .Evaluation import Evaluation
+
+"""
+성능 측정(benchmark) 모음
+
+- synthetic_ohlcv: seed 고정 합성 OHLCV (1e3 ~ 1e7 bar, 여러 자산)
+- 데이터 크기 x 전략 수 조합마다 BacktestExecution.run (bar-by-bar / vectorized), SignalHub.notify_strategies,
+  전략별 rule, PositionManager.update_position, Evaluation.summary 를 측정
+- replay: bar-by-bar 재생의 데이터 조회(HistoricalDataStream.get_data)만 측정 (새 frame / 재사용 frame)
+- 결과는 bars/sec, 호출당 시간(us), 최대 추가 메모리(tracemalloc peak)를 JSON으로 저장하고
+  이전 결과(--baseline)와 비교해서 느려진 항목을 표시
+- --imports: 새 python 프로세스에서 모듈 import 시간 (spawn worker 프로세스의 시작 비용)
+
+예) python -m FI_AT.Benchmark --sizes 1000 10000 100000 --strategies 1 4 --assets 2 --output bench.json
+    python -m FI_AT.Benchmark --imports --output imports.json
+"""
+
+STRATEGIES = [SmaCrossStrategy, MomentumStrategy]
+# import 시간 측정 대상 (worker 프로세스가 import 하는 모듈들)
+IMPORT_TARGETS = ("FI_AT", "FI_AT.CommandLine", "FI_AT.Position", "FI_AT.Execution", "FI_AT.Sweep",
+                  "FI_AT.Robustness", "FI_AT.Sharding", "FI_AT.DBConnection")
+# 결과 비교 시 같은 측정으로 보는 기준
+CASE_KEYS = ("benchmark", "mode", "n_bars", "n_assets", "n_strategies")
+
+
+def synthetic_ohlcv(n_bars: int, assets: Sequence[str] = ("KTB",), interval: str = "1m", freq: str = "1min",
+                    start: str = "2020-01-01", seed: int = 0, start_price: float = 100.0,
+                    drift: float = 0.0, volatility: float = 0.001) -> pd.DataFrame:
+    """
+    자산마다 n_bars개의 기하 브라운 운동 가격으로 만든 OHLCV (HistoricalDataStream용 긴 형식: interval, asset 컬럼 포함).
+    자산별 난수열은 (seed, 자산 순번)으로 정해지므로 자산 수를 늘려도 앞 자산의 데이터는 같다.
+    """
+    times = pd.date_range(start, periods=n_bars, freq=freq)
+    frames = []
+    for i, asset in enumerate(assets):
+        rng = np.random.default_rng([seed, i])
+        close = start_price * np.exp(np.cumsum(rng.normal(drift, volatility, n_bars)))
+        open_ = np.empty(n_bars)
+        open_[0] = start_price
+        open_[1:] = close[:-1]
+        # 고가/저가는 시가·종가 바깥으로 bar 내 변동폭만큼
+        wick = np.abs(rng.normal(0.0, volatility / 2, (2, n_bars)))
+        frames.append(pd.DataFrame({
+            "trade_date": times,
+            "open": open_,
+            "high": np.maximum(open_, close) * np.exp(wick[0]),
+            "low": np.minimum(open_, close) * np.exp(-wick[1]),
+            "close": close,
+            "volume": np.round(rng.lognormal(6.0, 1.0, n_bars)),
+            "interval": interval,
+            "asset": asset,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_feeds(df: pd.DataFrame, directory: str) -> List[str]:
+    # MockDataStream/DashBoard가 읽는 {asset}_{interval}.csv 로 저장 (FI_AT_DATA_DIR로 지정해서 사용)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for (interval, asset), part in df.groupby(["interval", "asset"], sort=False):
+        path = os.path.join(directory, f"{asset}_{interval}.csv")
+        part.drop(columns=["interval", "asset"]).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def make_strategy(i: int, asset: str, interval: str):
+    # 같은 전략도 파라미터와 이름을 달리해서 서로 다른 장부에 기록되게 함
+    strategy = STRATEGIES[i % len(STRATEGIES)]()
+    if isinstance(strategy, SmaCrossStrategy):
+        strategy.set_parameters(interval=interval, target_asset=asset, short_window=5 + i % 5, long_window=20 + i)
+    else:
+        strategy.set_parameters(interval=interval, target_asset=asset, window=5 + i)
+    strategy._name = f"{strategy._name}_{i}"
+    return strategy
+
+
+def build(df: pd.DataFrame, n_strategies: int):
+    stream = HistoricalDataStream(df)
+    position_manager = PositionManager()
+    signal_hub = SignalHub(stream, position_manager)
+    feeds = stream.store.keys()
+    for i in range(n_strategies):
+        interval, asset = feeds[i % len(feeds)]
+        signal_hub.add_strategy(make_strategy(i, asset, interval))
+    return stream, position_manager, signal_hub
+
+
+def _measure(make: Callable[[], Callable[[], float]], memory: bool = True):
+    """
+    make()가 준비(측정 제외)를 마치고 측정할 함수를 반환한다.
+    측정 함수가 값을 반환하면 그 값을 소요 시간(초)으로 쓴다 (일부 구간만 재는 경우).
+    메모리는 별도 실행에서 tracemalloc으로 측정 (시간 측정에 overhead가 섞이지 않도록).
+    """
+    fn = make()
+    gc.collect()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        inner = fn()
+        seconds = time.perf_counter() - start
+        peak = None
+        if memory:
+            fn = make()
+            gc.collect()
+            tracemalloc.start()
+            try:
+                fn()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    return (inner if inner is not None else seconds), peak
+
+
+def bench_run(df, n_strategies, vectorized, memory=True):
+    def make():
+        _, position_manager, signal_hub = build(df, n_strategies)
+        return BacktestExecution(signal_hub, position_manager, vectorized=vectorized).run
+    return _measure(make, memory)
+
+
+def bench_sharded(df, n_strategies, n_workers, memory=True):
+    # 메모리는 main 프로세스만 측정됨 (worker 프로세스 제외)
+    def make():
+        from .Sharding import ShardedExecution
+        _, position_manager, signal_hub = build(df, n_strategies)
+        return ShardedExecution(signal_hub, position_manager, n_workers=n_workers).run
+    return _measure(make, memory)
+
+
+def bench_notify(df, n_strategies, memory=True):
+    # BacktestExecution의 bar-by-bar 루프에서 notify_strategies 호출 시간만 합산
+    def make():
+        stream, _, signal_hub = build(df, n_strategies)
+        # BacktestExecution 루프와 같이 재사용 frame으로 조회
+        stream.reuse_frames = True
+        timeline = stream.timeline()
+
+        def loop():
+            total = 0.0
+            for t in timeline:
+                stream.set_time(t)
+                start = time.perf_counter()
+                signal_hub.notify_strategies()
+                total += time.perf_counter() - start
+            return total
+        return loop
+    return _measure(make, memory)
+
+
+def bench_replay(df, reuse_frames, memory=True):
+    # 시계를 timeline 순서로 옮기며 피드마다 get_data (전략 없이 재생 데이터 조회 비용만)
+    def make():
+        stream = HistoricalDataStream(df, reuse_frames=reuse_frames)
+        timeline = stream.timeline()
+        keys = stream.store.keys()
+
+        def loop():
+            for t in timeline:
+                stream.set_time(t)
+                for key in keys:
+                    stream.get_data(*key)
+        return loop
+    return _measure(make, memory)
+
+
+def bench_rule(df, n_strategies, memory=True):
+    # 전략 rule만 호출 (bar frame은 미리 만들어 둠)
+    def make():
+        stream, _, signal_hub = build(df, n_strategies)
+        frames = {}
+        for key in signal_hub.get_subscriptions():
+            series = stream.store.get(*key)
+            frames[key] = [series.frame(i, i + 1) for i in range(len(series))]
+        strategies = [(strategy, frames[SignalHub.feed_key(strategy)]) for strategy in signal_hub.get_strategies()]
+
+        def loop():
+            total = 0.0
+            for strategy, bars in strategies:
+                rule = strategy.rule
+                start = time.perf_counter()
+                for frame in bars:
+                    rule(frame)
+                total += time.perf_counter() - start
+            return total
+        return loop
+    return _measure(make, memory)
+
+
+def bench_update_position(df, n_strategies, memory=True, seed=0):
+    # 전략 수만큼의 장부에 bar마다 update_position 호출 (signal은 seed 고정 난수)
+    n = len(df) // df["asset"].nunique()
+    prices = df["close"].to_numpy()[:n].tolist()
+    signals = np.random.default_rng(seed).choice([-1, 0, 0, 0, 1], n).tolist()
+
+    def make():
+        position_manager = PositionManager()
+        names = [f"Strategy_{i}" for i in range(n_strategies)]
+
+        def loop():
+            update = position_manager.update_position
+            for name in names:
+                for signal, price in zip(signals, prices):
+                    update(name, signal, price)
+        return loop
+    return _measure(make, memory)
+
+
+def bench_summary(df, n_strategies, memory=True):
+    def make():
+        _, position_manager, signal_hub = build(df, n_strategies)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            BacktestExecution(signal_hub, position_manager, vectorized=True).run()
+        evaluator = Evaluation(position_manager)
+        names = list(position_manager.positions)
+
+        def loop():
+            for name in names:
+                evaluator.summary(name, print_result=False)
+        return loop
+    return _measure(make, memory)
+
+
+def _row(benchmark, mode, n_bars, n_assets, n_strategies, seconds, peak, bars, calls):
+    return {
+        "benchmark": benchmark,
+        "mode": mode,
+        "n_bars": n_bars,
+        "n_assets": n_assets,
+        "n_strategies": n_strategies,
+        "seconds": seconds,
+        "bars_per_sec": bars / seconds if seconds > 0 else None,
+        "us_per_call": seconds / calls * 1e6 if calls else None,
+        "peak_mb": peak / 2**20 if peak is not None else None,
+    }
+
+
+def bench_imports(modules: Sequence[str] = IMPORT_TARGETS, repeat: int = 5, verbose: bool = True) -> Dict:
+    """
+    모듈마다 새 python 프로세스로 import 하는 시간의 중앙값 (같은 방법으로 잰 빈 인터프리터 시작 시간 포함).
+    mode "python"은 비교 기준인 `python -c pass`.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for module in ("python",) + tuple(modules):
+        code = "pass" if module == "python" else f"import {module}"
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=root, check=True, capture_output=True)
+            times.append(time.perf_counter() - start)
+        seconds = float(np.median(times))
+        results.append(_row("import", module, 0, 0, 0, seconds, None, 1, 1))
+        if verbose:
+            print(f"{'import':>18} {module:>20} {seconds * 1e3:9.1f}ms")
+    return {"meta": environment(), "results": results}
+
+
+def run_suite(sizes=(1_000, 10_000, 100_000), strategy_counts=(1, 4), n_assets=1, seed=0,
+              max_event_bars=10_000, memory=True, verbose=True, workers=()) -> Dict:
+    """
+    sizes x strategy_counts 조합을 측정. bar-by-bar 측정(run event, notify, rule, update_position)은
+    자산당 bar 수가 max_event_bars 이하인 경우만 실행한다 (큰 데이터는 vectorized run과 summary만).
+    run/notify/replay의 calls는 시계(timeline) 1 step, rule/update_position은 전략 1개의 bar 1개 기준.
+    workers를 지정하면 worker 수별 ShardedExecution run도 측정 (mode "sharded-N").
+    """
+    assets = [f"ASSET{i}" for i in range(n_assets)]
+    results = []
+
+    def record(benchmark, mode, bench, n_bars, n_strategies, bars, calls):
+        seconds, peak = bench()
+        row = _row(benchmark, mode, n_bars, n_assets, n_strategies, seconds, peak, bars, calls)
+        results.append(row)
+        if verbose:
+            peak_text = f"{row['peak_mb']:.1f}MB" if row["peak_mb"] is not None else "-"
+            print(f"{benchmark:>18} {mode:>10} bars={n_bars:>9} assets={n_assets} strategies={n_strategies:>3} "
+                  f"{seconds:9.4f}s {row['bars_per_sec']:14,.0f} bars/s "
+                  f"{row['us_per_call']:10.2f}us/call peak={peak_text}")
+
+    for n_bars in sizes:
+        df = synthetic_ohlcv(n_bars, assets, seed=seed)
+        if n_bars <= max_event_bars:
+            # 전략 수와 무관한 재생 조회: bars/sec 기준은 (자산 수 x 자산당 bar 수), strategies=0으로 기록
+            for mode, reuse in (("fresh", False), ("reused", True)):
+                record("replay", mode, lambda: bench_replay(df, reuse, memory), n_bars, 0, n_assets * n_bars, n_bars)
+        for n_strategies in strategy_counts:
+            # 전략 1개가 피드 1개를 받으므로 bars/sec 기준은 (전략 수 x 자산당 bar 수), calls는 호출당 시간 기준
+            strategy_bars = n_strategies * n_bars
+            cases = [("run", "vectorized", lambda: bench_run(df, n_strategies, True, memory), n_strategies)]
+            if n_bars <= max_event_bars:
+                cases += [
+                    ("run", "event", lambda: bench_run(df, n_strategies, False, memory), n_bars),
+                    ("notify_strategies", "event", lambda: bench_notify(df, n_strategies, memory), n_bars),
+                    ("rule", "event", lambda: bench_rule(df, n_strategies, memory), strategy_bars),
+                    ("update_position", "event",
+                     lambda: bench_update_position(df, n_strategies, memory, seed), strategy_bars),
+                ]
+                cases += [("run", f"sharded-{w}", lambda w=w: bench_sharded(df, n_strategies, w, memory), n_bars)
+                          for w in workers]
+            cases.append(("summary", "-", lambda: bench_summary(df, n_strategies, memory), n_strategies))
+            for benchmark, mode, bench, calls in cases:
+                record(benchmark, mode, bench, n_bars, n_strategies, strategy_bars, calls)
+        del df
+    return {"meta": environment(seed), "results": results}
+
+
+def environment(seed=None) -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "seed": seed,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save(report: Dict, path: str):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = 0.2, verbose: bool = True) -> List[Dict]:
+    """
+    같은 측정(CASE_KEYS)끼리 bars/sec를 비교해서 baseline 대비 tolerance 이상 느려진 항목을 반환.
+    (메모리는 peak_mb가 tolerance 이상 늘어난 경우도 포함)
+    """
+    base = {tuple(row[k] for k in CASE_KEYS): row for row in baseline["results"]}
+    regressions = []
+    for row in report["results"]:
+        old = base.get(tuple(row[k] for k in CASE_KEYS))
+        if old is None or not old.get("bars_per_sec") or not row.get("bars_per_sec"):
+            continue
+        speed = row["bars_per_sec"] / old["bars_per_sec"]
+        memory = row["peak_mb"] / old["peak_mb"] if row.get("peak_mb") and old.get("peak_mb") else None
+        slow = speed < 1 - tolerance
+        heavy = memory is not None and memory > 1 + tolerance
+        if verbose:
+            flag = " <- REGRESSION" if slow or heavy else ""
+            memory_text = f"{memory:.2f}x" if memory is not None else "-"
+            print(f"{row['benchmark']:>18} {row['mode']:>10} bars={row['n_bars']:>9} strategies={row['n_strategies']:>3} "
+                  f"speed {speed:.2f}x memory {memory_text}{flag}")
+        if slow or heavy:
+            regressions.append({**{k: row[k] for k in CASE_KEYS}, "speed_ratio": speed, "memory_ratio": memory})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FI_AT benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="자산당 bar 수 (예: 1000 100000 10000000)")
+    parser.add_argument("--strategies", type=int, nargs="+", default=[1, 4], help="전략 수")
+    parser.add_argument("--assets", type=int, default=1, help="합성 자산 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-event-bars", type=int, default=10_000,
+                        help="bar-by-bar 측정을 실행할 최대 자산당 bar 수")
+    parser.add_argument("--workers", type=int, nargs="*", default=[],
+                        help="ShardedExecution worker 수 (예: 1 2 4, bar-by-bar 측정 크기에서만)")
+    parser.add_argument("--imports", action="store_true", help="모듈 import 시간만 측정")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 메모리 측정 생략")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.imports:
+        report = bench_imports()
+    else:
+        report = run_suite(args.sizes, args.strategies, args.assets, args.seed, args.max_event_bars,
+                           memory=not args.no_memory, workers=args.workers)
+    save(report, args.output)
+    print(f"saved {args.output}")
+    if args.baseline:
+        regressions = compare(report, load(args.baseline), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s)")
+            sys.exit(1)
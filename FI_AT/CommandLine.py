@@ -0,0 +1,222 @@
+import argparse
+import importlib
+import sys
+from typing import Dict, List
+
+"""
+명령행 진입점: python -m FI_AT <command> (설치 시 fi-at <command>)
+
+- backtest: CSV / .bars / 기본 Mock 데이터로 백테스트 후 Evaluation 요약 출력
+- sweep: 파라미터 grid 스윕 결과 표 출력
+- live: CSV를 실시간 피드처럼 재생하며 AsyncLiveExecution 실행 (--journal로 세션 기록)
+- replay: journal 파일을 다시 실행하고 기록된 signal과 비교
+- dashboard: Dash 대시보드 서버 실행
+
+argparse 외에는 아무것도 미리 import 하지 않고, 명령마다 필요한 모듈만 불러온다 (--help는 pandas 없이 동작).
+"""
+
+STRATEGIES = ("MomentumStrategy", "SmaCrossStrategy")
+
+
+def _module(name: str):
+    return importlib.import_module(f".{name}", __package__)
+
+
+def _value(text: str):
+    # "5" -> 5, "0.5" -> 0.5, 그 외는 문자열
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _params(items: List[str]) -> Dict:
+    params = {}
+    for item in items or ():
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"parameter must be key=value: {item}")
+        params[key] = _value(value)
+    return params
+
+
+def _grid(items: List[str]) -> Dict[str, list]:
+    # short_window=5,10,20 -> {"short_window": [5, 10, 20]}
+    space = {}
+    for item in items or ():
+        key, sep, values = item.partition("=")
+        if not sep:
+            raise SystemExit(f"grid must be key=v1,v2,...: {item}")
+        space[key] = [_value(v) for v in values.split(",")]
+    return space
+
+
+def _make_strategies(names: List[str], params: Dict, interval: str, asset: str):
+    module = _module("Strategy")
+    strategies = []
+    for name in names:
+        strategy = getattr(module, name)()
+        strategy.set_parameters(interval=interval, target_asset=asset, **params)
+        strategies.append(strategy)
+    return strategies
+
+
+def _data_stream(args):
+    # (data stream, interval, asset): --bars > --csv > 기본 data 디렉터리의 {asset}_{interval}.csv
+    if args.bars:
+        stream = _module("BarFile").BarFileStream(args.bars)
+        interval, asset = next(iter(stream.readers))
+        return stream, args.interval or interval, args.asset or asset
+    interval, asset = args.interval or "1d", args.asset or "KTB"
+    data_stream = _module("DataStream")
+    if args.csv:
+        import pandas as pd
+        return data_stream.MockDataStream(interval, asset, data=pd.read_csv(args.csv)), interval, asset
+    return data_stream.MockDataStream(interval, asset), interval, asset
+
+
+def cmd_backtest(args):
+    stream, interval, asset = _data_stream(args)
+    position_manager = _module("Position").PositionManager()
+    signal_hub = _module("SignalHub").SignalHub(stream, position_manager)
+    strategies = _make_strategies(args.strategy, _params(args.param), interval, asset)
+    for strategy in strategies:
+        signal_hub.add_strategy(strategy)
+    if args.workers:
+        _module("Sharding").ShardedExecution(signal_hub, position_manager, n_workers=args.workers).run()
+    else:
+        _module("Execution").BacktestExecution(signal_hub, position_manager, vectorized=not args.event).run()
+    evaluator = _module("Evaluation").Evaluation(position_manager)
+    for strategy in strategies:
+        evaluator.summary(getattr(strategy, '_name', strategy.__class__.__name__))
+
+
+def cmd_sweep(args):
+    import pandas as pd
+    sweep = _module("Sweep")
+    stream, _, _ = _data_stream(args)
+    data = stream.data if not args.bars else next(iter(stream.readers.values())).to_frame()
+    space = _grid(args.grid)
+    if not space:
+        raise SystemExit("--grid is required (e.g. --grid short_window=5,10 long_window=20,60)")
+    strategy_cls = getattr(_module("Strategy"), args.strategy)
+    table = sweep.ParameterSweep(strategy_cls, data, max_workers=args.workers, sort_by=args.sort_by).run(
+        sweep.grid(**space))
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print(table.head(args.top).to_string())
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"saved {args.output}")
+
+
+def cmd_live(args):
+    interval, asset = args.interval or "1d", args.asset or "KTB"
+    feed = _module("DataStream").SimulatedFeed({(interval, asset): args.csv}, rate=args.rate)
+    position_manager = _module("Position").PositionManager()
+    recorder = _module("Journal").JournalRecorder(args.journal) if args.journal else None
+    signal_hub = _module("SignalHub").SignalHub(feed, position_manager, recorder=recorder)
+    for strategy in _make_strategies(args.strategy, _params(args.param), interval, asset):
+        signal_hub.add_strategy(strategy)
+    execution = _module("Execution").AsyncLiveExecution(signal_hub, position_manager)
+    try:
+        execution.run()
+    except KeyboardInterrupt:
+        print("stopped")
+    finally:
+        if recorder is not None:
+            recorder.close()
+            print(f"journal saved to {args.journal}")
+    position_manager.summary()
+    print(execution.latency_stats())
+
+
+def cmd_replay(args):
+    stream = _module("Journal").JournalReplayStream(args.journal)
+    feeds = {key for _, key, _ in stream.events}
+    if len(feeds) != 1 and (args.interval is None or args.asset is None):
+        raise SystemExit(f"journal has feeds {sorted(feeds)}; choose one with --interval/--asset")
+    interval, asset = next(iter(feeds)) if len(feeds) == 1 else (args.interval, args.asset)
+    position_manager = _module("Position").PositionManager()
+    signal_hub = _module("SignalHub").SignalHub(stream, position_manager)
+    for strategy in _make_strategies(args.strategy, _params(args.param), interval, asset):
+        signal_hub.add_strategy(strategy)
+    execution = _module("Execution").ReplayExecution(signal_hub, position_manager, speed=args.speed)
+    mismatches = execution.verify()
+    position_manager.summary()
+    if mismatches:
+        print(f"{len(mismatches)} signal(s) differ from the journal, first: {mismatches[0]}")
+        return 1
+    print(f"replayed {len(stream)} bars, signals match the journal")
+    return 0
+
+
+def cmd_dashboard(args):
+    app = _module("DashBoard").app
+    app.run(host=args.host, port=args.port, debug=args.debug)
+
+
+def _add_data_options(parser):
+    parser.add_argument("--csv", help="가격 CSV (기본: data 디렉터리의 {asset}_{interval}.csv)")
+    parser.add_argument("--bars", nargs="+", help=".bars 파일 (BarFile 형식)")
+    parser.add_argument("--interval")
+    parser.add_argument("--asset")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="FI_AT", description="FI_AT algorithmic trading")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("backtest", help="백테스트 실행")
+    _add_data_options(p)
+    p.add_argument("--strategy", nargs="+", choices=STRATEGIES, default=["SmaCrossStrategy"])
+    p.add_argument("--param", nargs="*", help="전략 파라미터 key=value")
+    p.add_argument("--event", action="store_true", help="vectorized 대신 bar-by-bar로 실행")
+    p.add_argument("--workers", type=int, help="ShardedExecution worker 수 (bar-by-bar)")
+    p.set_defaults(func=cmd_backtest)
+
+    p = sub.add_parser("sweep", help="파라미터 스윕")
+    _add_data_options(p)
+    p.add_argument("--strategy", choices=STRATEGIES, default="SmaCrossStrategy")
+    p.add_argument("--grid", nargs="+", help="key=v1,v2,... (조합은 grid)")
+    p.add_argument("--workers", type=int)
+    p.add_argument("--sort-by", default="sharpe")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--output", help="전체 결과 CSV")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("live", help="CSV를 실시간 피드로 재생하며 실행")
+    p.add_argument("csv")
+    p.add_argument("--interval")
+    p.add_argument("--asset")
+    p.add_argument("--strategy", nargs="+", choices=STRATEGIES, default=["SmaCrossStrategy"])
+    p.add_argument("--param", nargs="*")
+    p.add_argument("--rate", type=float, help="초당 bar 수 (생략 시 최대 속도)")
+    p.add_argument("--journal", help="세션 journal 기록 경로")
+    p.set_defaults(func=cmd_live)
+
+    p = sub.add_parser("replay", help="journal 재실행 및 signal 비교")
+    p.add_argument("journal")
+    p.add_argument("--interval")
+    p.add_argument("--asset")
+    p.add_argument("--strategy", nargs="+", choices=STRATEGIES, default=["SmaCrossStrategy"])
+    p.add_argument("--param", nargs="*")
+    p.add_argument("--speed", type=float, help="배속 (생략 시 최대 속도)")
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser("dashboard", help="대시보드 서버")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8050)
+    p.add_argument("--debug", action="store_true")
+    p.set_defaults(func=cmd_dashboard)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
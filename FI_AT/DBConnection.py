@@ -1,7 +1,18 @@
-import pymysql
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
 import pandas as pd
+from .PriceCache import PriceCache
+
+PRICE_COLUMNS = ['trade_date', 'open', 'high', 'low', 'close', 'volume']
 
 def get_connection():
+    # pymysql은 DB를 실제로 사용할 때만 import (import 시점에는 연결/조회 없음)
+    import pymysql
     return pymysql.connect(
         host='118.33.79.86',
         port=3306,
@@ -12,56 +23,221 @@ def get_connection():
         cursorclass=pymysql.cursors.DictCursor
     )
 
+class ConnectionPool:
+    """
+    고정 크기 커넥션 풀. 쿼리마다 TCP 연결을 새로 맺지 않고 재사용한다.
+    일정 시간(ping_interval) 이상 쉬었던 연결은 꺼낼 때 ping으로 상태를 확인하고, 죽었으면 새로 만든다.
+    """
+
+    def __init__(self, factory=get_connection, size: int = 4, ping_interval: float = 30.0, timeout: float = None):
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.factory = factory
+        self.size = size
+        self.ping_interval = ping_interval
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self.factory()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            # 풀이 가득 찼으면 반납될 때까지 대기
+            try:
+                conn, last_used = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError("no database connection available in pool") from None
+        if time.monotonic() - last_used >= self.ping_interval and not self._is_healthy(conn):
+            self._discard(conn)
+            return self.acquire()
+        return conn
+
+    def release(self, conn, broken: bool = False):
+        if broken:
+            self._discard(conn)
+        else:
+            self._idle.put_nowait((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        broken = True
+        try:
+            yield conn
+            broken = False
+        finally:
+            # 오류나 중단(generator close/GC의 GeneratorExit 포함)으로 끝난 연결은
+            # 결과를 덜 읽었을 수 있어 상태를 알 수 없으므로 재사용하지 않음
+            self.release(conn, broken=broken)
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+_pool = None
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool()
+    return _pool
+
 def load_all(sql: str, params: tuple = ()) -> list[dict]:
-    conn = get_connection()
-    try:
+    with get_pool().connection() as conn:
         with conn.cursor() as cursor:
             cursor.execute(sql, params)
             return cursor.fetchall()
-    finally:
-        conn.close()
 
 def load_df(sql: str, params: tuple = ()) -> pd.DataFrame:
     rows = load_all(sql, params)
     return pd.DataFrame(rows) if rows else pd.DataFrame()
 
-def load_price(symbol: str, from_dt: str, to_dt: str = None, interval: int=60, limit: int = None) -> pd.DataFrame:
-    if not from_dt:
-        raise ValueError("from_dt is required for DB query.")
-
-    to_dt = to_dt or pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    sql = """
-        SELECT trade_date, open, high, low, close, volume
-        FROM asset_price
-        WHERE asset_id = %s 
-        AND trade_date >= %s 
-        AND trade_date < %s
-        ORDER BY trade_date ASC
+def stream_rows(sql: str, params: tuple = (), chunk_size: int = 50_000, pool: ConnectionPool = None,
+                cursor_class=None) -> Iterator[list]:
     """
-    df = load_df(sql, (symbol, from_dt, to_dt))
-    if df.empty:
-        return df
+    server-side cursor(SSCursor)로 결과를 chunk_size개 tuple row씩 읽는다.
+    전체 결과를 클라이언트 메모리에 올리지 않으므로 메모리 사용량은 chunk 크기로 제한된다.
+    끝까지 읽지 않고 버린 generator의 연결은 풀에 반납하지 않고 폐기한다 (풀 slot은 돌려받음).
+    """
+    if cursor_class is None:
+        import pymysql
+        cursor_class = pymysql.cursors.SSCursor
+    with (pool or get_pool()).connection() as conn:
+        cursor = conn.cursor(cursor_class)
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            # 중간에 멈춘 generator도 남은 결과를 정리해야 연결을 재사용할 수 있음
+            cursor.close()
 
-    df['trade_date'] = pd.to_datetime(df['trade_date'])
-    df.set_index('trade_date', inplace=True)
-    df = df.resample(f"{interval}min").agg({
+def _price_chunk(rows: list) -> pd.DataFrame:
+    # tuple row -> 타입이 정해진 numpy 컬럼 (dict row/object 배열을 거치지 않음)
+    columns = list(zip(*rows))
+    data = {'trade_date': pd.to_datetime(np.array(columns[0])).to_numpy(dtype='datetime64[ns]')}
+    for name, values in zip(PRICE_COLUMNS[1:], columns[1:]):
+        data[name] = np.array(values, dtype=np.float64)
+    return pd.DataFrame(data, copy=False)
+
+def resample_price(df: pd.DataFrame, interval: int, origin='start_day') -> pd.DataFrame:
+    df = df.set_index('trade_date').resample(f"{interval}min", origin=origin).agg({
         'open': 'first',
         'high': 'max',
         'low': 'min',
         'close': 'last',
         'volume': 'sum'
     }).dropna()
+    return df.reset_index()[PRICE_COLUMNS]
+
+RAW_PRICE_SQL = """
+    SELECT trade_date, open, high, low, close, volume
+    FROM asset_price
+    WHERE asset_id = %s 
+    AND trade_date >= %s 
+    AND trade_date < %s
+    ORDER BY trade_date ASC
+"""
+
+_price_cache = None
+
+def get_price_cache() -> PriceCache:
+    global _price_cache
+    if _price_cache is None:
+        _price_cache = PriceCache(fetch=load_raw_price)
+    return _price_cache
+
+def stream_price(symbol: str, from_dt: str, to_dt: str, interval: int = None,
+                 chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+    """
+    [from_dt, to_dt) 원시 가격을 chunk 단위 DataFrame으로 yield.
+    interval이 주어지면 리샘플된 bar를 yield 하며, chunk 경계에 걸친 마지막 bar는 다음 chunk와 합쳐서
+    전체를 한 번에 resample_price 한 것과 같은 결과를 낸다.
+    """
+    carry = None
+    origin = None
+    for rows in stream_rows(RAW_PRICE_SQL, (symbol, from_dt, to_dt), chunk_size):
+        chunk = _price_chunk(rows)
+        if interval is None:
+            yield chunk
+            continue
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        if origin is None:
+            # 전체 구간을 한 번에 리샘플할 때와 같은 기준 시각(첫 데이터의 자정)을 고정
+            origin = chunk['trade_date'].iloc[0].normalize()
+        step = pd.Timedelta(minutes=interval)
+        last_bucket = origin + ((chunk['trade_date'].iloc[-1] - origin) // step) * step
+        done = chunk['trade_date'] < last_bucket
+        carry = chunk[~done]
+        if done.any():
+            yield resample_price(chunk[done], interval, origin)
+    if interval is not None and carry is not None and len(carry):
+        yield resample_price(carry, interval, origin)
 
-    df = df.reset_index()
+def load_raw_price(symbol: str, from_dt: str, to_dt: str) -> pd.DataFrame:
+    # 리샘플 전 원시 가격 [from_dt, to_dt), chunk별 numpy 컬럼을 마지막에 한 번만 이어 붙임
+    chunks = list(stream_price(symbol, from_dt, to_dt))
+    if not chunks:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+    return pd.concat(chunks, ignore_index=True)
 
+def load_price(symbol: str, from_dt: str, to_dt: str = None, interval: int=60, limit: int = None,
+               use_cache: bool = True) -> pd.DataFrame:
+    if not from_dt:
+        raise ValueError("from_dt is required for DB query.")
+
+    to_dt = to_dt or pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    if use_cache:
+        # 이미 받아 둔 구간은 로컬 캐시에서, 빠진 구간만 DB에서 조회
+        df = get_price_cache().get(symbol, from_dt, to_dt)
+    else:
+        df = load_raw_price(symbol, from_dt, to_dt)
+    if df.empty:
+        return df
+
+    df['trade_date'] = pd.to_datetime(df['trade_date'])
     # 컬럼명 강제 재정의 (예방용)
-    df = df[['trade_date', 'open', 'high', 'low', 'close', 'volume']]
+    df = resample_price(df, interval)
 
     if limit:
         df = df.tail(limit)
 
     return df
-
-df = load_price('KTB3F', '2025-05-01', interval=60)
-print(df.head())
\ No newline at end of file
@@ -1,14 +1,22 @@
+import json
+import os
 import dash
-from dash import dcc, html, Input, Output, State, dash_table
+from collections import OrderedDict
+from dash import dcc, html, Input, Output, State, dash_table, no_update, ctx
 import plotly.graph_objs as go
+import numpy as np
 import pandas as pd
 
-from DataStream import MockDataStream
-from Strategy import *
-from Position import PositionManager
-from SignalHub import SignalHub
-from Execution import BacktestExecution
-from Evaluation import Evaluation
+from .BacktestJobs import ResultCache, JobManager, code_version, data_fingerprint, make_key
+from .Downsample import downsample
+from .DataStream import MockDataStream
+from .Strategy import MomentumStrategy, SmaCrossStrategy
+from .Position import PositionManager
+from .SignalHub import SignalHub
+from .Execution import BacktestExecution
+from .Evaluation import Evaluation
+from .Indicator import Indicator
+from .IndicatorRegistry import IndicatorRegistry
 
 STRATEGY_MAP = {
     "MomentumStrategy": MomentumStrategy,
@@ -18,6 +26,21 @@ DATA_OPTIONS = [
     {"label": "KTB 1d", "value": ("1d", "KTB")},
 ]
 
+# 결과 캐시 (FI_AT_CACHE_DIR을 지정하면 디스크에도 보관) + 백그라운드 백테스트 worker
+CACHE = ResultCache(max_bytes=256 * 1024 * 1024, directory=os.environ.get("FI_AT_CACHE_DIR"))
+JOBS = JobManager(CACHE, max_workers=2)
+_DATA = {}  # (path, mtime, size) -> (가격 데이터, 내용 fingerprint), 파일이 바뀌면 다시 읽음
+# 전략/지표/체결/평가 코드가 바뀌면 캐시된 결과를 쓰지 않도록 키에 포함
+CODE_VERSION = code_version(MomentumStrategy, SmaCrossStrategy, Indicator, IndicatorRegistry, PositionManager,
+                            SignalHub, BacktestExecution, Evaluation)
+_VIEWS = OrderedDict()  # job key -> 차트/표용 전체 해상도 배열 (최근 몇 개만 유지)
+MAX_VIEWS = 8
+# 차트 trace당 브라우저로 보내는 최대 점 수 (화면 폭 기준), 확대하면 해당 구간만 다시 다운샘플
+MAX_POINTS = 2000
+TABLE_PAGE_SIZE = 20
+# 실시간 실행의 Instrumentation.start_dump(path=...) 파일. 지정하면 지연 통계 패널을 표시
+STATS_FILE = os.environ.get("FI_AT_STATS_FILE")
+
 app = dash.Dash(__name__)
 
 app.layout = html.Div([
@@ -38,6 +61,10 @@ app.layout = html.Div([
             style={"margin-bottom": "20px"}
         ),
         html.Button("Backtest 실행", id="run-backtest", n_clicks=0, style={"width": "100%", "margin-bottom": "20px"}),
+        html.Div(id="job-status", style={"font-size": "13px", "color": "#555", "margin-bottom": "20px"}),
+        dcc.Store(id="job-id"),
+        dcc.Store(id="result-job"),
+        dcc.Interval(id="job-poll", interval=500, disabled=True),
         html.Hr(),
         html.Div("향후: 실시간 모니터링, 전략 파라미터, 로그 등 확장 영역", style={"font-size": "12px", "color": "#888"}),
     ], style={
@@ -54,6 +81,7 @@ app.layout = html.Div([
         dash_table.DataTable(
             id='trade-table',
             columns=[
+                {"name": "시각", "id": "timestamp"},
                 {"name": "진입/청산", "id": "side"},
                 {"name": "가격", "id": "price", "type": "numeric", "format": {"specifier": ".3f"}},
                 {"name": "손익", "id": "pnl", "type": "numeric", "format": {"specifier": ".3f"}},
@@ -62,92 +90,152 @@ app.layout = html.Div([
             style_table={"overflowX": "auto"},
             style_cell={"textAlign": "center"},
             style_header={"fontWeight": "bold"},
-            page_size=20,
+            # 서버 측 페이지네이션: 현재 페이지 행만 전송
+            page_action="custom",
+            page_current=0,
+            page_size=TABLE_PAGE_SIZE,
+            page_count=0,
         ),
-    ], style={
+    ] + ([
+        html.H4("실시간 지연 통계", style={"margin-top": "30px"}),
+        html.Div(id="stats-time", style={"font-size": "12px", "color": "#888"}),
+        dash_table.DataTable(
+            id='stats-table',
+            columns=[{"name": c, "id": c} for c in
+                     ("대상", "bars", "signals/s", "p50(ms)", "p90(ms)", "p99(ms)", "max(ms)")],
+            style_cell={"textAlign": "center"},
+            style_header={"fontWeight": "bold"},
+        ),
+        dcc.Interval(id="stats-poll", interval=2000),
+    ] if STATS_FILE else []), style={
         "width": "76%", "display": "inline-block", "verticalAlign": "top",
         "padding": "30px 40px 20px 20px", "background": "#fff", "height": "100vh", "boxSizing": "border-box"
     }),
 ], style={"font-family": "Segoe UI, sans-serif", "background": "#e9ecef", "height": "100vh"})
 
-@app.callback(
-    [Output("pnl-graph", "figure"),
-     Output("daily-pnl-graph", "figure"),
-     Output("metrics-output", "children"),
-     Output("trade-table", "data")],
-    [Input("run-backtest", "n_clicks")],
-    [State("strategy-dropdown", "value"),
-     State("data-dropdown", "value")]
-)
-def run_backtest(n_clicks, strategy_name, data_value):
-    if n_clicks == 0:
-        return go.Figure(), go.Figure(), "", []
-    interval, asset = eval(data_value)
-    data_stream = MockDataStream(interval, asset)
+def load_data(interval, asset):
+    # 같은 파일은 한 번만 읽고, 결과 캐시 키에 쓰는 fingerprint는 읽을 때 내용 hash로 한 번 계산
+    # (수정 시각이 유지된 복사본도 내용이 다르면 다른 키가 됨)
+    path = MockDataStream.data_path(interval, asset)
+    stat = os.stat(path) if os.path.exists(path) else None
+    key = (path, stat.st_mtime_ns, stat.st_size) if stat else (path, None, None)
+    if key not in _DATA:
+        for old in [k for k in _DATA if k[0] == path]:
+            del _DATA[old]
+        data = MockDataStream(interval, asset).data
+        _DATA[key] = (data, data_fingerprint(data))
+    return _DATA[key]
+
+def compute_backtest(strategy_name, interval, asset, data, progress=None):
+    data_stream = MockDataStream(interval, asset, data=data)
     position_manager = PositionManager()
     signal_hub = SignalHub(data_stream, position_manager)
     strategy = STRATEGY_MAP[strategy_name]()
     signal_hub.add_strategy(strategy)
-    backtest = BacktestExecution(signal_hub, position_manager)
+    backtest = BacktestExecution(signal_hub, position_manager, vectorized=True, progress=progress)
     backtest.run()
     evaluator = Evaluation(position_manager)
-    # 전체 가격 데이터
-    price_series = data_stream.data['close'].reset_index(drop=True) if hasattr(data_stream, 'data') and not data_stream.data.empty else None
-    # 누적 손익
-    daily_pnl = evaluator.get_daily_pnl(strategy_name)
-    trade_log = evaluator.get_trade_log(strategy_name)
-    # 거래 발생 시점 인덱스(가격 시계열 기준)
-    trade_indices = []
-    if not trade_log.empty and price_series is not None:
-        # 거래가 발생한 가격 시계열 인덱스 찾기
-        for price in trade_log['price']:
-            idx = price_series[price_series == price].index
-            # 여러 번 체결된 가격이 있을 수 있으니, 사용된 인덱스는 제외
-            idx = [i for i in idx if i not in trade_indices]
-            if idx:
-                trade_indices.append(idx[0])
-            else:
-                trade_indices.append(None)
-                
-    # 누적 손익을 가격 시계열 길이에 맞게 forward fill
-    cum_pnl = pd.Series(0, index=range(len(price_series)))
-    if not trade_log.empty and trade_indices:
-        pnl = trade_log["pnl"] = trade_log["price"].diff().fillna(0)
+    return {
+        "price_series": data['close'].reset_index(drop=True) if not data.empty else None,
+        "daily_pnl": evaluator.get_daily_pnl(strategy_name),
+        "trade_log": evaluator.get_trade_log(strategy_name),
+        "metrics": evaluator.summary(strategy_name, print_result=False),
+    }
+
+def prepare(result):
+    # 백테스트 결과 1건을 차트/표에 쓰는 전체 해상도 배열로 변환 (job마다 한 번만)
+    price_series = result["price_series"]
+    price = price_series.to_numpy(dtype=float) if price_series is not None else np.empty(0)
+    n_bars = len(price)
+    trade_log = result["trade_log"].copy()
+    if not trade_log.empty:
+        # 체결마다 기록된 bar 순번으로 위치를 바로 찾음 (가격 매칭 불필요)
+        trade_log["pnl"] = trade_log["price"].diff().fillna(0)
         trade_log["pnl"] = trade_log["pnl"].where(trade_log["side"] == "SELL", 0)
         trade_log["cum_pnl"] = trade_log["pnl"].cumsum()
-        last_pnl = 0
-        trade_ptr = 0
-        for i in range(len(price_series)):
-            if trade_ptr < len(trade_indices) and i == trade_indices[trade_ptr]:
-                last_pnl = trade_log["cum_pnl"].iloc[trade_ptr]
-                trade_ptr += 1
-            cum_pnl.iloc[i] = last_pnl
-        # 삼각형 마커 위치
-        entry_idx = [trade_indices[i] for i, row in trade_log.iterrows() if row['side'] == 'BUY' and trade_indices[i] is not None]
-        entry_price = [trade_log['price'].iloc[i] for i in range(len(trade_log)) if trade_log['side'].iloc[i] == 'BUY' and trade_indices[i] is not None]
-        exit_idx = [trade_indices[i] for i, row in trade_log.iterrows() if row['side'] == 'SELL' and trade_indices[i] is not None]
-        exit_price = [trade_log['price'].iloc[i] for i in range(len(trade_log)) if trade_log['side'].iloc[i] == 'SELL' and trade_indices[i] is not None]
+        trade_bars = trade_log["bar"].to_numpy()
+        # 누적 손익을 가격 시계열 길이에 맞게 forward fill: 각 bar 시점의 직전 체결 누적 손익
+        last_trade = np.searchsorted(trade_bars, np.arange(n_bars), side="right") - 1
+        cum_values = trade_log["cum_pnl"].to_numpy()
+        cum_pnl = np.where(last_trade >= 0, cum_values[last_trade.clip(0)], 0.0)
+        is_buy = (trade_log["side"] == "BUY").to_numpy()
+        trade_prices = trade_log["price"].to_numpy()
+        entries = (trade_bars[is_buy], trade_prices[is_buy])
+        exits = (trade_bars[~is_buy], trade_prices[~is_buy])
+        # 거래내역 표
+        table = trade_log.copy()
+        table["timestamp"] = table["timestamp"].dt.strftime("%Y-%m-%d %H:%M").fillna(table["bar"].astype(str))
+        for col in ("price", "pnl", "cum_pnl"):
+            table[col] = table[col].round(3)
     else:
-        entry_idx, entry_price, exit_idx, exit_price = [], [], [], []
-    # 가격+진입/청산+누적손익 그래프
+        cum_pnl = np.zeros(n_bars)
+        entries = exits = (np.empty(0, dtype=np.int64), np.empty(0))
+        table = pd.DataFrame()
+    return {
+        "x": np.arange(n_bars),
+        "price": price,
+        "cum_pnl": cum_pnl,
+        "entries": entries,
+        "exits": exits,
+        "daily_pnl": result["daily_pnl"].to_numpy(dtype=float),
+        "table": table,
+        "metrics": result["metrics"],
+    }
+
+def get_view(job_id):
+    job = JOBS.get(job_id) if job_id else None
+    if job is None or job.state != "done":
+        return None
+    view = _VIEWS.get(job.key)
+    if view is None:
+        view = _VIEWS[job.key] = prepare(job.result)
+        while len(_VIEWS) > MAX_VIEWS:
+            _VIEWS.popitem(last=False)
+    else:
+        _VIEWS.move_to_end(job.key)
+    return view
+
+def x_range_from(relayout):
+    # 확대/축소 이벤트에서 x축 구간 추출. 전체 보기면 None, 관계없는 이벤트면 False
+    if not relayout:
+        return False
+    if "xaxis.range[0]" in relayout:
+        return relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    if "xaxis.range" in relayout:
+        return tuple(relayout["xaxis.range"])
+    if relayout.get("xaxis.autorange"):
+        return None
+    return False
+
+def _in_range(x, y, x_range):
+    if x_range is None:
+        return x, y
+    mask = (x >= x_range[0]) & (x <= x_range[1])
+    return x[mask], y[mask]
+
+def price_figure(view, x_range=None):
+    # 가격+진입/청산+누적손익 그래프 (선은 다운샘플, 체결 마커는 구간 내 전부 그대로)
     fig = go.Figure()
-    if price_series is not None:
-        fig.add_trace(go.Scatter(
-            y=price_series, mode='lines', name='Price', line=dict(color='gray', width=1), opacity=0.5
-        ))
-    if entry_idx:
+    x, price = downsample(view["x"], view["price"], MAX_POINTS, x_range=x_range)
+    fig.add_trace(go.Scatter(
+        x=x, y=price, mode='lines', name='Price', line=dict(color='gray', width=1), opacity=0.5
+    ))
+    entry_idx, entry_price = _in_range(*view["entries"], x_range)
+    if len(entry_idx):
         fig.add_trace(go.Scatter(
             x=entry_idx, y=entry_price, mode='markers', name='Buy',
             marker=dict(symbol='triangle-up', color='green', size=12)
         ))
-    if exit_idx:
+    exit_idx, exit_price = _in_range(*view["exits"], x_range)
+    if len(exit_idx):
         fig.add_trace(go.Scatter(
             x=exit_idx, y=exit_price, mode='markers', name='Sell',
             marker=dict(symbol='triangle-down', color='red', size=12)
         ))
-    if not cum_pnl.empty:
+    x, cum_pnl = downsample(view["x"], view["cum_pnl"], MAX_POINTS, x_range=x_range)
+    if len(cum_pnl):
         fig.add_trace(go.Scatter(
-            y=cum_pnl, mode='lines', name='Cumulative PnL', yaxis='y2', line=dict(color='blue', width=2)
+            x=x, y=cum_pnl, mode='lines', name='Cumulative PnL', yaxis='y2', line=dict(color='blue', width=2)
         ))
         fig.update_layout(
             yaxis2=dict(overlaying='y', side='right', title='Cumulative PnL'),
@@ -156,29 +244,148 @@ def run_backtest(n_clicks, strategy_name, data_value):
             yaxis_title="Price",
             template="plotly_white"
         )
+    fig.update_layout(uirevision="price")
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    return fig
+
+def daily_pnl_figure(view, x_range=None):
     # 일별 손익 bar chart
     bar_fig = go.Figure()
-    if not daily_pnl.empty:
-        bar_fig.add_trace(go.Bar(y=daily_pnl, name='Daily PnL'))
+    daily_pnl = view["daily_pnl"]
+    if len(daily_pnl):
+        x, y = downsample(np.arange(len(daily_pnl)), daily_pnl, MAX_POINTS, x_range=x_range)
+        bar_fig.add_trace(go.Bar(x=x, y=y, name='Daily PnL'))
         bar_fig.update_layout(
             title="일별 손익(Daily PnL)",
             xaxis_title="Trade #",
             yaxis_title="Daily PnL",
-            template="plotly_white"
+            template="plotly_white",
+            uirevision="daily"
         )
-    # 거래내역 표
-    if not trade_log.empty:
-        trade_log["pnl"] = trade_log["price"].diff().fillna(0)
-        trade_log["pnl"] = trade_log["pnl"].where(trade_log["side"] == "SELL", 0)
-        trade_log["cum_pnl"] = trade_log["pnl"].cumsum()
-        trade_log["price"] = trade_log["price"].round(3)
-        trade_log["pnl"] = trade_log["pnl"].round(3)
-        trade_log["cum_pnl"] = trade_log["cum_pnl"].round(3)
-        table_data = trade_log.to_dict("records")
-    else:
-        table_data = []
-    metrics = evaluator.summary(strategy_name, print_result=False)
-    return fig, bar_fig, metrics, table_data
+        if x_range is not None:
+            bar_fig.update_xaxes(range=list(x_range))
+    return bar_fig
+
+@app.callback(
+    Output("job-id", "data"),
+    [Input("run-backtest", "n_clicks")],
+    [State("strategy-dropdown", "value"),
+     State("data-dropdown", "value")]
+)
+def submit_backtest(n_clicks, strategy_name, data_value):
+    if n_clicks == 0:
+        return no_update
+    interval, asset = eval(data_value)
+    data, fingerprint = load_data(interval, asset)
+    parameters = STRATEGY_MAP[strategy_name]().get_parameters()
+    key = make_key(strategy_name, parameters, fingerprint, CODE_VERSION)
+    # 캐시에 있으면 즉시 완료된 job, 아니면 백그라운드 실행
+    return JOBS.submit(key, lambda progress: compute_backtest(strategy_name, interval, asset, data, progress))
+
+@app.callback(
+    [Output("job-status", "children"),
+     Output("job-poll", "disabled"),
+     Output("result-job", "data"),
+     Output("metrics-output", "children")],
+    [Input("job-id", "data"),
+     Input("job-poll", "n_intervals")]
+)
+def poll_backtest(job_id, n_intervals):
+    if job_id is None:
+        return "", True, no_update, ""
+    job = JOBS.get(job_id)
+    if job is None:
+        return "작업 정보를 찾을 수 없습니다.", True, no_update, no_update
+    if job.state == "failed":
+        return f"백테스트 실패: {job.error}", True, no_update, no_update
+    if job.state != "done":
+        return f"백테스트 실행 중... {job.progress * 100:.0f}%", False, no_update, no_update
+    return "완료", True, job_id, job.result["metrics"]
+
+@app.callback(
+    Output("pnl-graph", "figure"),
+    [Input("result-job", "data"),
+     Input("pnl-graph", "relayoutData")]
+)
+def update_price_chart(job_id, relayout):
+    view = get_view(job_id)
+    if view is None:
+        return go.Figure()
+    # 새 결과면 전체 구간, 확대/축소면 캐시된 전체 해상도 데이터에서 해당 구간만 다시 다운샘플
+    x_range = None if ctx.triggered_id == "result-job" else x_range_from(relayout)
+    if x_range is False:
+        return no_update
+    return price_figure(view, x_range)
+
+@app.callback(
+    Output("daily-pnl-graph", "figure"),
+    [Input("result-job", "data"),
+     Input("daily-pnl-graph", "relayoutData")]
+)
+def update_daily_chart(job_id, relayout):
+    view = get_view(job_id)
+    if view is None:
+        return go.Figure()
+    x_range = None if ctx.triggered_id == "result-job" else x_range_from(relayout)
+    if x_range is False:
+        return no_update
+    return daily_pnl_figure(view, x_range)
+
+@app.callback(
+    [Output("trade-table", "data"),
+     Output("trade-table", "page_count"),
+     Output("trade-table", "page_current")],
+    [Input("result-job", "data"),
+     Input("trade-table", "page_current")],
+    [State("trade-table", "page_size")]
+)
+def update_table(job_id, page_current, page_size):
+    view = get_view(job_id)
+    if view is None or view["table"].empty:
+        return [], 0, 0
+    # 새 결과가 오면 첫 페이지부터
+    page = 0 if ctx.triggered_id == "result-job" else (page_current or 0)
+    table = view["table"]
+    page_count = -(-len(table) // page_size)
+    page = min(page, page_count - 1)
+    rows = table.iloc[page * page_size:(page + 1) * page_size]
+    return rows.to_dict("records"), page_count, page
+
+def stats_rows(snapshot):
+    # 전략은 rule 지연, 피드는 도착(조회)부터 포지션 갱신까지의 지연
+    rows = []
+    for label, items, field in (("rule", snapshot.get("strategies", {}), "rule"),
+                                ("tick->position", snapshot.get("feeds", {}), "tick_to_position")):
+        for name, stats in items.items():
+            hist = stats[field]
+            if not hist.get("count"):
+                continue
+            rows.append({
+                "대상": f"{name} ({label})",
+                "bars": stats["bars"],
+                "signals/s": round(stats["signals_per_sec"], 2) if "signals_per_sec" in stats else "",
+                "p50(ms)": round(hist["p50_ms"], 3),
+                "p90(ms)": round(hist["p90_ms"], 3),
+                "p99(ms)": round(hist["p99_ms"], 3),
+                "max(ms)": round(hist["max_ms"], 3),
+            })
+    return rows
+
+if STATS_FILE:
+    @app.callback(
+        [Output("stats-table", "data"),
+         Output("stats-time", "children")],
+        [Input("stats-poll", "n_intervals")]
+    )
+    def update_stats(n_intervals):
+        try:
+            with open(STATS_FILE) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return [], f"{STATS_FILE} 없음"
+        updated = pd.Timestamp(snapshot["time"], unit="s", tz="UTC").tz_convert(None)
+        return stats_rows(snapshot), f"갱신: {updated:%Y-%m-%d %H:%M:%S} (UTC)"
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
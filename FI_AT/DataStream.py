@@ -1,4 +1,28 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+from .BarStore import BarCursor, BarStore
+
+TIME_COLUMNS = ('trade_date', 'Date', 'datetime', 'timestamp')
+# MockDataStream CSV 위치: 기본은 이 모듈 옆 data/ 폴더, FI_AT_DATA_DIR 환경변수로 변경 가능
+DATA_DIR = os.environ.get("FI_AT_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+def bar_times(df: pd.DataFrame):
+    # bar 시각 컬럼(trade_date/Date 등)을 datetime64[ns] 배열로, 없으면 None
+    for col in TIME_COLUMNS:
+        if col in df:
+            return pd.to_datetime(df[col]).to_numpy(dtype='datetime64[ns]')
+    return None
+
+def bar_time(frame: pd.DataFrame):
+    # frame 마지막 bar의 시각 (없으면 None)
+    for col in TIME_COLUMNS:
+        if col in frame:
+            return pd.Timestamp(frame[col].iloc[-1])
+    return None
 
 class DataProvider:
     def __init__(self):
@@ -7,28 +31,105 @@ class DataProvider:
     def get_data(self, interval=None, target_asset=None):
         raise NotImplementedError
 
+    def get_history(self, interval=None, target_asset=None):
+        # 백테스트 vectorized 모드용: 스트림 상태를 건드리지 않고 전체 시계열 반환
+        return self.data if self.data is not None else pd.DataFrame()
+
 class HistoricalDataStream(DataProvider):
-    def __init__(self):
-        self.data = pd.DataFrame()
+    """
+    여러 자산/주기의 bar를 BarStore에 (interval, asset)별로 나눠 보관.
+    current_time이 지정되면(백테스트 시계) 그 시각의 bar만, 아니면(실시간) 직전 조회 이후 새로 추가된 bar를 반환한다.
+    백테스트 시계는 피드별 BarCursor로 따라가므로 시각이 증가하는 순서의 조회는 searchsorted 없이 처리된다.
+    reuse_frames=True면 시계 조회가 피드마다 미리 만든 1-row frame을 재사용해서 반환한다
+    (bar마다 DataFrame 생성 비용이 없는 대신, 받은 쪽은 다음 bar 이후까지 frame을 보관하면 안 됨).
+    """
+
+    def __init__(self, data: pd.DataFrame = None, time_column: str = 'trade_date', reuse_frames: bool = False):
+        self.time_column = time_column
+        self.store = BarStore(time_column)
+        self.current_time = None
+        self.reuse_frames = reuse_frames
+        self._cursors: Dict[Tuple[str, str], int] = {}
+        self._replay: Dict[Tuple[str, str], BarCursor] = {}
+        if data is not None:
+            self.data = data
+
+    @property
+    def data(self) -> pd.DataFrame:
+        # 호환용: 전체 데이터를 긴 형식으로 다시 합침 (복사 발생)
+        return self.store.to_frame()
+
+    @data.setter
+    def data(self, df: pd.DataFrame):
+        self.store = BarStore.from_frame(df, self.time_column) if len(df) else BarStore(self.time_column)
+        self._cursors = {}
+        self._replay = {}
+
+    def append(self, interval, target_asset, frame: pd.DataFrame):
+        self.store.append(interval, target_asset, frame)
+
+    def timeline(self) -> np.ndarray:
+        return self.store.timeline()
+
+    def set_time(self, t):
+        self.current_time = None if t is None else pd.Timestamp(t)
 
     def get_data(self, interval, target_asset):
-    # 조건에 맞는 DataFrame slice를 반환
-        return self.data[(self.data['interval'] == interval) & 
-                         (self.data['asset'] == target_asset)]
+        series = self.store.get(interval, target_asset)
+        if series is None:
+            return pd.DataFrame()
+        key = (interval, target_asset)
+        if self.current_time is not None:
+            cursor = self._replay.get(key)
+            if cursor is None or cursor.series is not series:
+                cursor = self._replay[key] = BarCursor(series)
+            idx = cursor.seek(self.current_time.value)
+            if idx < 0:
+                return pd.DataFrame()
+            return cursor.frame(idx) if self.reuse_frames else series.frame(idx, idx + 1)
+        start = self._cursors.get(key, 0)
+        self._cursors[key] = len(series)
+        return series.frame(start) if start < len(series) else pd.DataFrame()
+
+    def get_history(self, interval=None, target_asset=None):
+        series = self.store.get(interval, target_asset)
+        if series is None:
+            return pd.DataFrame()
+        if self.current_time is not None:
+            return series.upto(self.current_time)
+        return series.frame()
+
+    def get_range(self, interval, target_asset, start=None, end=None):
+        series = self.store.get(interval, target_asset)
+        return series.slice(start, end) if series is not None else pd.DataFrame()
+
+    def reset(self):
+        self.current_time = None
+        self._cursors = {}
+        self._replay = {}
     
 class MockDataStream(DataProvider):
-    def __init__(self, interval, target_asset):
+    def __init__(self, interval, target_asset, data: pd.DataFrame = None):
         super().__init__()
-        path = f"C:/Users/infomax/Desktop/FI AT/------/FI_AT/data/{target_asset}_{interval}.csv"
-        try:
-            self.data = pd.read_csv(path)
-        except FileNotFoundError:
-            print(f"Data file {path} not found.")
-            self.data = pd.DataFrame()
+        self.path = None
+        if data is not None:
+            # 이미 메모리에 있는 데이터로 재생 (파라미터 스윕 worker 등)
+            self.data = data
+        else:
+            path = self.path = self.data_path(interval, target_asset)
+            try:
+                self.data = pd.read_csv(path)
+            except FileNotFoundError:
+                print(f"Data file {path} not found.")
+                self.data = pd.DataFrame()
         self._current_idx = 0
         self.interval = interval
         self.target_asset = target_asset
 
+    @staticmethod
+    def data_path(interval, target_asset):
+        return os.path.join(DATA_DIR, f"{target_asset}_{interval}.csv")
+
     def get_data(self, interval=None, target_asset=None):
         filtered = self.data
         if self._current_idx < len(filtered):
@@ -40,4 +141,84 @@ class MockDataStream(DataProvider):
             return pd.DataFrame()  # 끝나면 빈 데이터프레임
 
     def reset(self):
-        self._current_idx = 0
\ No newline at end of file
+        self._current_idx = 0
+
+class AsyncDataProvider(DataProvider):
+    """
+    push 방식 데이터 공급자. 신규 bar가 생기면 publish()로 (interval, target_asset) 구독 queue에 넣는다.
+    queue 항목은 (frame, 도착 시각 perf_counter) 이고, 피드 종료 시 None이 들어간다.
+    queue_size로 크기를 제한하므로 소비가 느리면 publish가 대기한다 (backpressure).
+    """
+
+    def __init__(self, queue_size: int = 1000):
+        super().__init__()
+        self.queue_size = queue_size
+        self._queues: Dict[Tuple[str, str], List[asyncio.Queue]] = {}
+        self._latest: Dict[Tuple[str, str], pd.DataFrame] = {}
+
+    def subscribe(self, interval, target_asset) -> asyncio.Queue:
+        q = asyncio.Queue(maxsize=self.queue_size)
+        self._queues.setdefault((interval, target_asset), []).append(q)
+        return q
+
+    def feeds(self) -> List[Tuple[str, str]]:
+        return list(self._queues)
+
+    def available_feeds(self) -> Optional[List[Tuple[str, str]]]:
+        # 공급할 수 있는 (interval, target_asset) 목록, None이면 미리 알 수 없음 (실행 전 검사 생략)
+        return None
+
+    async def publish(self, interval, target_asset, frame: pd.DataFrame):
+        arrival = time.perf_counter()
+        self._latest[(interval, target_asset)] = frame
+        for q in self._queues.get((interval, target_asset), []):
+            await q.put((frame, arrival))
+
+    async def end_feed(self, interval, target_asset):
+        for q in self._queues.get((interval, target_asset), []):
+            await q.put(None)
+
+    def get_data(self, interval=None, target_asset=None):
+        # pull 방식 호환: 가장 최근에 publish 된 bar
+        return self._latest.get((interval, target_asset), pd.DataFrame())
+
+    async def run(self):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class SimulatedFeed(AsyncDataProvider):
+    """
+    CSV/DataFrame을 실시간 피드처럼 재생하는 로컬 시뮬레이터.
+    sources: {(interval, target_asset): DataFrame 또는 CSV 경로}
+    rate: 피드별 초당 bar 수 (None이면 가능한 한 빠르게)
+    """
+
+    def __init__(self, sources: Dict[Tuple[str, str], object], rate: float = None, queue_size: int = 1000):
+        super().__init__(queue_size)
+        self.sources = {key: pd.read_csv(src) if isinstance(src, str) else src for key, src in sources.items()}
+        self.rate = rate
+        self._tasks: List[asyncio.Task] = []
+
+    async def _replay(self, key, df):
+        interval, target_asset = key
+        delay = 1.0 / self.rate if self.rate else 0.0
+        # 재생 오류는 종료 표시 없이 run()으로 전달 (실행기가 producer 오류를 받아 소비자를 정리)
+        for idx in range(len(df)):
+            await self.publish(interval, target_asset, df.iloc[[idx]])
+            # rate가 없어도 한 번씩 양보해서 다른 피드/전략이 돌 수 있게 함
+            await asyncio.sleep(delay)
+        await self.end_feed(interval, target_asset)
+
+    def available_feeds(self) -> List[Tuple[str, str]]:
+        return list(self.sources)
+
+    async def run(self):
+        self._tasks = [asyncio.create_task(self._replay(key, df)) for key, df in self.sources.items()]
+        await asyncio.gather(*self._tasks)
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
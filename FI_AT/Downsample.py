@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+
+"""
+차트 전송용 시계열 다운샘플링 (반환값은 원본 배열의 index)
+
+- minmax_indices: 구간(bucket)마다 최소/최대 지점을 남김. 급등락(spike)이 사라지지 않아 가격/손익 선에 적합
+- lttb_indices: Largest-Triangle-Three-Buckets. bucket마다 시각적으로 가장 중요한 1개 지점을 남김
+
+반환 개수는 n_out 이하. 단 첫/마지막 지점은 항상 남기므로 n_out < 2이면 2개로 취급
+"""
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max(n_out, 2):
+        return np.arange(n)
+    if n_out < 4:
+        return np.array([0, n - 1])
+    # 첫/마지막 지점 2개 + bucket마다 최소/최대 2개가 n_out을 넘지 않도록
+    n_buckets = (n_out - 2) // 2
+    size = math.ceil(n / n_buckets)
+    # 마지막 bucket의 padding과 nan은 선택되지 않도록 +-inf로 채움
+    low = np.full(n_buckets * size, np.inf)
+    low[:n] = np.where(np.isnan(y), np.inf, y)
+    high = np.full(n_buckets * size, -np.inf)
+    high[:n] = np.where(np.isnan(y), -np.inf, y)
+    offsets = np.arange(n_buckets) * size
+    idx = np.concatenate([[0, n - 1],
+                          offsets + low.reshape(n_buckets, size).argmin(axis=1),
+                          offsets + high.reshape(n_buckets, size).argmax(axis=1)])
+    return np.unique(idx[idx < n])
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max(n_out, 2):
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+    every = (n - 2) / (n_out - 2)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # 다음 bucket의 평균점과 직전 선택점을 잇는 삼각형 넓이가 최대인 점 선택
+        if end < next_end:
+            avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        out[i + 1] = a
+    out[-1] = n - 1
+    return out
+
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int, method: str = "minmax", x_range=None):
+    """
+    x_range=(x0, x1)가 주어지면 해당 구간(정렬된 x 기준 searchsorted)만 잘라서 n_out개 이하로 줄인다.
+    반환: (x, y) 다운샘플된 배열
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if x_range is not None:
+        lo = max(int(np.searchsorted(x, x_range[0], side="left")) - 1, 0)
+        hi = min(int(np.searchsorted(x, x_range[1], side="right")) + 1, len(x))
+        x, y = x[lo:hi], y[lo:hi]
+    if method == "lttb":
+        idx = lttb_indices(np.arange(len(x)) if x.dtype.kind == "M" else x, y, n_out)
+    else:
+        idx = minmax_indices(y, n_out)
+    return x[idx], y[idx]
@@ -1,55 +1,141 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 class Evaluation:
     def __init__(self, position_manager):
         self.position_manager = position_manager
 
     def get_trade_log(self, strategy_name):
-        # [(BUY/SELL, price)] 리스트를 DataFrame으로 변환
-        history = self.position_manager.get_history(strategy_name)
-        if not history:
+        # 체결 장부를 DataFrame으로 변환 (bar 순번, 시각, BUY/SELL, 수량, 가격)
+        fills = self.position_manager.get_fills(strategy_name)
+        if len(fills) == 0:
             return pd.DataFrame()
-        df = pd.DataFrame(history, columns=['side', 'price'])
-        return df
+        return pd.DataFrame({
+            'bar': fills['bar'],
+            'timestamp': fills['time'].view('datetime64[ns]'),
+            'side': np.where(fills['side'] == 1, "BUY", "SELL"),
+            'qty': fills['qty'],
+            'price': fills['price'],
+        })
 
     def get_daily_pnl(self, strategy_name):
         # 포지션 체결 가격과 방향을 이용해 일별 손익 계산 (단순 예시)
-        history = self.position_manager.get_history(strategy_name)
-        if not history:
+        fills = self.position_manager.get_fills(strategy_name)
+        if len(fills) == 0:
             return pd.Series(dtype=float)
-        prices = []
-        sides = []
-        for side, price in history:
-            prices.append(price)
-            sides.append(1 if side == "BUY" else -1)
         # 단순히 체결마다 손익 계산
-        pnl = []
-        for i in range(1, len(prices)):
-            pnl.append((prices[i] - prices[i-1]) * sides[i-1])
+        pnl = np.diff(fills['price']) * fills['side'][:-1]
         daily_pnl = pd.Series(pnl)
         return daily_pnl
 
-    def summary(self, strategy_name, print_result=True):
+    def get_equity_curve(self, strategy_name):
+        return self.position_manager.get_equity_curve(strategy_name)
+
+    def evaluate_all(self, names=None, periods_per_year=252):
+        # 등록된 모든 전략의 equity 곡선 지표를 한 번의 vectorized 계산으로 반환
+        names, equity, positions = stack_equity(self.position_manager, names)
+        return batch_metrics(equity, positions, names, periods_per_year)
+
+    def metrics(self, strategy_name):
+        # summary()와 파라미터 스윕이 공유하는 수치 지표, 거래가 없으면 None
         daily_pnl = self.get_daily_pnl(strategy_name)
         if daily_pnl.empty:
+            return None
+        return {
+            "total_trades": len(daily_pnl),
+            "total_pnl": daily_pnl.cumsum().iloc[-1],
+            "sharpe": daily_pnl.mean() / (daily_pnl.std() + 1e-8) * np.sqrt(252),
+            "win_rate": (daily_pnl > 0).sum() / len(daily_pnl),
+            "volatility": daily_pnl.std() * np.sqrt(252),
+        }
+
+    def summary(self, strategy_name, print_result=True):
+        metrics = self.metrics(strategy_name)
+        if metrics is None:
             if print_result:
                 print("No trades.")
             return "No trades."
-        cum_pnl = daily_pnl.cumsum()
-        sharpe = daily_pnl.mean() / (daily_pnl.std() + 1e-8) * np.sqrt(252)
-        win_rate = (daily_pnl > 0).sum() / len(daily_pnl)
-        volatility = daily_pnl.std() * np.sqrt(252)
     
         result = (
             f"==== Evaluation for {strategy_name} ====\n"
-            f"Total Trades: {len(daily_pnl)}\n"
-            f"Total PnL: {cum_pnl.iloc[-1]:.2f}\n"
-            f"Sharpe Ratio: {sharpe:.2f}\n"
-            f"Win Rate: {win_rate*100:.2f}%\n"
-            f"Annualized Volatility: {volatility:.4f}"
+            f"Total Trades: {metrics['total_trades']}\n"
+            f"Total PnL: {metrics['total_pnl']:.2f}\n"
+            f"Sharpe Ratio: {metrics['sharpe']:.2f}\n"
+            f"Win Rate: {metrics['win_rate']*100:.2f}%\n"
+            f"Annualized Volatility: {metrics['volatility']:.4f}"
         )
         if print_result:
             print(result)
-        return result
\ No newline at end of file
+        return result
+
+def stack_curves(curves):
+    """
+    equity 곡선 structured array 목록을 (전략 수 x bar 수) equity/포지션 2차원 배열로 묶는다.
+    길이가 짧은 곡선은 마지막 값으로 채운다 (이후 손익 0, 포지션 유지).
+    """
+    n_bars = max((len(c) for c in curves), default=0)
+    equity = np.zeros((len(curves), n_bars))
+    positions = np.zeros((len(curves), n_bars), dtype=np.int8)
+    for i, curve in enumerate(curves):
+        k = len(curve)
+        if k == 0:
+            continue
+        equity[i, :k] = curve['equity']
+        equity[i, k:] = curve['equity'][-1]
+        positions[i, :k] = curve['position']
+        positions[i, k:] = curve['position'][-1]
+    return equity, positions
+
+
+def stack_equity(position_manager, names=None):
+    names = list(position_manager.positions) if names is None else list(names)
+    equity, positions = stack_curves([position_manager.get_equity(name) for name in names])
+    return names, equity, positions
+
+
+def batch_metrics(equity, positions=None, names=None, periods_per_year=252):
+    """
+    N개 전략의 bar별 equity 곡선(N x T 배열)을 한 번에 평가해 전략별 지표 DataFrame을 반환.
+    returns는 bar별 equity 변화량(손익)이며, 모든 계산은 axis=1 방향 numpy 연산으로 처리한다.
+    positions(N x T)가 주어지면 turnover/exposure도 계산한다.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=float))
+    n, t = equity.shape
+    index = pd.Index(names if names is not None else range(n), name='strategy')
+    if t < 2:
+        return pd.DataFrame(index=index)
+
+    returns = np.diff(equity, axis=1)
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1)
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2, axis=1))
+    scale = np.sqrt(periods_per_year)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * scale, np.nan)
+        sortino = np.where(downside > 0, mean / downside * scale, np.nan)
+
+    # drawdown: 직전 고점 대비 하락폭, duration: 고점을 회복하지 못한 최장 bar 수
+    peak = np.maximum.accumulate(equity, axis=1)
+    drawdown = equity - peak
+    bars = np.broadcast_to(np.arange(t), (n, t))
+    last_peak = np.maximum.accumulate(np.where(drawdown == 0, bars, 0), axis=1)
+    dd_duration = (bars - last_peak).max(axis=1)
+
+    nonzero = (returns != 0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = np.where(nonzero > 0, (returns > 0).sum(axis=1) / nonzero, np.nan)
+
+    result = {
+        'total_pnl': equity[:, -1] - equity[:, 0],
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'volatility': std * scale,
+        'max_drawdown': -drawdown.min(axis=1),
+        'max_dd_duration': dd_duration,
+        'win_rate': win_rate,
+    }
+    if positions is not None:
+        positions = np.atleast_2d(np.asarray(positions, dtype=float))
+        result['turnover'] = np.abs(np.diff(positions, axis=1, prepend=0.0)).sum(axis=1) / t
+        result['exposure'] = (positions != 0).mean(axis=1)
+    return pd.DataFrame(result, index=index)
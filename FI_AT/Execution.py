@@ -1,9 +1,12 @@
-from DataStream import *
-from SignalHub import *
-from Strategy import *
-from Position import PositionManager
+from .DataStream import AsyncDataProvider, HistoricalDataStream, bar_times
+from .SignalHub import SignalHub
+from .Position import PositionManager
+from .Journal import JournalReplayStream, SignalLog
 from typing import List
+import asyncio
+import itertools
 import time
+import numpy as np
 
 class Execution:
     def __init__(self, signal_hub: SignalHub, position_manager: PositionManager):
@@ -14,19 +17,96 @@ class Execution:
         raise NotImplementedError("run method must be implemented in subclasses")
 
 class BacktestExecution(Execution):
-    def __init__(self, signal_hub: SignalHub, position_manager: PositionManager, interval: float = 0.1):
+    def __init__(self, signal_hub: SignalHub, position_manager: PositionManager, interval: float = 0.1,
+                 vectorized: bool = False, progress=None, reuse_frames: bool = True):
         super().__init__(signal_hub, position_manager)
         #self.interval = interval  # seconds between steps
+        # vectorized=True: rule_vectorized를 구현한 전략은 전체 시계열을 한 번에 계산
+        self.vectorized = vectorized
+        # reuse_frames=True: bar-by-bar 루프에서 HistoricalDataStream이 피드별 1-row frame을 재사용
+        # (전략이 받은 frame을 다음 bar 이후까지 보관하지 않는 경우. journal 기록 중에는 사용하지 않음)
+        self.reuse_frames = reuse_frames
+        # progress(0~1): 진행률 보고 callback (대시보드 백그라운드 작업용)
+        self.progress = progress
+
+    def _report(self, done, total):
+        if self.progress is not None and total:
+            self.progress(done / total)
 
     def run(self):
+        strategies = self.signal_hub.get_strategies()
+        if self.vectorized:
+            fallback = []
+            for i, strategy in enumerate(strategies):
+                if not self._run_vectorized(strategy):
+                    fallback.append(strategy)
+                # vectorized 전략 몫은 진행률의 앞부분, 나머지는 bar-by-bar 루프가 채움
+                self._report(i + 1 - len(fallback), len(strategies))
+        else:
+            fallback = strategies
+        if fallback:
+            self._run_event_loop(fallback)
+        self._report(1, 1)
+
+    def _report_loop(self, done, total, n_loop):
+        # bar-by-bar 루프 구간의 진행률을 전체 진행률로 환산
+        if self.progress is None:
+            return
+        n_all = len(self.signal_hub.get_strategies()) or 1
+        offset = (n_all - n_loop) / n_all
+        self.progress(offset + (1 - offset) * done / total)
+
+    def _run_vectorized(self, strategy) -> bool:
+        if getattr(self.position_manager, 'portfolio', None) is not None:
+            # 포트폴리오 노출/낙폭(한도 검사 포함)은 다른 전략의 같은 시점 포지션에 따라 달라지므로 bar-by-bar로만 계산 가능
+            return False
         data_stream = self.signal_hub._data_stream
+        interval, target_asset = SignalHub.feed_key(strategy)
+        df = data_stream.get_history(interval=interval, target_asset=target_asset)
+        signals = strategy.rule_vectorized(df)
+        if signals is None:
+            return False
+        if len(signals) != len(df):
+            raise ValueError(f"rule_vectorized returned {len(signals)} signals for {len(df)} bars.")
+        self.position_manager.apply_signals(
+            getattr(strategy, '_name', strategy.__class__.__name__),
+            signals,
+            df['close'].to_numpy(),
+            bar_times(df)
+        )
+        return True
+
+    def _notify(self, strategies):
+        # bar 1 step 처리 (ShardedExecution은 worker 프로세스로 전달)
+        self.signal_hub.notify_strategies(strategies)
+
+    def _run_event_loop(self, strategies):
+        data_stream = self.signal_hub._data_stream
+        if isinstance(data_stream, HistoricalDataStream):
+            # 모든 피드의 bar 시각을 순서대로 진행 (데이터 복사/필터링 없이 시계만 이동)
+            timeline = data_stream.timeline()
+            step = max(1, len(timeline) // 100)
+            reuse = data_stream.reuse_frames
+            data_stream.reuse_frames = reuse or (self.reuse_frames and self.signal_hub.recorder is None)
+            try:
+                for idx, t in enumerate(timeline):
+                    data_stream.set_time(t)
+                    self._notify(strategies)
+                    if idx % step == 0:
+                        self._report_loop(idx + 1, len(timeline), len(strategies))
+            finally:
+                data_stream.reuse_frames = reuse
+            return
         # 원본 데이터 따로 저장
         original_data = data_stream.data.copy()
         total_len = len(original_data)
+        step = max(1, total_len // 100)
         for idx in range(total_len):
             # 원본에서 슬라이스
             data_stream.data = original_data.iloc[:idx+1]
-            self.signal_hub.notify_strategies()
+            self._notify(strategies)
+            if idx % step == 0:
+                self._report_loop(idx + 1, total_len, len(strategies))
             # time.sleep(self.interval)
 
 #TODO
@@ -38,4 +118,145 @@ class LiveExecution(Execution):
     def run(self):
         while True:
             self.signal_hub.notify_strategies()
-            time.sleep(self.poll_interval)
\ No newline at end of file
+            time.sleep(self.poll_interval)
+
+class ReplayExecution(Execution):
+    """
+    journal에 기록된 세션을 같은 bar 도착 순서로 다시 실행 (signal_hub의 data stream은 JournalReplayStream).
+    speed=None이면 최대 속도, 숫자면 기록된 bar 간격을 speed배로 줄여서 재생.
+    """
+
+    def __init__(self, signal_hub: SignalHub, position_manager: PositionManager, speed: float = None):
+        super().__init__(signal_hub, position_manager)
+        self.data_stream = signal_hub._data_stream
+        if not isinstance(self.data_stream, JournalReplayStream):
+            raise TypeError("ReplayExecution requires a JournalReplayStream")
+        self.speed = speed
+
+    def run(self):
+        stream = self.data_stream
+        stream.reset()
+        start = origin = None
+        while stream.step():
+            if self.speed:
+                if origin is None:
+                    origin, start = stream.wall_time, time.perf_counter()
+                delay = (stream.wall_time - origin) / 1e9 / self.speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            self.signal_hub.notify_strategies()
+
+    def verify(self) -> List[tuple]:
+        """
+        재생하면서 나온 signal을 journal에 기록된 signal과 순서대로 비교해서 다른 항목 목록을 반환
+        ((순번, 기록, 재생), 빈 목록이면 동일). signal_hub.recorder는 재생 동안 SignalLog로 바뀐다.
+        """
+        log = SignalLog()
+        recorder, self.signal_hub.recorder = self.signal_hub.recorder, log
+        try:
+            self.run()
+        finally:
+            self.signal_hub.recorder = recorder
+        recorded = self.data_stream.reader.signals()
+        return [(i, a, b) for i, (a, b) in enumerate(itertools.zip_longest(recorded, log.signals)) if a != b]
+
+class AsyncLiveExecution(Execution):
+    """
+    asyncio 기반 이벤트 구동 실행기.
+    AsyncDataProvider가 bar를 push 하면 해당 (interval, target_asset)을 구독하는 전략이 즉시 실행된다.
+    피드마다 소비 task가 하나씩 있어 여러 자산/주기를 동시에 처리하며,
+    bar 도착부터 전략 처리 완료까지의 지연(tick-to-signal latency)을 기록한다.
+    """
+
+    def __init__(self, signal_hub: SignalHub, position_manager: PositionManager, max_latency_samples: int = 100_000):
+        super().__init__(signal_hub, position_manager)
+        self.data_stream = signal_hub._data_stream
+        if not isinstance(self.data_stream, AsyncDataProvider):
+            raise TypeError("AsyncLiveExecution requires an AsyncDataProvider")
+        self.latencies = np.zeros(max_latency_samples)
+        self.bar_count = 0
+        self._stop = None
+
+    def run(self):
+        asyncio.run(self.run_async())
+
+    def stop(self):
+        # 다른 task(또는 signal handler)에서 호출하면 진행 중인 bar까지만 처리하고 종료
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run_async(self):
+        self._stop = asyncio.Event()
+        feeds = self.signal_hub.get_subscriptions()
+        available = self.data_stream.available_feeds()
+        if available is not None:
+            # 공급원이 없는 피드는 종료 표시도 오지 않아 소비 task가 끝나지 않으므로 시작 전에 거부
+            missing = sorted(set(feeds) - set(available))
+            if missing:
+                raise ValueError(f"no source for subscribed feed(s): {missing}")
+        consumers = [asyncio.create_task(self._consume(self.data_stream.subscribe(*key), strategies, key))
+                     for key, strategies in feeds.items()]
+        producer = asyncio.create_task(self.data_stream.run())
+        stopper = asyncio.create_task(self._stop.wait())
+        finished = asyncio.gather(*consumers, return_exceptions=True)
+        try:
+            # 모든 피드가 끝나거나 stop()이 호출되거나 producer가 오류로 끝날 때까지 대기
+            waiting = {stopper, finished, producer}
+            while True:
+                done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if producer in done and not producer.cancelled() and producer.exception() is not None:
+                    raise producer.exception()
+                if finished.done():
+                    # 전략 오류는 삼키지 않고 호출자에게 전달
+                    errors = [r for r in finished.result() if isinstance(r, Exception)]
+                    if errors:
+                        raise errors[0]
+                    break
+                if stopper.done():
+                    break
+        finally:
+            await self.data_stream.close()
+            for task in consumers + [producer, stopper]:
+                task.cancel()
+            await asyncio.gather(finished, producer, stopper, return_exceptions=True)
+
+    async def _consume(self, queue: asyncio.Queue, strategies, key=None):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            frame, arrival = item
+            instrumentation = self.signal_hub.instrumentation
+            if instrumentation is not None:
+                # 도착 -> 소비 시작 (queue 대기), 도착 -> 모든 전략 포지션 갱신 완료
+                feed = instrumentation.feed(key)
+                feed.queue_lag.record(int((time.perf_counter() - arrival) * 1e9))
+            if self.signal_hub.recorder is not None:
+                self.signal_hub.recorder.record_bar(key, frame)
+            marked = self.signal_hub.mark_feed(key[1], frame)
+            for strategy in strategies:
+                self.signal_hub.dispatch(strategy, frame, mark_portfolio=not marked)
+            latency = time.perf_counter() - arrival
+            self._record_latency(latency)
+            if instrumentation is not None:
+                feed.bars += 1
+                feed.tick_to_position.record(int(latency * 1e9))
+
+    def _record_latency(self, latency: float):
+        # 고정 크기 배열에 순환 기록 (장시간 실행해도 메모리 일정)
+        self.latencies[self.bar_count % len(self.latencies)] = latency
+        self.bar_count += 1
+
+    def latency_stats(self) -> dict:
+        samples = self.latencies[:min(self.bar_count, len(self.latencies))]
+        if len(samples) == 0:
+            return {"bars": 0}
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+        return {
+            "bars": self.bar_count,
+            "mean_ms": float(samples.mean() * 1e3),
+            "p50_ms": float(p50 * 1e3),
+            "p90_ms": float(p90 * 1e3),
+            "p99_ms": float(p99 * 1e3),
+            "max_ms": float(samples.max() * 1e3),
+        }
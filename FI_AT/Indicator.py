@@ -0,0 +1,367 @@
+import math
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+"""
+Streaming 지표 라이브러리
+
+- update(x): 신규 bar 1개를 반영하고 현재 값을 반환 (bar당 O(1), 메모리는 window 크기로 고정)
+- compute(values): 전체 시계열을 한 번에 계산 (vectorized 백테스트용)
+
+compute()는 update()를 순서대로 호출한 결과와 비트 단위로 같도록
+동일한 연산 순서(running sum = 이전 합 + (신규값 - 제거값))를 따른다.
+
+SMA/RollingStd의 running sum은 window번째 push마다, 그리고 빠지는 값이 새 값보다 _CANCEL_RATIO배 넘게 클 때
+(큰 값이 빠지면서 생기는 상쇄 오차) ring buffer에서 다시 합산한다. 오차는 최대 window개 bar 동안만 남는다.
+NaN/inf 입력은 합에서 빼고 개수만 세며, window 안에 남아 있는 동안 값은 NaN이다.
+"""
+
+_CANCEL_RATIO = 1024.0
+
+
+class RingBuffer:
+    """고정 크기 원형 버퍼. 가득 차면 가장 오래된 값을 덮어쓴다."""
+
+    __slots__ = ("size", "_buf", "_pos", "count")
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.size = size
+        self._buf = [0.0] * size
+        self._pos = 0
+        self.count = 0
+
+    def push(self, x: float) -> float:
+        # 밀려난 값(버퍼가 덜 찼으면 0.0)을 반환
+        old = self._buf[self._pos]
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.size
+        self.count += 1
+        return old if self.count > self.size else 0.0
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.size
+
+    def values(self) -> list:
+        # 오래된 값 -> 최신 값 순서
+        n = min(self.count, self.size)
+        start = (self._pos - n) % self.size
+        return [self._buf[(start + i) % self.size] for i in range(n)]
+
+    def reset(self):
+        self._buf = [0.0] * self.size
+        self._pos = 0
+        self.count = 0
+
+
+def _finite_sums(values, shift: float = 0.0):
+    # window 전체 재합산: 오래된 값부터 순서대로 더함 (compute의 np.cumsum과 같은 순서), NaN/inf는 제외
+    total = total_sq = None
+    for v in values:
+        y = v - shift if math.isfinite(v) else 0.0
+        if total is None:
+            total, total_sq = y, y * y
+        else:
+            total += y
+            total_sq += y * y
+    return total, total_sq
+
+
+def _recompute_points(m: np.ndarray, w: int):
+    # update()가 window에서 다시 합산하는 위치와, 각 bar에서 빠지는 값(push 전 window가 덜 찼으면 0)
+    n = len(m)
+    old = np.zeros(n)
+    old[w:] = m[:-w]
+    recompute = np.zeros(n, dtype=bool)
+    recompute[w:] = np.abs(m[:-w]) > _CANCEL_RATIO * np.abs(m[w:])
+    recompute[w - 1::w] = True
+    return recompute, old
+
+
+def _segments(recompute: np.ndarray, w: int):
+    # 재합산 위치마다 구간을 나눔 (구간 길이는 window 이하) -> (구간 시작, 원소별 구간 번호, 구간 내 위치)
+    # 주기적 재합산만 있으면 row/col은 None (고정 길이 구간이라 reshape로 처리, 구간 번호는 (i + 1) // w)
+    n = len(recompute)
+    idx = np.arange(n)
+    periodic = np.arange(w - 1, n, w)
+    if w > 1 and np.count_nonzero(recompute) == len(periodic):
+        return np.r_[0, periodic], None, None
+    starts = np.flatnonzero(recompute | (idx == 0))
+    lengths = np.diff(np.r_[starts, n])
+    row = np.repeat(np.arange(len(starts)), lengths)
+    col = idx - np.repeat(starts, lengths)
+    return starts, row, col
+
+
+def _segment_cumsum(diff: np.ndarray, heads: np.ndarray, row, col, width: int) -> np.ndarray:
+    # 구간마다 heads(재합산 값)에서 시작해 diff를 순서대로 누적 (구간별 np.cumsum은 update의 += 순서와 같음)
+    n = len(diff)
+    if row is None:
+        # 첫 구간(길이 width-1) 앞에 한 칸을 두면 모든 구간이 width 간격으로 정렬됨
+        grid = np.zeros(len(heads) * width)
+        grid[1:n + 1] = diff
+        grid = grid.reshape(len(heads), width)
+        grid[0, 0] = 0.0
+        grid[0, 1] = heads[0]
+        grid[1:, 0] = heads[1:]
+        return np.cumsum(grid, axis=1).ravel()[1:n + 1]
+    grid = np.zeros((len(heads), width))
+    grid[row, col] = diff
+    grid[:, 0] = heads
+    return np.cumsum(grid, axis=1)[row, col]
+
+
+def _rolling_count(mask: np.ndarray, w: int) -> np.ndarray:
+    c = np.cumsum(mask, dtype=np.int64)
+    c[w:] -= c[:-w].copy()
+    return c
+
+
+class Indicator:
+    def __init__(self, window: int, source: str = 'close'):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.source = source
+        self.value = math.nan
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self.value)
+
+    def update(self, x: float) -> float:
+        raise NotImplementedError
+
+    def compute(self, values: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def reset(self):
+        self.value = math.nan
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.source}, {self.window})"
+
+
+class SMA(Indicator):
+    def __init__(self, window: int, source: str = 'close'):
+        super().__init__(window, source)
+        self._buf = RingBuffer(window)
+        self._sum = 0.0
+        self._bad = 0  # window 안의 NaN/inf 개수
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        old = self._buf.push(x)
+        new = x
+        if not math.isfinite(x):
+            new = 0.0
+            self._bad += 1
+        if not math.isfinite(old):
+            old = 0.0
+            self._bad -= 1
+        if self._buf.count % self.window == 0 or abs(old) > _CANCEL_RATIO * abs(new):
+            self._sum = _finite_sums(self._buf.values())[0]
+        else:
+            self._sum += new - old
+        self.value = self._sum / self.window if self._buf.full and not self._bad else math.nan
+        return self.value
+
+    def compute(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        w = self.window
+        if len(values) == 0:
+            return values.copy()
+        finite = np.isfinite(values)
+        all_finite = finite.all()
+        m = values if all_finite else np.where(finite, values, 0.0)
+        recompute, old = _recompute_points(m, w)
+        starts, row, col = _segments(recompute, w)
+        diff = m - old
+        heads = 0.0 + diff[starts]
+        again = recompute[starts]
+        if again.any():
+            heads[again] = np.cumsum(sliding_window_view(m, w)[starts[again] - (w - 1)], axis=1)[:, -1]
+        out = _segment_cumsum(diff, heads, row, col, w) / w
+        out[:w - 1] = np.nan
+        if not all_finite:
+            out[_rolling_count(~finite, w) > 0] = np.nan
+        return out
+
+    def reset(self):
+        super().reset()
+        self._buf.reset()
+        self._sum = 0.0
+        self._bad = 0
+
+
+class RollingStd(Indicator):
+    """
+    표본 표준편차(ddof=1). 기준점(shift)만큼 이동시킨 running sum으로 상쇄 오차를 줄이고,
+    window를 다시 합산할 때마다 기준점을 최신 값으로 옮긴다 (가격이 멀리 이동해도 정밀도 유지).
+    """
+
+    def __init__(self, window: int, source: str = 'close'):
+        if window < 2:
+            raise ValueError("window must be >= 2")
+        super().__init__(window, source)
+        self._buf = RingBuffer(window)
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._bad = 0
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        old = self._buf.push(x)
+        count = self._buf.count
+        new_ok, old_ok = math.isfinite(x), math.isfinite(old)
+        new = x if new_ok else 0.0
+        if not new_ok:
+            self._bad += 1
+        if not old_ok:
+            old = 0.0
+            self._bad -= 1
+        if count == 1:
+            self._shift = new
+        if count % self.window == 0 or abs(old) > _CANCEL_RATIO * abs(new):
+            self._shift = new
+            self._sum, self._sumsq = _finite_sums(self._buf.values(), new)
+        else:
+            y = new - self._shift if new_ok else 0.0
+            y_old = old - self._shift if old_ok and count > self.window else 0.0
+            self._sum += y - y_old
+            self._sumsq += y * y - y_old * y_old
+        if self._buf.full and not self._bad:
+            var = (self._sumsq - self._sum * self._sum / self.window) / (self.window - 1)
+            self.value = math.sqrt(max(var, 0.0))
+        else:
+            self.value = math.nan
+        return self.value
+
+    def compute(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        w = self.window
+        n = len(values)
+        if n == 0:
+            return values.copy()
+        finite = np.isfinite(values)
+        all_finite = finite.all()
+        m = values if all_finite else np.where(finite, values, 0.0)
+        recompute, old = _recompute_points(m, w)
+        starts, row, col = _segments(recompute, w)
+        # 구간별 기준점: 첫 구간은 첫 값, 재합산 구간은 그 위치의 값
+        shift = m[starts][row if row is not None else (np.arange(n) + 1) // w]
+        y = np.where(finite, m - shift, 0.0)
+        old_ok = np.zeros(n, dtype=bool)
+        old_ok[w:] = finite[:-w]
+        y_old = np.where(old_ok, old - shift, 0.0)
+        diff = y - y_old
+        diffsq = y * y - y_old * y_old
+        heads, heads_sq = 0.0 + diff[starts], 0.0 + diffsq[starts]
+        again = recompute[starts]
+        if again.any():
+            windows = sliding_window_view(values, w)[starts[again] - (w - 1)]
+            ys = np.where(np.isfinite(windows), windows - m[starts[again]][:, None], 0.0)
+            heads[again] = np.cumsum(ys, axis=1)[:, -1]
+            heads_sq[again] = np.cumsum(ys * ys, axis=1)[:, -1]
+        s = _segment_cumsum(diff, heads, row, col, w)
+        q = _segment_cumsum(diffsq, heads_sq, row, col, w)
+        var = (q - s * s / w) / (w - 1)
+        out = np.sqrt(np.maximum(var, 0.0))
+        out[:w - 1] = np.nan
+        if not all_finite:
+            out[_rolling_count(~finite, w) > 0] = np.nan
+        return out
+
+    def reset(self):
+        super().reset()
+        self._buf.reset()
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._bad = 0
+
+
+class _RollingExtreme(Indicator):
+    # monotonic deque: (bar 번호, 값)을 단조 순서로 유지해 bar당 분할상환 O(1)
+    _keep_old = None
+
+    def __init__(self, window: int, source: str = 'close'):
+        super().__init__(window, source)
+        self._deque = deque()
+        self._count = 0
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        i = self._count
+        dq = self._deque
+        while dq and not self._keep_old(dq[-1][1], x):
+            dq.pop()
+        dq.append((i, x))
+        if dq[0][0] <= i - self.window:
+            dq.popleft()
+        self._count += 1
+        self.value = dq[0][1] if self._count >= self.window else math.nan
+        return self.value
+
+    def reset(self):
+        super().reset()
+        self._deque.clear()
+        self._count = 0
+
+
+class RollingMax(_RollingExtreme):
+    @staticmethod
+    def _keep_old(old, new):
+        return old > new
+
+    def compute(self, values: np.ndarray) -> np.ndarray:
+        return _sliding(values, self.window, np.max)
+
+
+class RollingMin(_RollingExtreme):
+    @staticmethod
+    def _keep_old(old, new):
+        return old < new
+
+    def compute(self, values: np.ndarray) -> np.ndarray:
+        return _sliding(values, self.window, np.min)
+
+
+class EMA(Indicator):
+    """지수이동평균 (pandas ewm(span=window, adjust=False)와 같은 정의, 첫 값부터 유효)."""
+
+    def __init__(self, window: int, source: str = 'close'):
+        super().__init__(window, source)
+        self.alpha = 2.0 / (window + 1)
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value = self.value + self.alpha * (x - self.value)
+        return self.value
+
+    def compute(self, values: np.ndarray) -> np.ndarray:
+        # 재귀식이라 누적합으로 풀면 update()와 오차가 달라지므로 순차 계산 (O(n))
+        values = np.asarray(values, dtype=float)
+        out = np.empty_like(values)
+        alpha = self.alpha
+        value = math.nan
+        for i, x in enumerate(values.tolist()):
+            value = x if math.isnan(value) else value + alpha * (x - value)
+            out[i] = value
+        return out
+
+
+def _sliding(values, window, func):
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = func(sliding_window_view(values, window), axis=1)
+    return out
@@ -0,0 +1,102 @@
+from collections import OrderedDict, deque
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .Indicator import Indicator
+
+"""
+피드(interval, target_asset)별 공유 지표 저장소
+
+- 전략은 지표를 spec(예: SMA(close, 5), RollingMax(close, 5))으로 요청하고, 같은 spec이면 같은 인스턴스를 받는다
+- 증분 모드: bar마다 spec별로 한 번만 update (같은 frame으로 여러 전략이 호출해도 처음 한 번만 반영)
+- vectorized 모드: 같은 원본 배열에 대한 spec별 계산 결과를 캐시해서 read-only 배열로 공유
+- 최근 bar 기록(history)도 피드당 하나만 유지 (가장 긴 지표 window 길이)
+지표 작업량은 전략 수가 아니라 서로 다른 spec 수에 비례한다.
+"""
+
+MAX_CACHED_ARRAYS = 64
+
+
+def indicator_spec(indicator: Indicator) -> Tuple[str, str, int]:
+    return indicator.__class__.__name__, indicator.source, indicator.window
+
+
+class IndicatorRegistry:
+    def __init__(self):
+        self._indicators: Dict[Tuple, Indicator] = {}
+        self._refs: Dict[Tuple, int] = {}
+        self.history = deque(maxlen=1)
+        self.bar_count = 0
+        self._last_frame = None
+        # (spec, 원본 배열 주소, 길이, stride) -> (원본 배열, 결과). 원본을 잡아 두어 주소가 재사용되지 않게 함
+        self._arrays: "OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._indicators)
+
+    def specs(self):
+        return list(self._indicators)
+
+    def request(self, indicator: Indicator) -> Indicator:
+        """같은 spec의 지표가 이미 있으면 그 인스턴스를, 없으면 indicator를 등록해서 반환 (읽기 전용으로 사용)."""
+        spec = indicator_spec(indicator)
+        shared = self._indicators.get(spec)
+        if shared is None:
+            shared = self._indicators[spec] = indicator
+            self._refs[spec] = 0
+        self._refs[spec] += 1
+        if shared.window > self.history.maxlen:
+            self.history = deque(self.history, maxlen=shared.window)
+        return shared
+
+    def release(self, indicator: Indicator):
+        # 사용하는 전략이 없어진 spec은 더 이상 계산하지 않음
+        spec = indicator_spec(indicator)
+        if spec not in self._refs:
+            return
+        self._refs[spec] -= 1
+        if self._refs[spec] <= 0:
+            del self._refs[spec]
+            del self._indicators[spec]
+            self._arrays = OrderedDict((k, v) for k, v in self._arrays.items() if k[0] != spec)
+
+    def update(self, frame: pd.DataFrame):
+        """
+        frame의 각 row를 모든 지표에 반영. 직전에 반영한 frame과 같은 객체면 아무것도 하지 않는다
+        (SignalHub는 피드당 한 번 조회한 frame을 구독 전략 모두에 그대로 전달한다).
+        """
+        if frame is self._last_frame:
+            return
+        self._last_frame = frame
+        indicators = list(self._indicators.values())
+        values = {col: frame[col].to_numpy() for col in {ind.source for ind in indicators}}
+        for i in range(len(frame)):
+            for indicator in indicators:
+                indicator.update(values[indicator.source][i])
+        self.history.extend(frame.to_dict('records'))
+        self.bar_count += len(frame)
+
+    def compute(self, indicator: Indicator, values: np.ndarray) -> np.ndarray:
+        # vectorized 모드: 같은 원본 배열에 대해 spec별로 한 번만 계산 (결과는 쓰기 금지)
+        values = np.asarray(values)
+        key = (indicator_spec(indicator), values.__array_interface__['data'][0], len(values), values.strides)
+        cached = self._arrays.get(key)
+        if cached is not None:
+            self._arrays.move_to_end(key)
+            return cached[1]
+        result = indicator.compute(values)
+        result.flags.writeable = False
+        self._arrays[key] = (values, result)
+        while len(self._arrays) > MAX_CACHED_ARRAYS:
+            self._arrays.popitem(last=False)
+        return result
+
+    def reset(self):
+        for indicator in self._indicators.values():
+            indicator.reset()
+        self.history.clear()
+        self.bar_count = 0
+        self._last_frame = None
+        self._arrays.clear()
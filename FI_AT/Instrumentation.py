@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+"""
+실시간 실행 계측 (전략별 rule 지연, 데이터 조회 시간, 초당 signal 수, queue 대기 시간)
+
+- SignalHub(instrumentation=...)로 붙였을 때만 측정한다. 없으면(None) bar마다 속성 확인 한 번만 추가됨
+- 지연은 HDR 방식 log-linear histogram에 ns 정수로 누적 (기록 O(1), 메모리 고정, 백분위 상대오차 1/64 이하)
+- snapshot()으로 현재 통계를 dict로 조회하고, start_dump()로 주기적으로 JSON 파일(또는 stdout)에 기록한다
+  (DashBoard는 FI_AT_STATS_FILE 환경변수로 지정한 dump 파일을 읽어 패널로 표시)
+"""
+
+SUB_BITS = 7                      # 2의 거듭제곱 구간마다 64개 sub-bucket (0~127은 1ns 단위 그대로)
+HALF = 1 << (SUB_BITS - 1)
+MAX_EXPONENT = 40                 # 약 2^47ns (~39시간) 이상은 마지막 bucket에 기록
+N_BUCKETS = (MAX_EXPONENT + 1) * HALF + HALF
+
+
+def _bucket(value: int) -> int:
+    if value < (1 << SUB_BITS):
+        return value if value > 0 else 0
+    exponent = value.bit_length() - SUB_BITS
+    if exponent > MAX_EXPONENT:
+        return N_BUCKETS - 1
+    return exponent * HALF + (value >> exponent)
+
+
+def _bucket_values() -> np.ndarray:
+    # bucket별 대표값(구간 중앙, ns)
+    idx = np.arange(N_BUCKETS)
+    exponent = np.maximum(idx // HALF - 1, 0)
+    mantissa = np.where(idx < (1 << SUB_BITS), idx, idx - exponent * HALF)
+    low = mantissa.astype(np.float64) * (2.0 ** exponent)
+    return np.where(idx < (1 << SUB_BITS), low, low + (2.0 ** exponent - 1) / 2)
+
+
+_VALUES = _bucket_values()
+
+
+class LatencyHistogram:
+    """ns 단위 지연 histogram. record()는 정수 연산과 list 증가만 수행."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * N_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, ns: int):
+        self.counts[_bucket(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentiles(self, qs=(50, 90, 99, 99.9)) -> np.ndarray:
+        # 누적 개수가 q%에 처음 도달하는 bucket의 대표값 (ns), 실제 최소/최대 범위로 제한
+        # 다른 thread가 기록 중일 수 있으므로 개수는 counts 복사본 기준
+        cumulative = np.cumsum(self.counts)
+        total = cumulative[-1]
+        if not total:
+            return np.full(len(qs), np.nan)
+        ranks = np.ceil(np.asarray(qs, dtype=float) / 100 * total).clip(1, total)
+        values = _VALUES[np.searchsorted(cumulative, ranks).clip(0, N_BUCKETS - 1)]
+        return values.clip(self.min or 0, self.max)
+
+    def snapshot(self) -> Dict[str, float]:
+        if not self.count or self.min is None:
+            return {"count": 0}
+        p50, p90, p99, p999 = self.percentiles() / 1e6
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count / 1e6,
+            "min_ms": self.min / 1e6,
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "p999_ms": float(p999),
+            "max_ms": self.max / 1e6,
+        }
+
+
+class StrategyStats:
+    """전략 1개: rule 지연, bar 1개 처리(rule + 포지션 갱신) 지연, signal 수."""
+
+    __slots__ = ("rule", "dispatch", "bars", "signals", "started")
+
+    def __init__(self):
+        self.rule = LatencyHistogram()
+        self.dispatch = LatencyHistogram()
+        self.bars = 0
+        self.signals = 0
+        self.started = time.perf_counter()
+
+    def snapshot(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "bars": self.bars,
+            "signals": self.signals,
+            "signals_per_sec": self.signals / elapsed if elapsed > 0 else 0.0,
+            "rule": self.rule.snapshot(),
+            "dispatch": self.dispatch.snapshot(),
+        }
+
+
+class FeedStats:
+    """
+    피드 1개: 데이터 조회 시간, queue 대기 시간(push 방식, 도착 -> 소비 시작),
+    bar 도착부터 모든 구독 전략의 PositionManager 갱신 완료까지의 지연.
+    """
+
+    __slots__ = ("fetch", "queue_lag", "tick_to_position", "bars")
+
+    def __init__(self):
+        self.fetch = LatencyHistogram()
+        self.queue_lag = LatencyHistogram()
+        self.tick_to_position = LatencyHistogram()
+        self.bars = 0
+
+    def snapshot(self) -> Dict:
+        return {
+            "bars": self.bars,
+            "fetch": self.fetch.snapshot(),
+            "queue_lag": self.queue_lag.snapshot(),
+            "tick_to_position": self.tick_to_position.snapshot(),
+        }
+
+
+class Instrumentation:
+    def __init__(self):
+        self.strategies: Dict[str, StrategyStats] = {}
+        self.feeds: Dict[Tuple[str, str], FeedStats] = {}
+        self.started = time.time()
+        self._dump_thread = None
+        self._dump_stop = None
+
+    def strategy(self, name: str) -> StrategyStats:
+        stats = self.strategies.get(name)
+        if stats is None:
+            stats = self.strategies[name] = StrategyStats()
+        return stats
+
+    def feed(self, key: Tuple[str, str]) -> FeedStats:
+        stats = self.feeds.get(key)
+        if stats is None:
+            stats = self.feeds[key] = FeedStats()
+        return stats
+
+    def reset(self):
+        self.strategies = {}
+        self.feeds = {}
+        self.started = time.time()
+
+    def snapshot(self) -> Dict:
+        # 측정 중에도 호출 가능 (dict 복사 후 읽기만 함)
+        return {
+            "time": time.time(),
+            "uptime_s": time.time() - self.started,
+            "strategies": {name: stats.snapshot() for name, stats in list(self.strategies.items())},
+            "feeds": {f"{interval}/{asset}": stats.snapshot() for (interval, asset), stats in list(self.feeds.items())},
+        }
+
+    def dump(self, path: str = None) -> Dict:
+        """path가 있으면 JSON 파일로 (원자적 교체), 없으면 요약을 출력."""
+        snapshot = self.snapshot()
+        if path:
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, path)
+        else:
+            for name, stats in snapshot["strategies"].items():
+                rule = stats["rule"]
+                if rule["count"]:
+                    print(f"[{name}] bars={stats['bars']} signals/s={stats['signals_per_sec']:.2f} "
+                          f"rule p50={rule['p50_ms']:.3f}ms p99={rule['p99_ms']:.3f}ms max={rule['max_ms']:.3f}ms")
+            for feed, stats in snapshot["feeds"].items():
+                lag = stats["tick_to_position"]
+                if lag["count"]:
+                    print(f"[{feed}] bars={stats['bars']} tick->position p50={lag['p50_ms']:.3f}ms "
+                          f"p99={lag['p99_ms']:.3f}ms")
+        return snapshot
+
+    def start_dump(self, interval: float = 10.0, path: str = None):
+        # interval초마다 dump 하는 daemon thread (중복 호출 시 기존 thread를 멈추고 다시 시작)
+        self.stop_dump()
+        self._dump_stop = threading.Event()
+
+        def loop(stop):
+            while not stop.wait(interval):
+                self.dump(path)
+            self.dump(path)
+
+        self._dump_thread = threading.Thread(target=loop, args=(self._dump_stop,),
+                                             name="instrumentation-dump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_dump(self):
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread.join()
+            self._dump_thread = None
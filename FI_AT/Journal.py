@@ -0,0 +1,277 @@
+import math
+import queue
+import struct
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .BarFile import BAR_DTYPE, PRICE_FIELDS
+from .DataStream import DataProvider, TIME_COLUMNS
+from .Position import NAT
+
+"""
+실시간 세션 기록(journal)과 재생
+
+- JournalRecorder: SignalHub(recorder=...)로 붙이면 DataProvider가 전달한 bar(피드별 도착 순서),
+  전략 signal, 포지션 갱신을 wall clock(ns)과 함께 바이너리 파일에 기록
+  거래 루프는 queue에 넣기만 하고, 인코딩/파일 쓰기는 background thread가 묶어서 처리
+- JournalReader: 기록을 순서대로 읽음 (기록 중 중단되어 잘린 마지막 record는 무시)
+- JournalReplayStream + ReplayExecution: 기록된 bar를 같은 순서로 SignalHub에 다시 전달 (최대 속도 또는 배속)
+
+파일 형식: 16 byte header(magic, version) 뒤에 record 연속. record = type(u8), id(u16), wall clock(i64 ns) + payload
+피드/전략 이름은 처음 나올 때 id 정의 record로 한 번만 기록한다.
+"""
+
+MAGIC = b"FIATJNL\x00"
+VERSION = 1
+FILE_HEADER = struct.Struct("<8sH6x")
+RECORD = struct.Struct("<BHq")
+LENGTH = struct.Struct("<H")
+ROWS = struct.Struct("<I")
+SIGNAL = struct.Struct("<bqd")       # signal, bar 시각(ns), 가격
+POSITION = struct.Struct("<bdd")     # 포지션, 진입가(없으면 nan), 실현 손익
+
+FEED, STRATEGY, BAR, SIGNAL_EVENT, POSITION_EVENT = 1, 2, 3, 4, 5
+SEPARATOR = "\x1f"
+
+
+def frame_records(frame: pd.DataFrame) -> Tuple[np.ndarray, str]:
+    # bar frame -> (BAR_DTYPE 배열, 시각 컬럼 이름). 없는 가격 컬럼은 close, volume은 0
+    records = np.empty(len(frame), dtype=BAR_DTYPE)
+    time_column = next((c for c in TIME_COLUMNS if c in frame), "")
+    if time_column:
+        times = frame[time_column].to_numpy()
+        if times.dtype.kind != "M":
+            times = pd.to_datetime(times)
+        records["time"] = np.asarray(times, dtype="datetime64[ns]").view(np.int64)
+    else:
+        records["time"] = NAT
+    close = frame["close"].to_numpy(dtype=float)
+    for field in PRICE_FIELDS:
+        records[field] = frame[field].to_numpy(dtype=float) if field in frame else (0.0 if field == "volume" else close)
+    return records, time_column
+
+
+def records_frame(records: np.ndarray, time_column: str) -> pd.DataFrame:
+    # frame_records의 반대 방향. 컬럼은 records를 복사 없이 가리킨다
+    data = {}
+    if time_column:
+        data[time_column] = records["time"].view("datetime64[ns]")
+    for field in PRICE_FIELDS:
+        data[field] = records[field]
+    return pd.DataFrame(data, copy=False)
+
+
+class JournalRecorder:
+    def __init__(self, path: str, batch_bytes: int = 1 << 20):
+        self.path = path
+        self.batch_bytes = batch_bytes
+        self._ids: Dict[Tuple[int, object], int] = {}
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, "wb")
+        self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self.error = None
+        self._thread = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    # --- 거래 루프에서 호출 (queue에 넣기만 함) ---
+    def record_bar(self, key: Tuple[str, str], frame: pd.DataFrame):
+        # frame은 전략들이 수정하지 않으므로 참조만 넘기고 인코딩은 writer thread에서
+        self._queue.put((BAR, key, time.time_ns(), frame))
+
+    def record_signal(self, name: str, signal: int, price: float, timestamp, position: dict):
+        self._queue.put((SIGNAL_EVENT, name, time.time_ns(), (signal, timestamp, price, position)))
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- writer thread ---
+    def _write_loop(self):
+        chunks = []
+        size = 0
+        running = True
+        while running:
+            item = self._queue.get()
+            while True:
+                if item is None:
+                    running = False
+                    break
+                try:
+                    encoded = self._encode(*item)
+                except Exception as exc:
+                    # 인코딩 오류로 기록이 멈추지 않게 하고, close()에서 알림
+                    self.error = self.error or exc
+                    encoded = b""
+                chunks.append(encoded)
+                size += len(encoded)
+                if size >= self.batch_bytes:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if chunks:
+                self._file.write(b"".join(chunks))
+                self._file.flush()
+                chunks, size = [], 0
+
+    def _define(self, kind: int, key, text: str, wall_ns: int, out: List[bytes]) -> int:
+        ident = self._ids.get((kind, key))
+        if ident is None:
+            ident = self._ids[(kind, key)] = len(self._ids)
+            raw = text.encode()
+            out.append(RECORD.pack(kind, ident, wall_ns) + LENGTH.pack(len(raw)) + raw)
+        return ident
+
+    def _encode(self, kind, key, wall_ns, payload) -> bytes:
+        out: List[bytes] = []
+        if kind == BAR:
+            records, time_column = frame_records(payload)
+            ident = self._define(FEED, (key, time_column), SEPARATOR.join((*key, time_column)), wall_ns, out)
+            out.append(RECORD.pack(BAR, ident, wall_ns) + ROWS.pack(len(records)) + records.tobytes())
+        else:
+            signal, timestamp, price, position = payload
+            ident = self._define(STRATEGY, key, key, wall_ns, out)
+            bar_ns = NAT if timestamp is None else pd.Timestamp(timestamp).value
+            out.append(RECORD.pack(SIGNAL_EVENT, ident, wall_ns) + SIGNAL.pack(int(signal), bar_ns, float(price)))
+            entry = position.get("entry_price")
+            out.append(RECORD.pack(POSITION_EVENT, ident, wall_ns) + POSITION.pack(
+                int(position.get("position", 0)), math.nan if entry is None else float(entry),
+                float(position.get("pnl", 0.0))))
+        return b"".join(out)
+
+
+class JournalReader:
+    """
+    기록을 순서대로 반환. 각 항목은 (종류, wall clock ns, 이름, 내용)
+    - ("bar", t, (interval, asset), DataFrame)
+    - ("signal", t, 전략, (signal, bar 시각 Timestamp 또는 None, 가격))
+    - ("position", t, 전략, {"position", "entry_price", "pnl"})
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = f.read()
+        magic, version = FILE_HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a journal file (version {version})")
+
+    def __iter__(self) -> Iterator[tuple]:
+        data = self._data
+        pos = FILE_HEADER.size
+        feeds: Dict[int, Tuple[Tuple[str, str], str]] = {}
+        strategies: Dict[int, str] = {}
+        end = len(data)
+        try:
+            while pos + RECORD.size <= end:
+                kind, ident, wall_ns = RECORD.unpack_from(data, pos)
+                pos += RECORD.size
+                if kind in (FEED, STRATEGY):
+                    (length,) = LENGTH.unpack_from(data, pos)
+                    if pos + LENGTH.size + length > end:
+                        return
+                    text = data[pos + LENGTH.size:pos + LENGTH.size + length].decode()
+                    pos += LENGTH.size + length
+                    if kind == FEED:
+                        interval, asset, time_column = text.split(SEPARATOR)
+                        feeds[ident] = ((interval, asset), time_column)
+                    else:
+                        strategies[ident] = text
+                elif kind == BAR:
+                    (n,) = ROWS.unpack_from(data, pos)
+                    start = pos + ROWS.size
+                    stop = start + n * BAR_DTYPE.itemsize
+                    if stop > end:
+                        return
+                    records = np.frombuffer(data, dtype=BAR_DTYPE, count=n, offset=start)
+                    pos = stop
+                    key, time_column = feeds[ident]
+                    yield "bar", wall_ns, key, records_frame(records, time_column)
+                elif kind == SIGNAL_EVENT:
+                    signal, bar_ns, price = SIGNAL.unpack_from(data, pos)
+                    pos += SIGNAL.size
+                    timestamp = None if bar_ns == NAT else pd.Timestamp(bar_ns)
+                    yield "signal", wall_ns, strategies[ident], (signal, timestamp, price)
+                elif kind == POSITION_EVENT:
+                    position, entry, pnl = POSITION.unpack_from(data, pos)
+                    pos += POSITION.size
+                    yield "position", wall_ns, strategies[ident], {
+                        "position": position, "entry_price": None if math.isnan(entry) else entry, "pnl": pnl}
+                else:
+                    raise ValueError(f"{self.path}: unknown record type {kind} at byte {pos - RECORD.size}")
+        except struct.error:
+            return  # 잘린 마지막 record
+
+    def bars(self) -> List[tuple]:
+        return [(t, key, frame) for kind, t, key, frame in self if kind == "bar"]
+
+    def signals(self) -> List[tuple]:
+        # (전략, signal, bar 시각, 가격) 순서 목록 (재생 결과 비교용)
+        return [(name, *payload) for kind, _, name, payload in self if kind == "signal"]
+
+
+class JournalReplayStream(DataProvider):
+    """
+    기록된 bar를 도착 순서대로 하나씩 내보내는 DataProvider.
+    step()으로 다음 bar로 이동하면 get_data는 그 bar의 피드에만 frame을, 다른 피드에는 빈 frame을 반환한다.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.reader = JournalReader(path)
+        self.events = self.reader.bars()
+        self.position = -1
+
+    def __len__(self):
+        return len(self.events)
+
+    def step(self) -> bool:
+        self.position += 1
+        return self.position < len(self.events)
+
+    @property
+    def wall_time(self) -> int:
+        return self.events[self.position][0]
+
+    def get_data(self, interval=None, target_asset=None):
+        if 0 <= self.position < len(self.events):
+            _, key, frame = self.events[self.position]
+            if key == (interval, target_asset):
+                return frame
+        return pd.DataFrame()
+
+    def get_history(self, interval=None, target_asset=None):
+        frames = [frame for _, key, frame in self.events if key == (interval, target_asset)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def reset(self):
+        self.position = -1
+
+
+class SignalLog:
+    """JournalRecorder와 같은 인터페이스로 signal을 메모리에 모음 (재생 결과를 기록과 비교할 때 사용)."""
+
+    def __init__(self):
+        self.signals: List[tuple] = []
+
+    def record_bar(self, key, frame):
+        pass
+
+    def record_signal(self, name, signal, price, timestamp, position):
+        self.signals.append((name, int(signal), None if timestamp is None else pd.Timestamp(timestamp), float(price)))
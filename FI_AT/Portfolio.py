@@ -0,0 +1,190 @@
+import math
+from typing import Dict, Optional, Union
+
+import pandas as pd
+
+"""
+포트폴리오(전략 합산) 노출/위험 집계
+
+- PositionManager(portfolio=Portfolio(...))로 붙이면 체결/평가 때마다 O(1)로 갱신 (전략 수와 무관)
+  자산별 순노출(net, 포지션 합), 총노출(gross, |포지션| 합), 진입가 합(cost)을 유지하고
+  평가 손익 = net * 현재가 - cost 로 계산한다
+- 포트폴리오 equity = 실현 손익 합 + 평가 손익 합, 최고점 대비 낙폭(drawdown)과 최대 낙폭
+- RiskLimits: update_position에서 체결 전에 검사해서 한도를 넘는 체결은 거부 (노출을 줄이는 체결은 항상 허용)
+
+전략의 자산은 assign_asset(SignalHub.add_strategy가 target_asset으로 지정)으로 정하며,
+지정되지 않은 전략은 전략 이름을 자산으로 보고 다른 전략과 상계하지 않는다.
+증분 합산이라 부동소수점 오차가 쌓일 수 있으므로 필요하면 recompute로 장부에서 다시 계산한다.
+"""
+
+
+class RiskLimits:
+    def __init__(self, max_net: Union[float, Dict[str, float]] = None, max_gross: float = None,
+                 max_drawdown: float = None):
+        # max_net: 자산별 |순노출| 한도 (숫자면 모든 자산 공통, dict면 자산별. 없는 자산은 제한 없음)
+        # max_gross: 전체 총노출 한도, max_drawdown: 이 낙폭 이상이면 노출을 늘리는 체결 거부
+        self.max_net = max_net
+        self.max_gross = max_gross
+        self.max_drawdown = max_drawdown
+
+    def net_limit(self, asset) -> Optional[float]:
+        if isinstance(self.max_net, dict):
+            return self.max_net.get(asset)
+        return self.max_net
+
+
+class Portfolio:
+    def __init__(self, limits: RiskLimits = None):
+        self.limits = limits
+        self._asset_of: Dict[str, str] = {}
+        self.net: Dict[str, int] = {}
+        self.gross_by_asset: Dict[str, int] = {}
+        self.cost: Dict[str, float] = {}
+        self.prices: Dict[str, float] = {}
+        self.gross = 0
+        self.realized = 0.0
+        self.unrealized = 0.0
+        self.peak = 0.0
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.fills = 0
+        self.rejections = 0
+        self.last_rejection = None
+
+    def assign_asset(self, strategy_name: str, asset: str):
+        # 포지션이 생기기 전에 지정해야 함 (이후 변경은 recompute 필요)
+        self._asset_of[strategy_name] = asset
+
+    def asset_of(self, strategy_name: str) -> str:
+        return self._asset_of.get(strategy_name, strategy_name)
+
+    @property
+    def equity(self) -> float:
+        return self.realized + self.unrealized
+
+    def mark(self, asset: str, price: float):
+        # 자산 현재가 갱신: 평가 손익 변화는 순노출 x 가격 변화
+        old = self.prices.get(asset)
+        if old == price:
+            return  # 같은 bar에서 같은 자산의 다른 전략이 이미 반영
+        if old is not None:
+            self.unrealized += self.net.get(asset, 0) * (price - old)
+        else:
+            self.unrealized += self.net.get(asset, 0) * price - self.cost.get(asset, 0.0)
+        self.prices[asset] = price
+        self._update_drawdown()
+
+    def _update_drawdown(self):
+        equity = self.realized + self.unrealized
+        if equity > self.peak:
+            self.peak = equity
+        self.drawdown = self.peak - equity
+        if self.drawdown > self.max_drawdown:
+            self.max_drawdown = self.drawdown
+
+    def check(self, strategy_name: str, position: int, new_position: int) -> bool:
+        """체결 전 한도 검사 (position -> new_position). 거부하면 False."""
+        limits = self.limits
+        if limits is None:
+            return True
+        asset = self.asset_of(strategy_name)
+        net = self.net.get(asset, 0)
+        new_net = net + new_position - position
+        new_gross = self.gross + abs(new_position) - abs(position)
+        increases = abs(new_net) > abs(net) or new_gross > self.gross
+        reason = None
+        if increases:
+            net_limit = limits.net_limit(asset)
+            if net_limit is not None and abs(new_net) > net_limit and abs(new_net) > abs(net):
+                reason = f"net exposure {new_net} on {asset} exceeds {net_limit}"
+            elif limits.max_gross is not None and new_gross > limits.max_gross and new_gross > self.gross:
+                reason = f"gross exposure {new_gross} exceeds {limits.max_gross}"
+            elif limits.max_drawdown is not None and self.drawdown >= limits.max_drawdown:
+                reason = f"drawdown {self.drawdown:.4f} at limit {limits.max_drawdown}"
+        if reason is None:
+            return True
+        self.rejections += 1
+        self.last_rejection = (strategy_name, new_position, reason)
+        return False
+
+    def on_fill(self, strategy_name: str, position: int, entry_price, new_position: int, new_entry_price,
+                realized: float, price: float):
+        # 전략 1개의 포지션/진입가 변경과 실현 손익을 반영 (체결 가격으로 자산 현재가도 갱신)
+        asset = self.asset_of(strategy_name)
+        self.mark(asset, price)
+        old_cost = position * entry_price if position and entry_price is not None else 0.0
+        new_cost = new_position * new_entry_price if new_position and new_entry_price is not None else 0.0
+        d_net = new_position - position
+        d_cost = new_cost - old_cost
+        self.net[asset] = self.net.get(asset, 0) + d_net
+        self.cost[asset] = self.cost.get(asset, 0.0) + d_cost
+        d_gross = abs(new_position) - abs(position)
+        self.gross_by_asset[asset] = self.gross_by_asset.get(asset, 0) + d_gross
+        self.gross += d_gross
+        self.realized += realized
+        self.unrealized += d_net * price - d_cost
+        self.fills += 1
+        self._update_drawdown()
+
+    def recompute(self, position_manager):
+        """전략 장부에서 노출/손익을 다시 계산 (증분 오차 제거, 자산 재지정 후 사용). 낙폭 기록은 유지."""
+        self.net, self.gross_by_asset, self.cost = {}, {}, {}
+        self.gross = 0
+        self.realized = 0.0
+        for name, book in position_manager.positions.items():
+            asset = self.asset_of(name)
+            self.net[asset] = self.net.get(asset, 0) + book.position
+            self.gross_by_asset[asset] = self.gross_by_asset.get(asset, 0) + abs(book.position)
+            self.gross += abs(book.position)
+            if book.position and book.entry_price is not None:
+                self.cost[asset] = self.cost.get(asset, 0.0) + book.position * book.entry_price
+            self.realized += book.pnl
+        self.unrealized = sum(self.net.get(asset, 0) * price - self.cost.get(asset, 0.0)
+                              for asset, price in self.prices.items())
+        self._update_drawdown()
+
+    def exposure(self) -> pd.DataFrame:
+        # 자산별 노출 표 (net, gross, 현재가, 순노출 금액, 평가 손익)
+        assets = sorted(set(self.net) | set(self.prices))
+        rows = []
+        for asset in assets:
+            net = self.net.get(asset, 0)
+            price = self.prices.get(asset, math.nan)
+            rows.append({
+                "asset": asset,
+                "net": net,
+                "gross": self.gross_by_asset.get(asset, 0),
+                "price": price,
+                "notional": net * price,
+                "unrealized": net * price - self.cost.get(asset, 0.0),
+            })
+        return pd.DataFrame(rows, columns=["asset", "net", "gross", "price", "notional", "unrealized"]).set_index("asset")
+
+    def snapshot(self) -> Dict:
+        return {
+            "gross": self.gross,
+            "net": dict(self.net),
+            "realized": self.realized,
+            "unrealized": self.unrealized,
+            "equity": self.equity,
+            "peak": self.peak,
+            "drawdown": self.drawdown,
+            "max_drawdown": self.max_drawdown,
+            "fills": self.fills,
+            "rejections": self.rejections,
+            "last_rejection": self.last_rejection,
+        }
+
+    @staticmethod
+    def equity_curve(position_manager, names=None) -> pd.Series:
+        """
+        전략별 equity 곡선을 시각 기준으로 합산한 포트폴리오 곡선 (vectorized 백테스트 후에도 사용 가능).
+        각 전략의 값은 다음 bar까지 유지(forward fill)하고, 첫 bar 이전은 0.
+        """
+        names = list(position_manager.positions) if names is None else list(names)
+        curves = [position_manager.get_equity_curve(name) for name in names]
+        curves = [c[~c.index.duplicated(keep='last')] for c in curves if len(c)]
+        if not curves:
+            return pd.Series(dtype=float, name="portfolio")
+        frame = pd.concat(curves, axis=1).sort_index().ffill().fillna(0.0)
+        return frame.sum(axis=1).rename("portfolio")
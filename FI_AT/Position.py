@@ -1,54 +1,256 @@
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
-class PositionManager:
+NAT = np.iinfo(np.int64).min  # datetime64[ns]의 NaT와 같은 값
+
+FILL_DTYPE = np.dtype([
+    ("bar", np.int64),      # 전략이 받은 bar 순번
+    ("time", np.int64),     # 체결 bar 시각 (ns, 없으면 NaT)
+    ("side", np.int8),      # 1=BUY, -1=SELL
+    ("qty", np.float64),    # 체결 수량 (진입 1, 반대 포지션 전환 2)
+    ("price", np.float64),
+])
+
+EQUITY_DTYPE = np.dtype([
+    ("time", np.int64),
+    ("price", np.float64),
+    ("position", np.int8),
+    ("equity", np.float64),  # 실현 손익 + 평가 손익
+])
+
+
+class GrowableArray:
+    """미리 잡아 둔 numpy (structured) 배열에 기록하고, 가득 차면 2배로 늘린다 (append 분할상환 O(1))."""
+
+    __slots__ = ("_data", "length")
+
+    def __init__(self, dtype, capacity: int = 256):
+        self._data = np.empty(max(1, capacity), dtype=dtype)
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def _reserve(self, size: int):
+        if size > len(self._data):
+            grown = np.empty(max(size, len(self._data) * 2), dtype=self._data.dtype)
+            grown[:self.length] = self._data[:self.length]
+            self._data = grown
+
+    def append(self, row: tuple):
+        self._reserve(self.length + 1)
+        self._data[self.length] = row
+        self.length += 1
+
+    def extend(self, rows: np.ndarray):
+        self._reserve(self.length + len(rows))
+        self._data[self.length:self.length + len(rows)] = rows
+        self.length += len(rows)
+
+    def view(self) -> np.ndarray:
+        return self._data[:self.length]
+
+
+class StrategyBook:
+    """전략 1개의 포지션 상태, 체결 장부, bar별 평가 손익 곡선."""
+
+    __slots__ = ("position", "entry_price", "pnl", "fills", "equity", "bar_count")
+
     def __init__(self):
-        # {strategy_name: {"position": int, "entry_price": float, ...}}
-        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.position = 0
+        self.entry_price = None
+        self.pnl = 0.0  # 실현 손익
+        self.fills = GrowableArray(FILL_DTYPE)
+        self.equity = GrowableArray(EQUITY_DTYPE)
+        self.bar_count = 0
+
+    def unrealized(self, price: float) -> float:
+        if self.position == 0 or self.entry_price is None:
+            return 0.0
+        return self.position * (price - self.entry_price)
+
+
+def _to_ns(timestamp) -> int:
+    if timestamp is None:
+        return NAT
+    return pd.Timestamp(timestamp).value if not isinstance(timestamp, (int, np.integer)) else int(timestamp)
+
 
-    def update_position(self, strategy_name: str, signal: int, price: float):
+class PositionManager:
+    def __init__(self, portfolio=None):
+        # {strategy_name: StrategyBook}
+        self.positions: Dict[str, StrategyBook] = {}
+        # Portfolio: 지정하면 전략 합산 노출/손익을 체결마다 갱신하고 체결 전 위험 한도를 검사
+        self.portfolio = portfolio
+
+    def _book(self, strategy_name: str) -> StrategyBook:
+        book = self.positions.get(strategy_name)
+        if book is None:
+            book = self.positions[strategy_name] = StrategyBook()
+        return book
+
+    def update_position(self, strategy_name: str, signal: int, price: float, timestamp=None) -> bool:
         """
         signal: 1=Buy, -1=Sell, 0=Flat/No action
         price: 체결 가격
+        timestamp: 체결 bar 시각 (bar 순번은 mark_to_market 호출 횟수로 자동 기록)
+        체결되면 True, 체결할 것이 없거나 portfolio 위험 한도로 거부되면 False
+        """
+        book = self._book(strategy_name)
+        pos = book.position
+
+        if signal == 1 and pos <= 0:  # Buy
+            side = 1
+            # 만약 기존에 숏 포지션이 있었다면, 청산 손익 계산
+            realized = book.entry_price - price if pos == -1 and book.entry_price is not None else 0.0
+        elif signal == -1 and pos >= 0:  # Sell
+            side = -1
+            # 만약 기존에 롱 포지션이 있었다면, 청산 손익 계산
+            realized = price - book.entry_price if pos == 1 and book.entry_price is not None else 0.0
+        else:
+            # signal == 0 or None, 또는 이미 같은 방향 포지션: do nothing
+            return False
+
+        portfolio = self.portfolio
+        if portfolio is not None and not portfolio.check(strategy_name, pos, side):
+            return False
+        entry = book.entry_price
+        if pos != 0 and entry is not None:
+            book.pnl += realized
+        book.position = side
+        book.entry_price = price
+        book.fills.append((book.bar_count, _to_ns(timestamp), side, abs(side - pos), price))
+        if portfolio is not None:
+            portfolio.on_fill(strategy_name, pos, entry, side, price, realized, price)
+        return True
+
+    def mark_to_market(self, strategy_name: str, price: float, timestamp=None, mark_portfolio: bool = True):
+        # bar 종료 시 호출: 평가 손익을 반영한 equity를 곡선에 추가하고 bar 순번 증가
+        # mark_portfolio=False: 호출자가 피드 단위로 portfolio.mark를 이미 한 경우 (SignalHub)
+        book = self._book(strategy_name)
+        book.equity.append((_to_ns(timestamp), price, book.position, book.pnl + book.unrealized(price)))
+        book.bar_count += 1
+        if mark_portfolio and self.portfolio is not None:
+            self.portfolio.mark(self.portfolio.asset_of(strategy_name), price)
+
+    def apply_signals(self, strategy_name: str, signals: np.ndarray, prices: np.ndarray, times: np.ndarray = None):
         """
-        if strategy_name not in self.positions:
-            self.positions[strategy_name] = {"position": 0, "entry_price": None, "history": [], "pnl": 0.0}
-
-        pos = self.positions[strategy_name]["position"]
-
-        if signal == 1:  # Buy
-            if pos <= 0:
-                # 만약 기존에 숏 포지션이 있었다면, 청산 손익 계산
-                if pos == -1 and self.positions[strategy_name]["entry_price"] is not None:
-                    pnl = self.positions[strategy_name]["entry_price"] - price
-                    self.positions[strategy_name]["pnl"] += pnl
-                self.positions[strategy_name]["position"] = 1
-                self.positions[strategy_name]["entry_price"] = price
-                self.positions[strategy_name]["history"].append(("BUY", price))
-        elif signal == -1:  # Sell
-            if pos >= 0:
-                # 만약 기존에 롱 포지션이 있었다면, 청산 손익 계산
-                if pos == 1 and self.positions[strategy_name]["entry_price"] is not None:
-                    pnl = price - self.positions[strategy_name]["entry_price"]
-                    self.positions[strategy_name]["pnl"] += pnl
-                self.positions[strategy_name]["position"] = -1
-                self.positions[strategy_name]["entry_price"] = price
-                self.positions[strategy_name]["history"].append(("SELL", price))
-        # signal == 0 or None: do nothing
+        vectorized 백테스트용: bar별 signal 배열을 한 번에 반영.
+        결과(포지션, 체결 장부, 실현 손익, equity 곡선)는 각 bar마다 update_position과
+        mark_to_market을 호출한 것과 동일하다.
+        """
+        book = self._book(strategy_name)
+        signals = np.asarray(signals)
+        prices = np.asarray(prices, dtype=float)
+        n = len(prices)
+        if times is None:
+            times = np.full(n, NAT, dtype=np.int64)
+        else:
+            times = np.asarray(times).astype('datetime64[ns]').view(np.int64)
+
+        start_pos, start_entry, start_pnl = book.position, book.entry_price, book.pnl
+        nz = np.flatnonzero(signals)
+        sides = np.sign(signals[nz]).astype(np.int8)
+
+        # 현재 포지션과 같은 방향의 signal은 무시되므로, 방향이 바뀌는 지점만 체결
+        prev = np.empty_like(sides)
+        if len(sides):
+            prev[0] = start_pos
+            prev[1:] = sides[:-1]
+        fill_mask = sides != prev
+        fill_idx = nz[fill_mask]
+        fill_sides = sides[fill_mask]
+        fill_prices = prices[fill_idx]
+        fill_prev = prev[fill_mask]
+
+        # 청산 손익: 직전 진입 가격 대비 (롱 청산 = price - entry, 숏 청산 = entry - price)
+        entries = np.empty_like(fill_prices)
+        entries[1:] = fill_prices[:-1]
+        if len(entries):
+            entries[0] = start_entry if start_entry is not None else np.nan
+        closing = (fill_prev != 0) & ~np.isnan(entries)
+        realized = np.where(fill_prev == 1, fill_prices - entries, entries - fill_prices)
+        # update_position과 같은 순서로 누적해야 부동소수점 결과가 일치한다
+        pnl_steps = np.where(closing, realized, 0.0)
+        cum_pnl = np.cumsum(np.r_[start_pnl, pnl_steps])
+        pnl_after_fill = cum_pnl[1:]
+
+        fills = np.empty(len(fill_idx), dtype=FILL_DTYPE)
+        fills["bar"] = book.bar_count + fill_idx
+        fills["time"] = times[fill_idx]
+        fills["side"] = fill_sides
+        fills["qty"] = np.abs(fill_sides.astype(np.float64) - fill_prev)
+        fills["price"] = fill_prices
+        book.fills.extend(fills)
+
+        # bar별 포지션/진입가/실현손익을 직전 체결 값으로 forward fill
+        last_fill = np.searchsorted(fill_idx, np.arange(n), side='right') - 1
+        has_fill = last_fill >= 0
+        position = np.where(has_fill, fill_sides[last_fill.clip(0)] if len(fill_idx) else 0, start_pos)
+        entry = np.where(has_fill, fill_prices[last_fill.clip(0)] if len(fill_idx) else np.nan,
+                         start_entry if start_entry is not None else np.nan)
+        realized_pnl = np.where(has_fill, pnl_after_fill[last_fill.clip(0)] if len(fill_idx) else 0.0, start_pnl)
+        unrealized = np.where((position != 0) & ~np.isnan(entry), position * (prices - entry), 0.0)
+
+        curve = np.empty(n, dtype=EQUITY_DTYPE)
+        curve["time"] = times
+        curve["price"] = prices
+        curve["position"] = position
+        curve["equity"] = realized_pnl + unrealized
+        book.equity.extend(curve)
+        book.bar_count += n
+
+        if len(fill_idx):
+            book.position = int(fill_sides[-1])
+            book.entry_price = fill_prices[-1]
+            book.pnl = float(pnl_after_fill[-1])
+        if self.portfolio is not None and n:
+            # 전체 구간의 순변화만 마지막 가격으로 반영: 노출/손익은 끝 시점 기준으로 맞지만 bar별 한도 검사와
+            # peak/drawdown 경로는 반영되지 않음 (BacktestExecution은 portfolio가 있으면 bar-by-bar로 실행,
+            # 직접 호출했다면 낙폭은 Portfolio.equity_curve로 계산)
+            if len(fill_idx):
+                self.portfolio.on_fill(strategy_name, start_pos, start_entry, book.position, book.entry_price,
+                                       book.pnl - start_pnl, prices[-1])
+            else:
+                self.portfolio.mark(self.portfolio.asset_of(strategy_name), prices[-1])
 
     def get_position(self, strategy_name: str):
-        return self.positions.get(strategy_name, {"position": 0, "entry_price": None})
+        book = self.positions.get(strategy_name)
+        if book is None:
+            return {"position": 0, "entry_price": None}
+        return {"position": book.position, "entry_price": book.entry_price, "pnl": book.pnl}
 
     def get_all_positions(self):
-        return self.positions
+        return {name: self.get_position(name) for name in self.positions}
+
+    def get_fills(self, strategy_name: str) -> np.ndarray:
+        # 체결 장부 structured array view (bar, time, side, qty, price)
+        book = self.positions.get(strategy_name)
+        return book.fills.view() if book is not None else np.empty(0, dtype=FILL_DTYPE)
+
+    def get_equity(self, strategy_name: str) -> np.ndarray:
+        # bar별 equity 곡선 structured array view (time, price, position, equity)
+        book = self.positions.get(strategy_name)
+        return book.equity.view() if book is not None else np.empty(0, dtype=EQUITY_DTYPE)
+
+    def get_equity_curve(self, strategy_name: str) -> pd.Series:
+        curve = self.get_equity(strategy_name)
+        times = curve["time"]
+        if len(times) and (times != NAT).all():
+            return pd.Series(curve["equity"], index=pd.DatetimeIndex(times.view('datetime64[ns]')), name=strategy_name)
+        return pd.Series(curve["equity"], name=strategy_name)
 
     def get_history(self, strategy_name: str):
-        return self.positions.get(strategy_name, {}).get("history", [])
+        # 호환용: [("BUY"/"SELL", price)] 리스트
+        fills = self.get_fills(strategy_name)
+        return [("BUY" if side == 1 else "SELL", price) for side, price in zip(fills["side"], fills["price"])]
 
     def summary(self):
         # 전체 포지션 요약 출력
-        for name, info in self.positions.items():
+        for name, book in self.positions.items():
+            last = book.equity.view()[-1]["equity"] if len(book.equity) else book.pnl
             print("=================")
             print(f"Strategy: {name}")
-            print(f"[{name}] Position: {info['position']}, Entry: {info['entry_price']}, History: {info['history']}")
-            print(f"[{name}] Realized PnL: {info.get('pnl', 0.0)}")
\ No newline at end of file
+            print(f"[{name}] Position: {book.position}, Entry: {book.entry_price}, Fills: {len(book.fills)}, Bars: {book.bar_count}")
+            print(f"[{name}] Realized PnL: {book.pnl}, Equity: {last}")
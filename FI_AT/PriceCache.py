@@ -0,0 +1,206 @@
+import json
+import os
+import shutil
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+"""
+asset_id별 로컬 가격 캐시
+
+- 컬럼별 .npy 파일(trade_date는 int64 ns)로 저장하고 np.load(mmap_mode='r')로 읽는다.
+  캐시 hit 시 DataFrame은 memmap slice 위에 만들어지므로 복사가 없다.
+- meta.json에 이미 받아 둔 [start, end) 구간 목록을 기록하고, 요청 구간 중 빠진 부분만 DB에서 조회한다.
+  DB 적재가 늦을 수 있으므로 최근 ingest_lag초 구간은 받아 두어도 완료로 기록하지 않고 다음 조회 때 다시 받는다.
+- 갱신 시에는 새 버전 디렉터리(v{n})에 기록한 뒤 meta.json을 교체한다.
+  (Windows에서는 memmap으로 열려 있는 파일을 덮어쓸 수 없기 때문)
+"""
+
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache')
+
+Range = Tuple[int, int]
+
+
+def _to_ns(dt) -> int:
+    return pd.Timestamp(dt).value
+
+
+def _merge_ranges(ranges: List[Range]) -> List[Range]:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _missing_ranges(covered: List[Range], start: int, end: int) -> List[Range]:
+    # [start, end) 중 covered에 포함되지 않은 구간
+    gaps = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class PriceCache:
+    def __init__(self, fetch: Callable[[str, str, str], pd.DataFrame], root: str = DEFAULT_ROOT,
+                 verbose: bool = False, ingest_lag: float = 900.0):
+        """
+        fetch(symbol, from_dt, to_dt): [from_dt, to_dt) 구간의 1분 원시 가격
+        (trade_date, open, high, low, close, volume)을 반환하는 함수. DB, SQLite, fake cursor 모두 가능.
+        ingest_lag: 현재 시각 기준 이 시간(초) 이내의 row는 아직 DB에 들어오는 중일 수 있다고 본다.
+        """
+        self.fetch = fetch
+        self.root = root
+        self.ingest_lag = ingest_lag
+        self.verbose = verbose
+        self.stats = {"hits": 0, "misses": 0, "db_queries": 0, "db_time": 0.0, "read_time": 0.0}
+        self.last_timing = {}
+
+    # ---- public ----
+    def get(self, symbol: str, from_dt, to_dt=None) -> pd.DataFrame:
+        """[from_dt, to_dt) 구간의 원시 가격. 빠진 구간만 fetch 후 memmap view로 반환."""
+        started = time.perf_counter()
+        now = pd.Timestamp.now()
+        to_dt = to_dt if to_dt is not None else now
+        start, end = _to_ns(from_dt), _to_ns(to_dt)
+
+        meta = self._read_meta(symbol)
+        gaps = _missing_ranges(meta["ranges"], start, end)
+        db_time = 0.0
+        if gaps:
+            self.stats["misses"] += 1
+            frames = []
+            t0 = time.perf_counter()
+            for gap_start, gap_end in gaps:
+                frames.append(self.fetch(symbol, self._fmt(gap_start), self._fmt(gap_end)))
+                self.stats["db_queries"] += 1
+            db_time = time.perf_counter() - t0
+            self.stats["db_time"] += db_time
+            # 미래 구간과 아직 적재 중일 수 있는 최근 구간은 캐시 완료로 기록하지 않음 (다음 조회 때 다시 받음)
+            horizon = min(end, now.value - int(self.ingest_lag * 1e9))
+            covered = [(s, min(e, horizon)) for s, e in gaps if s < horizon]
+            meta = self._write(symbol, meta, frames, covered)
+        else:
+            self.stats["hits"] += 1
+
+        df = self._slice(symbol, meta, start, end)
+        total = time.perf_counter() - started
+        self.stats["read_time"] += total - db_time
+        self.last_timing = {"symbol": symbol, "hit": not gaps, "db_time": db_time, "total_time": total,
+                            "rows": len(df)}
+        if self.verbose:
+            state = "hit" if not gaps else f"miss({len(gaps)} gap)"
+            print(f"[PriceCache] {symbol} {state} rows={len(df)} db={db_time:.3f}s total={total:.3f}s")
+        return df
+
+    def covered_ranges(self, symbol: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        return [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in self._read_meta(symbol)["ranges"]]
+
+    def clear(self, symbol: str = None):
+        path = self._dir(symbol) if symbol else self.root
+        shutil.rmtree(path, ignore_errors=True)
+
+    # ---- storage ----
+    def _dir(self, symbol):
+        return os.path.join(self.root, symbol)
+
+    def _version_dir(self, symbol, version):
+        return os.path.join(self._dir(symbol), f"v{version}")
+
+    @staticmethod
+    def _fmt(ns: int) -> str:
+        return pd.Timestamp(ns).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    def _read_meta(self, symbol):
+        path = os.path.join(self._dir(symbol), "meta.json")
+        if not os.path.exists(path):
+            return {"version": 0, "rows": 0, "ranges": []}
+        with open(path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["ranges"] = [tuple(r) for r in meta["ranges"]]
+        return meta
+
+    def _load_arrays(self, symbol, meta):
+        if meta["rows"] == 0:
+            return None
+        directory = self._version_dir(symbol, meta["version"])
+        arrays = {"trade_date": np.load(os.path.join(directory, "trade_date.npy"), mmap_mode="r")}
+        for col in COLUMNS:
+            arrays[col] = np.load(os.path.join(directory, f"{col}.npy"), mmap_mode="r")
+        return arrays
+
+    def _slice(self, symbol, meta, start, end) -> pd.DataFrame:
+        arrays = self._load_arrays(symbol, meta)
+        if arrays is None:
+            return pd.DataFrame(columns=['trade_date'] + COLUMNS)
+        ts = arrays["trade_date"]
+        lo, hi = np.searchsorted(ts, [start, end], side="left")
+        data = {"trade_date": ts[lo:hi].view("datetime64[ns]")}
+        for col in COLUMNS:
+            data[col] = arrays[col][lo:hi]
+        return pd.DataFrame(data, copy=False)
+
+    def _write(self, symbol, meta, frames, covered):
+        new = [self._normalize(f) for f in frames if f is not None and len(f)]
+        old = self._load_arrays(symbol, meta)
+        if old is not None:
+            new.insert(0, {k: np.asarray(v) for k, v in old.items()})
+
+        if new:
+            merged = {k: np.concatenate([part[k] for part in new]) for k in ['trade_date'] + COLUMNS}
+            # 시간순 정렬, 같은 시각이 중복되면 나중에 받은 값 유지
+            order = np.argsort(merged["trade_date"], kind="stable")
+            merged = {k: v[order] for k, v in merged.items()}
+            ts = merged["trade_date"]
+            keep = np.ones(len(ts), dtype=bool)
+            keep[:-1] = ts[1:] != ts[:-1]
+            merged = {k: v[keep] for k, v in merged.items()}
+            rows = len(merged["trade_date"])
+        else:
+            merged, rows = None, 0
+
+        version = meta["version"] + 1
+        if merged is not None:
+            directory = self._version_dir(symbol, version)
+            os.makedirs(directory, exist_ok=True)
+            for col, values in merged.items():
+                np.save(os.path.join(directory, f"{col}.npy"), values)
+        else:
+            version = meta["version"]
+
+        new_meta = {"version": version, "rows": rows,
+                    "ranges": _merge_ranges(list(meta["ranges"]) + covered)}
+        os.makedirs(self._dir(symbol), exist_ok=True)
+        tmp = os.path.join(self._dir(symbol), "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(new_meta, f)
+        os.replace(tmp, os.path.join(self._dir(symbol), "meta.json"))
+        self._remove_old_versions(symbol, version)
+        return new_meta
+
+    def _remove_old_versions(self, symbol, version):
+        for name in os.listdir(self._dir(symbol)):
+            if name.startswith("v") and name != f"v{version}":
+                # 다른 곳에서 아직 memmap 중이면(Windows) 지울 수 없으므로 다음 갱신 때 다시 시도
+                shutil.rmtree(os.path.join(self._dir(symbol), name), ignore_errors=True)
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame):
+        out = {"trade_date": pd.to_datetime(df["trade_date"]).to_numpy(dtype="datetime64[ns]").view(np.int64)}
+        for col in COLUMNS:
+            out[col] = pd.to_numeric(df[col]).to_numpy(dtype=np.float64)
+        return out
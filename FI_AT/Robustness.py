@@ -0,0 +1,226 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .Evaluation import Evaluation
+
+"""
+Monte Carlo / bootstrap 기반 성과 지표 신뢰구간
+
+- block: bar별 손익(equity 변화량)을 stationary block bootstrap (Politis-Romano)으로 재표본
+  블록 길이는 평균 mean_block인 기하분포, 시작 위치는 균등, 끝은 처음으로 이어짐 (자기상관 보존)
+- shuffle: 체결 단위 손익(Evaluation.get_daily_pnl)의 순서를 섞음 (replace=True면 복원추출)
+  순서만 섞으면 최종 손익/Sharpe는 그대로이고 최대 낙폭 분포만 달라진다
+- 경로는 (chunk x bar) 2차원 배열로 한 번에 계산하고, chunk 크기는 max_memory로 제한한다
+- chunk마다 SeedSequence에서 나눈 seed를 쓰므로 worker 수와 관계없이 결과가 같다
+"""
+
+METRICS = ("sharpe", "max_drawdown", "final_pnl")
+
+
+def path_metrics(paths: np.ndarray, periods_per_year: int = 252) -> Dict[str, np.ndarray]:
+    """
+    (경로 수 x 기간) 손익 배열의 경로별 Sharpe, 최대 낙폭(0에서 시작한 누적 손익 기준), 최종 손익.
+    paths는 누적 손익으로 덮어쓴다 (chunk 메모리 재사용).
+    """
+    n = paths.shape[1]
+    sumsq = np.einsum('ij,ij->i', paths, paths)
+    equity = np.cumsum(paths, axis=1, out=paths)
+    final_pnl = equity[:, -1].copy()
+    if n > 1:
+        # 제곱합으로 분산 계산 (경로 배열을 한 번 더 읽지 않도록)
+        var = np.maximum(sumsq - final_pnl * final_pnl / n, 0.0) / (n - 1)
+        std = np.sqrt(var)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(std > 0, final_pnl / n / std * np.sqrt(periods_per_year), np.nan)
+    else:
+        sharpe = np.full(len(paths), np.nan)
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, 0.0, out=peak)
+    np.subtract(peak, equity, out=peak)
+    return {"sharpe": sharpe, "max_drawdown": peak.max(axis=1), "final_pnl": final_pnl}
+
+
+def block_indices(rng: np.random.Generator, n_paths: int, n: int, mean_block: float) -> np.ndarray:
+    """
+    경로마다 기하분포 길이의 블록을 이어 붙인 index (n_paths x n).
+    처음으로 이어지는 블록을 나머지 연산 없이 처리하도록 값 범위는 [0, 2n): 원본을 두 번 이어 붙인 배열의 index.
+    """
+    p = min(1.0, 1.0 / mean_block)
+    expected = n * p
+    k = int(expected + 6 * math.sqrt(expected) + 8)
+    lengths = rng.geometric(p, size=(n_paths, k))
+    ends = np.cumsum(lengths, axis=1)
+    short = ends[:, -1] < n
+    while short.any():
+        # 블록 수가 모자란 경로(드묾)는 열을 더 뽑아서 채움
+        extra = rng.geometric(p, size=(n_paths, k))
+        lengths = np.concatenate([lengths, extra], axis=1)
+        ends = np.cumsum(lengths, axis=1)
+        short = ends[:, -1] < n
+    begins = ends - lengths
+    # n을 넘는 블록은 잘라서 경로마다 정확히 n개
+    used = np.clip(np.minimum(ends, n) - begins, 0, None)
+    starts = rng.integers(0, n, size=lengths.shape)
+    dtype = np.int32 if 2 * n < 2**31 else np.int64
+    idx = np.repeat((starts - begins).astype(dtype).ravel(), used.ravel()).reshape(n_paths, n)
+    idx += np.arange(n, dtype=dtype)
+    return idx
+
+
+def _chunk_size(n: int, max_memory: int) -> int:
+    # 경로 1개당 손익/낙폭 배열(8 byte)과 index 배열(4~8 byte)
+    return max(1, int(max_memory // (max(n, 1) * 8 * 3)))
+
+
+def _run_block(returns, n_paths, mean_block, seed, periods_per_year):
+    rng = np.random.default_rng(seed)
+    doubled = np.concatenate([returns, returns])
+    paths = doubled[block_indices(rng, n_paths, len(returns), mean_block)]
+    return path_metrics(paths, periods_per_year)
+
+
+def _run_shuffle(trades, n_paths, replace, seed, periods_per_year):
+    rng = np.random.default_rng(seed)
+    if replace:
+        paths = trades[rng.integers(0, len(trades), size=(n_paths, len(trades)))]
+    else:
+        paths = rng.permuted(np.broadcast_to(trades, (n_paths, len(trades))), axis=1)
+    return path_metrics(paths, periods_per_year)
+
+
+# worker 프로세스별로 한 번만 전달되는 원본 손익
+_worker_values = None
+
+
+def _init_worker(values):
+    global _worker_values
+    _worker_values = values
+
+
+def _run_task(args):
+    method, chunks, option, periods_per_year = args
+    run = _run_block if method == "block" else _run_shuffle
+    return [run(_worker_values, n_paths, option, seed, periods_per_year) for n_paths, seed in chunks]
+
+
+def resample(values: np.ndarray, method: str = "block", n_paths: int = 10_000, mean_block: float = None,
+             replace: bool = False, seed=None, periods_per_year: int = 252, max_memory: int = 256 * 2**20,
+             max_workers: int = 1) -> Dict[str, np.ndarray]:
+    """
+    values(bar별 또는 체결별 손익)를 n_paths번 재표본해서 경로별 지표 배열을 반환.
+    method: "block" (stationary block bootstrap) 또는 "shuffle" (체결 순서 섞기)
+    mean_block: 평균 블록 길이 (기본 n^(1/3))
+    max_workers > 1이면 chunk들을 process pool에서 계산 (결과는 직렬 실행과 같음)
+    """
+    values = np.ascontiguousarray(values, dtype=float)
+    n = len(values)
+    if n == 0:
+        return {metric: np.full(n_paths, np.nan) for metric in METRICS}
+    if method == "block":
+        option = mean_block or max(1.0, n ** (1 / 3))
+    elif method == "shuffle":
+        option = replace
+    else:
+        raise ValueError(f"unknown method: {method}")
+
+    size = _chunk_size(n, max_memory)
+    counts = [min(size, n_paths - start) for start in range(0, n_paths, size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    chunks = list(zip(counts, seeds))
+
+    if max_workers == 1 or len(chunks) == 1:
+        _init_worker(values)
+        try:
+            results = _run_task((method, chunks, option, periods_per_year))
+        finally:
+            _init_worker(None)
+    else:
+        # 원본 손익은 worker 시작 시 한 번만 전달하고, task에는 (경로 수, seed)만 보냄
+        n_tasks = min(len(chunks), max_workers * 4)
+        tasks = [(method, chunks[i::n_tasks], option, periods_per_year) for i in range(n_tasks)]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(values,)) as pool:
+            parts = list(pool.map(_run_task, tasks))
+        # chunk 순서대로 다시 맞춤 (task i는 chunk i, i + n_tasks, ...를 계산)
+        results = [None] * len(chunks)
+        for i, part in enumerate(parts):
+            results[i::n_tasks] = part
+    return {metric: np.concatenate([r[metric] for r in results]) for metric in METRICS}
+
+
+def confidence_intervals(samples: Dict[str, np.ndarray], estimate: Dict[str, float] = None,
+                         level: float = 0.95) -> pd.DataFrame:
+    # 지표별 백분위 구간 (nan 경로 제외)
+    tail = (1 - level) / 2 * 100
+    rows = {}
+    for metric, values in samples.items():
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            rows[metric] = {"estimate": np.nan, "mean": np.nan, "std": np.nan,
+                            "lower": np.nan, "median": np.nan, "upper": np.nan}
+            continue
+        lower, median, upper = np.percentile(values, [tail, 50, 100 - tail])
+        rows[metric] = {
+            "estimate": estimate.get(metric, np.nan) if estimate else np.nan,
+            "mean": values.mean(),
+            "std": values.std(ddof=1) if len(values) > 1 else np.nan,
+            "lower": lower,
+            "median": median,
+            "upper": upper,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis("metric")
+
+
+class RobustnessAnalysis:
+    def __init__(self, position_manager, n_paths: int = 10_000, mean_block: float = None, level: float = 0.95,
+                 seed=None, replace: bool = False, periods_per_year: int = 252,
+                 max_memory: int = 256 * 2**20, max_workers: int = 1):
+        self.position_manager = position_manager
+        self.evaluator = Evaluation(position_manager)
+        self.n_paths = n_paths
+        self.mean_block = mean_block
+        self.level = level
+        self.seed = seed
+        self.replace = replace
+        self.periods_per_year = periods_per_year
+        self.max_memory = max_memory
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def bar_returns(self, strategy_name) -> np.ndarray:
+        return np.diff(self.position_manager.get_equity(strategy_name)["equity"])
+
+    def trade_returns(self, strategy_name) -> np.ndarray:
+        return self.evaluator.get_daily_pnl(strategy_name).to_numpy(dtype=float)
+
+    def analyze(self, strategy_name) -> pd.DataFrame:
+        """전략 1개의 block bootstrap / 체결 순서 섞기 신뢰구간 (index: method, metric)."""
+        tables = {}
+        for method, values, seed_offset in (("block", self.bar_returns(strategy_name), 0),
+                                            ("shuffle", self.trade_returns(strategy_name), 1)):
+            samples = resample(values, method, self.n_paths, self.mean_block, self.replace,
+                               None if self.seed is None else [self.seed, seed_offset],
+                               self.periods_per_year, self.max_memory, self.max_workers)
+            estimate = {m: float(v[0]) for m, v in path_metrics(values[None, :].copy(), self.periods_per_year).items()} \
+                if len(values) else None
+            tables[method] = confidence_intervals(samples, estimate, self.level)
+        return pd.concat(tables, names=["method"])
+
+    def run(self, names: List[str] = None) -> pd.DataFrame:
+        names = list(self.position_manager.positions) if names is None else list(names)
+        if not names:
+            return pd.DataFrame()
+        return pd.concat({name: self.analyze(name) for name in names}, names=["strategy"])
+
+    def summary(self, strategy_name, print_result=True):
+        table = self.analyze(strategy_name)
+        lines = [f"==== Robustness for {strategy_name} ({self.n_paths} paths, {self.level * 100:.0f}% CI) ===="]
+        for (method, metric), row in table.iterrows():
+            lines.append(f"[{method}] {metric}: {row['estimate']:.4f} ({row['lower']:.4f} ~ {row['upper']:.4f})")
+        result = "\n".join(lines)
+        if print_result:
+            print(result)
+        return result
@@ -0,0 +1,372 @@
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import pickle
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .BarFile import BAR_DTYPE
+from .DataStream import bar_time
+from .Execution import BacktestExecution
+from .IndicatorRegistry import IndicatorRegistry
+from .Journal import frame_records, records_frame
+from .Position import PositionManager
+from .SignalHub import SignalHub
+
+"""
+전략을 여러 worker 프로세스로 나눠 실행 (GIL 회피)
+
+- 전략은 등록 순서대로 worker에 round-robin 배정 (worker마다 피드별 IndicatorRegistry를 따로 가짐)
+- bar는 피드당 한 번 조회해서 shared memory ring buffer(BarRing)의 slot에 한 번만 기록하고,
+  worker에는 (순번, 피드, row 수)만 보낸다. worker는 slot을 복사 없이 DataFrame으로 감싸서 rule에 전달
+- signal은 main 프로세스로 모아 bar 순번 -> 구독 전략 등록 순서로 PositionManager에 반영
+  (직렬 SignalHub.notify_strategies와 같은 순서라 결과가 같다). worker는 최대 capacity개 bar까지 앞서 계산
+- worker가 비정상 종료하면 새 프로세스를 띄우고, 지금까지의 bar를 다시 계산시켜 상태를 복구한 뒤 이어서 진행
+  (rule 예외는 재시작하지 않고 main에서 RuntimeError로 전달)
+  max_history를 주면 반영이 끝난 bar는 최근 그 개수만 보관하고 그것으로 복구한다 (지표 window가 그보다 길면 근사 복구).
+  live 실행은 bar가 끝없이 쌓이므로 기본값이 재시작 없음(max_restarts=0)이다.
+
+주의: worker에 전달되는 frame은 시각 컬럼과 OHLCV만 가지며, ring slot을 가리키므로 전략이 frame을 보관하면 안 된다.
+"""
+
+# worker별로 응답을 기다리는 bar 수 상한. pipe 버퍼 안에 요청/응답이 모두 들어가야
+# main의 send와 worker의 send가 서로를 막지 않는다 (메시지는 100 byte 내외)
+MAX_IN_FLIGHT = 256
+# 재시작 복구용 bar를 한 번에 보내는 개수 (세션 전체를 pipe 메시지 하나로 만들지 않도록)
+REPLAY_CHUNK = 1024
+
+
+class BarRing:
+    """shared memory 위의 (capacity x max_rows) bar record 배열. bar 순번 seq는 slot seq % capacity에 기록."""
+
+    def __init__(self, capacity: int, max_rows: int, name: str = None):
+        self.capacity = capacity
+        self.max_rows = max_rows
+        size = capacity * max_rows * BAR_DTYPE.itemsize
+        self.owner = name is None
+        self.shm = SharedMemory(name=name, create=self.owner, size=size)
+        self.records = np.ndarray((capacity, max_rows), dtype=BAR_DTYPE, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, seq: int, records: np.ndarray) -> bool:
+        # slot보다 긴 frame은 기록하지 않음 (호출자가 pipe로 직접 전달)
+        if len(records) > self.max_rows:
+            return False
+        self.records[seq % self.capacity, :len(records)] = records
+        return True
+
+    def read(self, seq: int, n: int) -> np.ndarray:
+        return self.records[seq % self.capacity, :n]
+
+    def close(self):
+        # view가 남아 있으면 shared memory를 닫을 수 없으므로 먼저 해제
+        self.records = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # 전략이 frame을 잡고 있는 worker 종료 시 (프로세스 종료와 함께 해제됨)
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker_main(conn, ring_name: str, capacity: int, max_rows: int, payload: bytes, share_indicators: bool):
+    # payload: pickle된 [(전략 index, 피드, 전략)] (재시작 시에도 처음 상태에서 시작)
+    ring = BarRing(capacity, max_rows, ring_name)
+    strategies = pickle.loads(payload)
+    by_feed: Dict[Tuple[str, str], List] = {}
+    registries: Dict[Tuple[str, str], IndicatorRegistry] = {}
+    for index, key, strategy in strategies:
+        by_feed.setdefault(key, []).append((index, strategy))
+        if hasattr(strategy, 'use_registry'):
+            registry = registries.setdefault(key, IndicatorRegistry()) if share_indicators else None
+            strategy.use_registry(registry)
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            if message[0] == "replay":
+                # 재시작: 이미 반영된 bar로 전략 상태만 복구 (signal/출력은 버림)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for key, time_column, records in message[1]:
+                        frame = records_frame(records, time_column)
+                        for _, strategy in by_feed.get(key, ()):
+                            strategy.rule(frame)
+                continue
+            seq, key, time_column, n, inline = message
+            frame = records_frame(ring.read(seq, n) if inline is None else inline, time_column)
+            signals = []
+            for index, strategy in by_feed.get(key, ()):
+                signal = strategy.rule(frame)
+                if signal is not None:
+                    signals.append((index, signal))
+            del frame
+            conn.send((seq, signals))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        ring.close()
+
+
+class _Pending:
+    __slots__ = ("seq", "key", "frame", "message", "waiting", "signals")
+
+    def __init__(self, seq, key, frame, message, waiting):
+        self.seq = seq
+        self.key = key
+        self.frame = frame
+        self.message = message
+        self.waiting = waiting
+        self.signals = {}
+
+
+class ShardPool:
+    """
+    worker 프로세스 묶음. publish(피드, frame)으로 bar를 보내고, 결과는 bar 순서대로 position_manager에 반영.
+    max_restarts=0이면 재시작용 bar 기록을 남기지 않고, max_history를 주면 최근 그 개수만 남긴다 (장시간 실행 시 메모리 제한).
+    """
+
+    def __init__(self, strategies, position_manager: PositionManager, n_workers: int = None,
+                 capacity: int = 256, max_rows: int = 64, share_indicators: bool = True,
+                 max_restarts: int = 3, start_method: str = None, recorder=None, max_history: int = None):
+        self.strategies = list(strategies)
+        self.position_manager = position_manager
+        self.n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(self.strategies) or 1))
+        self.share_indicators = share_indicators
+        self.max_restarts = max_restarts
+        self.max_history = max_history
+        self.recorder = recorder
+        self.restarts = 0
+        self._context = mp.get_context(start_method)
+        self.names = [getattr(s, '_name', s.__class__.__name__) for s in self.strategies]
+        # 피드 -> 구독 전략 index (등록 순서), 피드 -> 구독 전략이 있는 worker
+        self.subscribers: Dict[Tuple[str, str], List[int]] = {}
+        self.shard_of = [i % self.n_workers for i in range(len(self.strategies))]
+        shards = [[] for _ in range(self.n_workers)]
+        for i, strategy in enumerate(self.strategies):
+            key = SignalHub.feed_key(strategy)
+            self.subscribers.setdefault(key, []).append(i)
+            shards[self.shard_of[i]].append((i, key, strategy))
+        self.targets = {key: sorted({self.shard_of[i] for i in indices}) for key, indices in self.subscribers.items()}
+        self._payloads = [pickle.dumps(shard) for shard in shards]
+        self.ring = BarRing(capacity, max_rows)
+        self._pending: "deque[_Pending]" = deque()
+        self._by_seq: Dict[int, _Pending] = {}
+        self._history: "deque[Tuple]" = deque()
+        self._seq = 0
+        self._workers = [None] * self.n_workers
+        self._conns = [None] * self.n_workers
+        for shard in range(self.n_workers):
+            self._spawn(shard)
+
+    def _spawn(self, shard: int):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, name=f"shard-{shard}", daemon=True,
+            args=(child, self.ring.name, self.ring.capacity, self.ring.max_rows, self._payloads[shard],
+                  self.share_indicators))
+        process.start()
+        child.close()
+        self._workers[shard] = process
+        self._conns[shard] = parent
+
+    def publish(self, key: Tuple[str, str], frame: pd.DataFrame):
+        targets = self.targets.get(key)
+        if not targets or frame.empty:
+            return
+        # ring slot을 다시 쓰기 전에 그 slot의 bar 결과를 먼저 반영
+        while len(self._pending) >= min(self.ring.capacity, MAX_IN_FLIGHT):
+            self._apply_oldest()
+        if self.recorder is not None:
+            self.recorder.record_bar(key, frame)
+        seq = self._seq
+        self._seq += 1
+        records, time_column = frame_records(frame)
+        inline = None if self.ring.write(seq, records) else records
+        if inline is not None:
+            # slot에 안 들어가는 긴 frame은 pipe로 보내므로, 앞선 결과를 모두 받은 뒤 전송
+            self.drain()
+        message = (seq, key, time_column, len(records), inline)
+        entry = _Pending(seq, key, frame, message, set(targets))
+        self._pending.append(entry)
+        self._by_seq[seq] = entry
+        if self.max_restarts:
+            self._history.append((seq, key, time_column, records))
+        for shard in targets:
+            try:
+                self._conns[shard].send(message)
+            except (BrokenPipeError, ConnectionError):
+                # 이미 죽은 worker: 재시작하면서 이 bar까지 다시 보냄
+                self._restart(shard)
+
+    def drain(self):
+        while self._pending:
+            self._apply_oldest()
+
+    def _apply_oldest(self):
+        entry = self._pending[0]
+        while entry.waiting:
+            self._receive()
+        self._pending.popleft()
+        del self._by_seq[entry.seq]
+        if self.max_history is not None:
+            # 반영이 끝난 bar는 최근 max_history개만 보관 (아직 결과를 기다리는 bar는 재전송용으로 별도 유지)
+            while self._history and self._history[0][0] <= entry.seq - self.max_history:
+                self._history.popleft()
+        frame = entry.frame
+        price = frame['close'].iloc[-1]
+        timestamp = bar_time(frame)
+        # SignalHub.mark_feed와 같이 portfolio는 bar마다 피드 자산으로 한 번만 평가
+        portfolio = getattr(self.position_manager, 'portfolio', None)
+        if portfolio is not None:
+            portfolio.mark(entry.key[1], price)
+        for i in self.subscribers[entry.key]:
+            name = self.names[i]
+            signal = entry.signals.get(i)
+            if signal is not None:
+                self.position_manager.update_position(name, signal, price, timestamp)
+                if self.recorder is not None:
+                    self.recorder.record_signal(name, signal, price, timestamp,
+                                                self.position_manager.get_position(name))
+            self.position_manager.mark_to_market(name, price, timestamp, portfolio is None)
+
+    def _receive(self):
+        conns = {conn: shard for shard, conn in enumerate(self._conns)}
+        sentinels = {self._workers[shard].sentinel: shard for shard in range(self.n_workers)}
+        for ready in wait(list(conns) + list(sentinels)):
+            shard = conns.get(ready)
+            if shard is None:
+                # 결과를 다 읽기 전에 죽은 경우만 재시작 (남은 결과는 pipe에서 먼저 읽음)
+                shard = sentinels[ready]
+                if self._workers[shard].sentinel == ready and not self._conns[shard].poll():
+                    self._restart(shard)
+                continue
+            if self._conns[shard] is not ready:
+                continue  # 이번 wait 도중 재시작된 worker
+            try:
+                while self._conns[shard].poll():
+                    self._handle(shard, self._conns[shard].recv())
+            except (EOFError, ConnectionError):
+                self._restart(shard)
+
+    def _handle(self, shard: int, message):
+        seq, signals = message
+        if seq == "error":
+            self.close()
+            raise RuntimeError(f"strategy error in worker {shard}:\n{signals}")
+        entry = self._by_seq[seq]
+        entry.waiting.discard(shard)
+        for index, signal in signals:
+            entry.signals[index] = signal
+
+    def _restart(self, shard: int):
+        # 죽기 전에 보낸 결과(또는 rule 오류)는 먼저 반영
+        conn = self._conns[shard]
+        try:
+            while conn.poll():
+                self._handle(shard, conn.recv())
+        except (EOFError, OSError):
+            pass
+        conn.close()
+        self._workers[shard].join()
+        exitcode = self._workers[shard].exitcode
+        if self.restarts >= self.max_restarts:
+            self.close()
+            raise RuntimeError(f"worker {shard} exited with code {exitcode} (restart limit {self.max_restarts})")
+        self.restarts += 1
+        print(f"[ShardPool] worker {shard} exited with code {exitcode}, restarting ({self.restarts}/{self.max_restarts})")
+        self._spawn(shard)
+        # worker가 처리하는 bar는 순서대로이므로, 아직 기다리는 첫 bar 이전은 모두 처리된 것
+        waiting = [entry for entry in self._pending if shard in entry.waiting]
+        resume = waiting[0].seq if waiting else self._seq
+        keys = {SignalHub.feed_key(self.strategies[i]) for i, s in enumerate(self.shard_of) if s == shard}
+        if self._history and self._history[0][0] > 0:
+            print(f"[ShardPool] worker {shard} state rebuilt from the last {self.max_history} applied bars only")
+        replay = [(key, time_column, records) for seq, key, time_column, records in self._history
+                  if seq < resume and key in keys]
+        conn = self._conns[shard]
+        for start in range(0, len(replay), REPLAY_CHUNK):
+            conn.send(("replay", replay[start:start + REPLAY_CHUNK]))
+        for entry in waiting:
+            conn.send(entry.message)
+
+    def close(self):
+        if self.ring is None:
+            return
+        for shard, conn in enumerate(self._conns):
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for process in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for conn in self._conns:
+            conn.close()
+        self.ring.close()
+        self.ring = None
+        self._pending.clear()
+        self._by_seq.clear()
+        self._history.clear()
+
+
+class ShardedExecution(BacktestExecution):
+    """
+    BacktestExecution의 bar-by-bar 루프를 ShardPool로 실행. live=True면 poll_interval마다 조회해서 실행
+    (LiveExecution과 같은 방식, 매 조회마다 결과를 모두 반영).
+    max_restarts 기본값은 백테스트 3, live 0 (live에서 재시작을 켜려면 max_history로 보관 bar 수를 제한하는 것을 권장).
+    """
+
+    def __init__(self, signal_hub: SignalHub, position_manager: PositionManager, n_workers: int = None,
+                 capacity: int = 256, max_rows: int = 64, max_restarts: int = None, start_method: str = None,
+                 live: bool = False, poll_interval: float = 1.0, progress=None, max_history: int = None):
+        # 보낸 bar의 frame은 worker 결과를 반영할 때까지 보관하므로 재사용 frame을 쓰지 않음
+        super().__init__(signal_hub, position_manager, progress=progress, reuse_frames=False)
+        self.n_workers = n_workers
+        self.capacity = capacity
+        self.max_rows = max_rows
+        self.max_restarts = max_restarts if max_restarts is not None else (0 if live else 3)
+        self.max_history = max_history
+        self.start_method = start_method
+        self.live = live
+        self.poll_interval = poll_interval
+        self.pool = None
+        self._feeds = []
+
+    def run(self):
+        strategies = self.signal_hub.get_strategies()
+        self.pool = ShardPool(strategies, self.position_manager, self.n_workers, self.capacity, self.max_rows,
+                              self.signal_hub.share_indicators, self.max_restarts, self.start_method,
+                              self.signal_hub.recorder, self.max_history)
+        self._feeds = list(self.pool.subscribers)
+        try:
+            if self.live:
+                while True:
+                    self._notify(strategies)
+                    self.pool.drain()
+                    time.sleep(self.poll_interval)
+            self._run_event_loop(strategies)
+            self.pool.drain()
+            self._report(1, 1)
+        finally:
+            self.pool.close()
+
+    def _notify(self, strategies):
+        data_stream = self.signal_hub._data_stream
+        for interval, target_asset in self._feeds:
+            self.pool.publish((interval, target_asset), data_stream.get_data(interval=interval, target_asset=target_asset))
@@ -1,34 +1,177 @@
-from typing import List, Dict, DefaultDict
-from Strategy import *
-from Position import *
-from DataStream import *
+from typing import List, Dict, DefaultDict, Tuple
+from .Strategy import BaseStrategy
+from .Position import PositionManager
+from .DataStream import DataProvider, bar_time
+from .IndicatorRegistry import IndicatorRegistry
+import time
 import numpy as np
 import pandas as pd
 
 class SignalHub:
-    def __init__(self, data_stream: DataProvider, position_manager: PositionManager):
+    def __init__(self, data_stream: DataProvider, position_manager: PositionManager, instrumentation=None,
+                 share_indicators: bool = True, recorder=None):
         self._strategies: List[BaseStrategy] = []
+        # (interval, target_asset) -> 구독 전략 목록. 피드별로 데이터를 한 번만 가져와 나눠준다
+        self._subscriptions: Dict[Tuple[str, str], List[BaseStrategy]] = {}
         self._data_stream = data_stream
         self._position_manager = position_manager
+        # Instrumentation: 지정하면 전략별 rule 지연/피드별 조회 시간 등을 기록 (None이면 측정 없음)
+        self.instrumentation = instrumentation
+        # share_indicators=True: 같은 피드의 전략들은 spec이 같은 지표를 한 번만 계산해서 공유
+        self.share_indicators = share_indicators
+        self._registries: Dict[Tuple[str, str], IndicatorRegistry] = {}
+        # JournalRecorder: 지정하면 전달한 bar, signal, 포지션 갱신을 journal 파일에 기록 (None이면 기록 없음)
+        self.recorder = recorder
+
+    @staticmethod
+    def feed_key(strategy: BaseStrategy) -> Tuple[str, str]:
+        return getattr(strategy, 'interval', '1d'), getattr(strategy, 'target_asset', 'KTB')
 
     def add_strategy(self, strategy: BaseStrategy):
         self._strategies.append(strategy)
+        self._subscriptions.setdefault(self.feed_key(strategy), []).append(strategy)
+        self._bind_registry(strategy)
+        self._assign_asset(strategy)
 
     def remove_strategy(self, strategy: BaseStrategy):
         self._strategies.remove(strategy)
+        for key, subscribers in list(self._subscriptions.items()):
+            if strategy in subscribers:
+                subscribers.remove(strategy)
+                if not subscribers:
+                    del self._subscriptions[key]
+        if hasattr(strategy, 'use_registry'):
+            strategy.use_registry(None)
 
-    def notify_strategies(self):
+    def refresh_subscriptions(self):
+        # 피드 색인을 전략들의 현재 interval/target_asset으로 다시 만듦 (구독 피드가 바뀐 전략은 지표 저장소도 새 피드로)
+        self._subscriptions = {}
         for strategy in self._strategies:
-            interval = getattr(strategy, 'interval', '1d')
-            target_asset = getattr(strategy, 'target_asset', 'KTB')
+            self._subscriptions.setdefault(self.feed_key(strategy), []).append(strategy)
+            self._bind_registry(strategy)
+            self._assign_asset(strategy)
+
+    def _sync_subscriptions(self):
+        # 등록 후 set_parameters 등으로 interval/target_asset이 바뀐 전략이 있으면 색인을 다시 만듦
+        for key, subscribers in self._subscriptions.items():
+            for strategy in subscribers:
+                if self.feed_key(strategy) != key:
+                    self.refresh_subscriptions()
+                    return
+
+    def indicator_registry(self, interval, target_asset) -> IndicatorRegistry:
+        key = (interval, target_asset)
+        registry = self._registries.get(key)
+        if registry is None:
+            registry = self._registries[key] = IndicatorRegistry()
+        return registry
+
+    def _bind_registry(self, strategy: BaseStrategy):
+        if self.share_indicators and hasattr(strategy, 'use_registry'):
+            strategy.use_registry(self.indicator_registry(*self.feed_key(strategy)))
+
+    def _assign_asset(self, strategy: BaseStrategy):
+        # 포트폴리오 노출은 전략의 target_asset 기준으로 합산
+        portfolio = getattr(self._position_manager, 'portfolio', None)
+        if portfolio is not None:
+            name = getattr(strategy, '_name', strategy.__class__.__name__)
+            asset = self.feed_key(strategy)[1]
+            if portfolio.asset_of(name) == asset:
+                return
+            portfolio.assign_asset(name, asset)
+            if name in self._position_manager.positions:
+                # 이미 포지션 장부가 있는 전략의 자산이 바뀌면 노출을 새 자산 기준으로 다시 합산
+                portfolio.recompute(self._position_manager)
+
+    def get_strategies(self) -> List[BaseStrategy]:
+        return list(self._strategies)
+
+    def get_subscriptions(self) -> Dict[Tuple[str, str], List[BaseStrategy]]:
+        self._sync_subscriptions()
+        return {key: list(subscribers) for key, subscribers in self._subscriptions.items()}
+
+    def notify_strategies(self, strategies: List[BaseStrategy] = None):
+        # strategies를 지정하면 해당 전략만 갱신 (vectorized 백테스트의 fallback 용도)
+        self._sync_subscriptions()
+        if strategies is None:
+            subscriptions = self._subscriptions
+        else:
+            subscriptions = {}
+            for strategy in strategies:
+                subscriptions.setdefault(self.feed_key(strategy), []).append(strategy)
+
+        if self.instrumentation is not None:
+            return self._notify_timed(subscriptions)
+        for (interval, target_asset), subscribers in subscriptions.items():
+            # 피드당 한 번만 조회하고 같은 frame을 모든 구독 전략에 전달 (전략은 frame을 수정하지 않아야 함)
             frame = self._data_stream.get_data(interval=interval, target_asset=target_asset)
             if frame.empty:
                 continue
-            signal = strategy.rule(frame)
-            if signal is not None:
-                price = frame['close'].iloc[-1]
-                self._position_manager.update_position(
-                    getattr(strategy, '_name', strategy.__class__.__name__),
-                    signal,
-                    price
-                )
\ No newline at end of file
+            if self.recorder is not None:
+                self.recorder.record_bar((interval, target_asset), frame)
+            marked = self.mark_feed(target_asset, frame)
+            for strategy in subscribers:
+                self.dispatch(strategy, frame, mark_portfolio=not marked)
+
+    def _notify_timed(self, subscriptions):
+        # notify_strategies와 같은 처리 + 피드별 조회 시간, 조회 시작부터 포지션 갱신 완료까지의 지연 기록
+        for key, subscribers in subscriptions.items():
+            feed = self.instrumentation.feed(key)
+            start = time.perf_counter_ns()
+            frame = self._data_stream.get_data(interval=key[0], target_asset=key[1])
+            feed.fetch.record(time.perf_counter_ns() - start)
+            if frame.empty:
+                continue
+            if self.recorder is not None:
+                self.recorder.record_bar(key, frame)
+            marked = self.mark_feed(key[1], frame)
+            for strategy in subscribers:
+                self.dispatch(strategy, frame, mark_portfolio=not marked)
+            feed.bars += 1
+            feed.tick_to_position.record(time.perf_counter_ns() - start)
+
+    def mark_feed(self, target_asset: str, frame: pd.DataFrame) -> bool:
+        # 피드의 새 bar 가격으로 portfolio를 한 번만 평가 (구독 전략마다 반복하지 않음). portfolio가 없으면 False
+        portfolio = getattr(self._position_manager, 'portfolio', None)
+        if portfolio is None:
+            return False
+        # 구독 전략들은 모두 target_asset에 배정되어 있으므로 전략 dispatch 전에 평가해 두면
+        # 같은 bar의 한도 검사도 현재가 기준의 낙폭을 본다
+        portfolio.mark(target_asset, frame['close'].iloc[-1])
+        return True
+
+    def dispatch(self, strategy: BaseStrategy, frame: pd.DataFrame, mark_portfolio: bool = True):
+        # 이미 받은 bar를 전략 1개에 전달하고, signal이 나오면 포지션 갱신 (push 방식 피드에서 사용)
+        # mark_portfolio=False: mark_feed로 이 bar의 portfolio 평가를 이미 한 경우
+        if self.instrumentation is not None:
+            return self._dispatch_timed(strategy, frame, mark_portfolio)
+        signal = strategy.rule(frame)
+        name = getattr(strategy, '_name', strategy.__class__.__name__)
+        price = frame['close'].iloc[-1]
+        timestamp = bar_time(frame)
+        if signal is not None:
+            self._position_manager.update_position(name, signal, price, timestamp)
+            if self.recorder is not None:
+                self.recorder.record_signal(name, signal, price, timestamp, self._position_manager.get_position(name))
+        # bar마다 평가 손익 갱신 (체결 장부의 bar 순번도 여기서 증가)
+        self._position_manager.mark_to_market(name, price, timestamp, mark_portfolio)
+        return signal
+
+    def _dispatch_timed(self, strategy: BaseStrategy, frame: pd.DataFrame, mark_portfolio: bool = True):
+        name = getattr(strategy, '_name', strategy.__class__.__name__)
+        stats = self.instrumentation.strategy(name)
+        start = time.perf_counter_ns()
+        signal = strategy.rule(frame)
+        stats.rule.record(time.perf_counter_ns() - start)
+        price = frame['close'].iloc[-1]
+        timestamp = bar_time(frame)
+        if signal is not None:
+            self._position_manager.update_position(name, signal, price, timestamp)
+            if signal != 0:
+                stats.signals += 1
+            if self.recorder is not None:
+                self.recorder.record_signal(name, signal, price, timestamp, self._position_manager.get_position(name))
+        self._position_manager.mark_to_market(name, price, timestamp, mark_portfolio)
+        stats.bars += 1
+        stats.dispatch.record(time.perf_counter_ns() - start)
+        return signal
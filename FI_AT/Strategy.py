@@ -1,4 +1,9 @@
-from DataStream import *
+import math
+from collections import deque
+from typing import Dict
+from .Indicator import Indicator, SMA, RollingMax, RollingMin, EMA, RollingStd
+from .IndicatorRegistry import IndicatorRegistry
+import numpy as np
 import pandas as pd
 
 """
@@ -7,11 +12,22 @@ import pandas as pd
 
 """
 
-import pandas as pd
+# 전략이 구독할 피드를 정하는 속성 (SignalHub.feed_key)
+FEED_KEYS = ('interval', 'target_asset')
 
 class BaseStrategy:
     def __init__(self):
-        pass
+        # name -> Indicator, bar마다 update_indicators()로 O(1) 갱신
+        self.indicators: Dict[str, Indicator] = {}
+        # 최근 bar만 보관 (가장 긴 지표 window 길이로 제한)
+        self._history = deque(maxlen=1)
+        self.parameters: Dict[str, object] = {}
+        # 피드 공용 지표 저장소 (SignalHub.add_strategy에서 연결). None이면 전략 전용 지표 사용
+        self.registry: IndicatorRegistry = None
+
+    @property
+    def history(self):
+        return self.registry.history if self.registry is not None else self._history
 
     def execute(self, frame: pd.DataFrame):
         signal = self.rule(frame)
@@ -27,65 +43,175 @@ class BaseStrategy:
                 pass
 
     def set_parameters(self, **kwargs):
+        # interval/target_asset은 구독 피드만 정하는 일반 속성 (parameters에 넣지 않고 지표도 그대로 유지)
+        changed = False
         for key, value in kwargs.items():
             setattr(self, key, value)
+            if key in FEED_KEYS:
+                continue
+            if key not in self.parameters or self.parameters[key] != value:
+                changed = True
+            self.parameters[key] = value
+        if not changed:
+            return
+        # 지표를 정하는 파라미터가 실제로 바뀐 경우에만 새 window로 다시 선언 (지표/history 상태 초기화)
+        self._release_indicators()
+        self.indicators = {}
+        self._history = deque(maxlen=1)
+        self.setup()
+
+    def use_registry(self, registry: IndicatorRegistry):
+        # 피드 공용 지표 저장소에 연결 (None이면 해제). 지표는 setup()으로 다시 선언해서 spec별 공유 인스턴스를 받음
+        if registry is self.registry:
+            return
+        self._release_indicators()
+        self.registry = registry
+        self.indicators = {}
+        self._history = deque(maxlen=1)
+        self.setup()
+
+    def _release_indicators(self):
+        if self.registry is not None:
+            for indicator in self.indicators.values():
+                self.registry.release(indicator)
+
+    def get_parameters(self) -> Dict[str, object]:
+        return dict(self.parameters)
+
+    def setup(self):
+        # 파라미터를 이용해 add_indicator()로 지표를 선언 (set_parameters로 지표 파라미터가 바뀔 때마다 호출)
+        pass
+
+    def add_indicator(self, name: str, indicator: Indicator) -> Indicator:
+        # 공용 저장소에 연결되어 있으면 같은 spec의 공유 인스턴스를 사용 (값은 읽기만 해야 함)
+        if self.registry is not None:
+            indicator = self.registry.request(indicator)
+        self.indicators[name] = indicator
+        lookback = max(ind.window for ind in self.indicators.values())
+        if lookback != self._history.maxlen:
+            self._history = deque(self._history, maxlen=lookback)
+        return indicator
+
+    def update_indicators(self, frame: pd.DataFrame):
+        # frame의 각 row를 순서대로 모든 지표에 반영
+        if self.registry is not None:
+            # 공유 지표는 피드당 bar마다 한 번만 갱신 (같은 frame을 먼저 받은 전략이 갱신)
+            self.registry.update(frame)
+            return
+        columns = {ind.source for ind in self.indicators.values()}
+        values = {col: frame[col].to_numpy() for col in columns}
+        for i in range(len(frame)):
+            for indicator in self.indicators.values():
+                indicator.update(values[indicator.source][i])
+        self.history.extend(frame.to_dict('records'))
+
+    def compute_indicators(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        # vectorized 모드: 지표 상태를 건드리지 않고 전체 시계열을 한 번에 계산
+        if self.registry is not None:
+            return {name: self.registry.compute(ind, df[ind.source].to_numpy()) for name, ind in self.indicators.items()}
+        return {name: ind.compute(df[ind.source].to_numpy()) for name, ind in self.indicators.items()}
+
+    def reset_indicators(self):
+        # 공용 저장소에 연결되어 있으면 같은 피드의 모든 전략 지표가 초기화됨
+        if self.registry is not None:
+            self.registry.reset()
+            return
+        for indicator in self.indicators.values():
+            indicator.reset()
+        self._history.clear()
+
+    def rule_vectorized(self, df: pd.DataFrame):
+        """
+        전체 시계열을 한 번에 받아 bar별 signal 배열(1=Buy, -1=Sell, 0=No Signal)을 반환.
+        구현하지 않은 전략은 None을 반환하고, BacktestExecution은 bar-by-bar 루프로 fallback 한다.
+        반환값의 i번째 원소는 rule()이 i번째 bar에서 반환했을 signal과 같아야 한다.
+        """
+        return None
 
 class MomentumStrategy(BaseStrategy):
     def __init__(self):
         super().__init__()
         self._name = "MomentumStrategy"
-        self.set_parameters(interval='1d', target_asset='KTB')
-        self.history = pd.DataFrame()  # 과거 데이터 누적용
+        self.set_parameters(interval='1d', target_asset='KTB', window=5, ratio=0.8)
+
+    def setup(self):
+        self.add_indicator('sma', SMA(self.window))
+        self.add_indicator('max', RollingMax(self.window))
 
     def rule(self, frame: pd.DataFrame):
         # frame은 "신규 데이터 1개 row"만 들어온다고 가정
-        # 과거 데이터 누적
-        self.history = pd.concat([self.history, frame], ignore_index=True)
-
-        window = 5
-        recent_frame = self.history.tail(window * 2)
-        std_moving_average = recent_frame['close'].rolling(window=window).mean()
-        threshold = recent_frame['close'].rolling(window=window).max().iloc[-1] * 0.8
-
-        # 데이터가 20개 미만이면 신호 없음(None) 반환
-        if len(recent_frame) < window or pd.isna(std_moving_average.iloc[-1]):
+        self.update_indicators(frame)
+        std_moving_average = self.indicators['sma'].value
+        # 데이터가 window 미만이면 신호 없음(None) 반환
+        if not self.indicators['sma'].ready:
             return None
+        threshold = self.indicators['max'].value * self.ratio
 
-        if std_moving_average.iloc[-1] >= threshold:
-            print(f"[{self._name}] Buy Signal Detected at {std_moving_average.iloc[-1]}")
+        if std_moving_average >= threshold:
+            print(f"[{self._name}] Buy Signal Detected at {std_moving_average}")
             return 1
-        elif std_moving_average.iloc[-1] <= -threshold:
-            print(f"[{self._name}] Sell Signal Detected at {std_moving_average.iloc[-1]}")
+        elif std_moving_average <= -threshold:
+            print(f"[{self._name}] Sell Signal Detected at {std_moving_average}")
             return -1
         else:
             return None
-        
+
+    def rule_vectorized(self, df: pd.DataFrame):
+        values = self.compute_indicators(df)
+        std_moving_average = values['sma']
+        threshold = values['max'] * self.ratio
+
+        # NaN 비교는 False 이므로 window 미만 구간은 자동으로 0(No Signal)
+        signals = np.zeros(len(df), dtype=np.int8)
+        signals[std_moving_average >= threshold] = 1
+        signals[(std_moving_average <= -threshold) & (signals == 0)] = -1
+        return signals
+
 class SmaCrossStrategy(BaseStrategy):
     def __init__(self):
         super().__init__()
         self._name = "SmaCrossStrategy"
-        self.set_parameters(interval='1d', target_asset='KTB')
-        self.history = pd.DataFrame()
+        self.set_parameters(interval='1d', target_asset='KTB', short_window=5, long_window=20)
 
-    def rule(self, frame: pd.DataFrame):
-        # frame은 "신규 데이터 1개 row"만 들어온다고 가정
-        self.history = pd.concat([self.history, frame], ignore_index=True)
-
-        short_window = 5
-        long_window = 20
+    def setup(self):
+        self.add_indicator('short_ma', SMA(self.short_window))
+        self.add_indicator('long_ma', SMA(self.long_window))
+        # 직전 bar의 MA (공유 지표는 다른 전략이 먼저 갱신할 수 있으므로 갱신 전 값을 읽지 않고 따로 보관)
+        self._prev = (math.nan, math.nan)
 
-        if len(self.history) < long_window:
-            return None  # 데이터 부족
+    def reset_indicators(self):
+        super().reset_indicators()
+        self._prev = (math.nan, math.nan)
 
-        short_ma = self.history['close'].rolling(window=short_window).mean()
-        long_ma = self.history['close'].rolling(window=long_window).mean()
-
-        # 직전 시점과 현재 시점의 MA 차이로 골든/데드크로스 판별
-        if short_ma.iloc[-2] < long_ma.iloc[-2] and short_ma.iloc[-1] >= long_ma.iloc[-1]:
-            print(f"[{self._name}] Buy Signal Detected at {self.history['close'].iloc[-1]}")
+    def rule(self, frame: pd.DataFrame):
+        # frame은 "신규 데이터 1개 row"만 들어온다고 가정
+        self.update_indicators(frame)
+        short_ma = self.indicators['short_ma'].value
+        long_ma = self.indicators['long_ma'].value
+        prev_short, prev_long = self._prev
+        self._prev = (short_ma, long_ma)
+
+        # 직전 시점과 현재 시점의 MA 차이로 골든/데드크로스 판별 (NaN이면 비교 결과 False)
+        if prev_short < prev_long and short_ma >= long_ma:
+            print(f"[{self._name}] Buy Signal Detected at {self.history[-1]['close']}")
             return 1
-        elif short_ma.iloc[-2] > long_ma.iloc[-2] and short_ma.iloc[-1] <= long_ma.iloc[-1]:
-            print(f"[{self._name}] Sell Signal Detected at {self.history['close'].iloc[-1]}")
+        elif prev_short > prev_long and short_ma <= long_ma:
+            print(f"[{self._name}] Sell Signal Detected at {self.history[-1]['close']}")
             return -1
         else:
-            return None
\ No newline at end of file
+            return None
+
+    def rule_vectorized(self, df: pd.DataFrame):
+        values = self.compute_indicators(df)
+        short_ma = values['short_ma']
+        long_ma = values['long_ma']
+        prev_short = np.r_[np.nan, short_ma[:-1]]
+        prev_long = np.r_[np.nan, long_ma[:-1]]
+
+        golden = (prev_short < prev_long) & (short_ma >= long_ma)
+        dead = (prev_short > prev_long) & (short_ma <= long_ma)
+
+        signals = np.zeros(len(df), dtype=np.int8)
+        signals[golden] = 1
+        signals[dead & ~golden] = -1
+        return signals
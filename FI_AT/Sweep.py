@@ -0,0 +1,172 @@
+import itertools
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .DataStream import MockDataStream
+from .Position import PositionManager
+from .SignalHub import SignalHub
+from .Execution import BacktestExecution
+from .Evaluation import batch_metrics, stack_curves
+
+"""
+파라미터 스윕
+
+- 가격 데이터는 컬럼별 .npy 파일로 한 번만 기록하고, worker는 시작 시 memory-map으로 붙는다.
+  (task마다 DataFrame을 pickle 하지 않으므로 task 전송 비용은 파라미터 dict 크기뿐)
+- 각 조합은 BaseStrategy.set_parameters로 설정한 뒤 BacktestExecution(vectorized=True)로 실행한다.
+"""
+
+
+def grid(**space) -> List[Dict]:
+    # grid(short_window=[5, 10], long_window=[20, 60]) -> 4개 조합
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_space(n: int, seed: int = None, **space) -> List[Dict]:
+    """
+    list는 그중 하나를 선택, (low, high) tuple은 구간에서 균등 추출 (int면 양끝 포함 정수).
+    """
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(n):
+        params = {}
+        for key, spec in space.items():
+            if isinstance(spec, tuple):
+                low, high = spec
+                if isinstance(low, int) and isinstance(high, int):
+                    params[key] = int(rng.integers(low, high + 1))
+                else:
+                    params[key] = float(rng.uniform(low, high))
+            else:
+                params[key] = spec[rng.integers(len(spec))]
+        samples.append(params)
+    return samples
+
+
+class SharedFrame:
+    """DataFrame의 숫자/시간 컬럼을 .npy 파일로 저장하고 여러 프로세스에서 read-only memmap으로 공유."""
+
+    def __init__(self, df: pd.DataFrame, directory: str = None):
+        self.directory = tempfile.mkdtemp(prefix="fi_at_sweep_", dir=directory)
+        self.columns = []
+        for col in df.columns:
+            values = df[col].to_numpy()
+            if values.dtype.kind not in "biufM":
+                continue  # 문자열 컬럼은 전략 계산에 쓰이지 않으므로 공유하지 않음
+            out = np.lib.format.open_memmap(self._path(self.directory, col), mode="w+",
+                                            dtype=values.dtype, shape=values.shape)
+            out[:] = values
+            out.flush()
+            del out
+            self.columns.append(col)
+
+    @property
+    def spec(self):
+        return self.directory, list(self.columns)
+
+    @staticmethod
+    def _path(directory, col):
+        return os.path.join(directory, f"{col}.npy")
+
+    @staticmethod
+    def attach(spec) -> pd.DataFrame:
+        directory, columns = spec
+        arrays = {col: np.load(SharedFrame._path(directory, col), mmap_mode="r") for col in columns}
+        return pd.DataFrame(arrays, copy=False)
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# worker 프로세스별로 한 번만 붙는 데이터
+_worker_frame = None
+
+
+def _init_worker(spec):
+    global _worker_frame
+    _worker_frame = SharedFrame.attach(spec)
+
+
+def _run_config(strategy_cls, params, df=None):
+    df = _worker_frame if df is None else df
+    strategy = strategy_cls()
+    strategy.set_parameters(**params)
+    name = getattr(strategy, '_name', strategy.__class__.__name__)
+    interval = getattr(strategy, 'interval', '1d')
+    target_asset = getattr(strategy, 'target_asset', 'KTB')
+
+    data_stream = MockDataStream(interval, target_asset, data=df)
+    position_manager = PositionManager()
+    signal_hub = SignalHub(data_stream, position_manager)
+    signal_hub.add_strategy(strategy)
+    BacktestExecution(signal_hub, position_manager, vectorized=True).run()
+    return len(position_manager.get_fills(name)), position_manager.get_equity(name)
+
+
+def _evaluate(runs, periods_per_year):
+    # chunk 안의 모든 조합을 equity 곡선 2차원 배열로 묶어 한 번에 평가
+    equity, positions = stack_curves([curve for _, curve in runs])
+    table = batch_metrics(equity, positions, periods_per_year=periods_per_year)
+    table.insert(0, 'total_trades', [fills for fills, _ in runs])
+    return table.to_dict('records')
+
+
+def _run_chunk(args):
+    strategy_cls, chunk, periods_per_year = args
+    return _evaluate([_run_config(strategy_cls, params) for params in chunk], periods_per_year)
+
+
+class ParameterSweep:
+    def __init__(self, strategy_cls, data: pd.DataFrame, max_workers: int = None,
+                 sort_by: str = "sharpe", ascending: bool = False, periods_per_year: int = 252):
+        self.strategy_cls = strategy_cls
+        self.periods_per_year = periods_per_year
+        self.data = data
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.sort_by = sort_by
+        self.ascending = ascending
+
+    def run(self, params_list: List[Dict], constraint: Callable[[Dict], bool] = None,
+            chunk_size: int = None) -> pd.DataFrame:
+        """
+        params_list의 각 조합을 백테스트하고 Evaluation 지표로 정렬된 표를 반환.
+        constraint가 주어지면 False인 조합(예: short_window >= long_window)은 건너뛴다.
+        """
+        if constraint is not None:
+            params_list = [p for p in params_list if constraint(p)]
+        if not params_list:
+            return pd.DataFrame()
+
+        if self.max_workers == 1:
+            runs = [_run_config(self.strategy_cls, params, self.data) for params in params_list]
+            results = _evaluate(runs, self.periods_per_year)
+        else:
+            results = self._run_parallel(params_list, chunk_size)
+
+        table = pd.concat([pd.DataFrame(params_list), pd.DataFrame(results)], axis=1)
+        if self.sort_by in table:
+            table = table.sort_values(self.sort_by, ascending=self.ascending, na_position="last")
+        return table.reset_index(drop=True)
+
+    def _run_parallel(self, params_list, chunk_size):
+        # 조합 수가 많으면 task 단위 IPC 비용이 커지므로 여러 조합을 묶어서 전달
+        chunk_size = chunk_size or max(1, len(params_list) // (self.max_workers * 4))
+        chunks = [params_list[i:i + chunk_size] for i in range(0, len(params_list), chunk_size)]
+        shared = SharedFrame(self.data)
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(shared.spec,)) as pool:
+                results = []
+                for chunk_result in pool.map(_run_chunk, [(self.strategy_cls, chunk, self.periods_per_year)
+                                                               for chunk in chunks]):
+                    results.extend(chunk_result)
+        finally:
+            shared.close()
+        return results
@@ -0,0 +1,49 @@
+import importlib
+
+"""
+FI_AT 알고리즘 트레이딩 패키지
+
+import FI_AT 만으로는 아무 하위 모듈도 읽지 않는다 (pandas/dash/pymysql 등은 실제로 쓰는 모듈에서만 import).
+FI_AT.PositionManager 처럼 이름을 처음 사용할 때 해당 모듈을 import 한다.
+모듈과 이름이 같은 클래스(SignalHub, Evaluation, Portfolio, Instrumentation)는 하위 모듈 속성과 겹치므로
+from FI_AT.SignalHub import SignalHub 처럼 모듈에서 가져온다.
+명령행: python -m FI_AT {backtest,sweep,live,replay,dashboard} ...
+"""
+
+# 공개 이름 -> 정의된 하위 모듈
+_EXPORTS = {
+    "DataProvider": "DataStream",
+    "HistoricalDataStream": "DataStream",
+    "MockDataStream": "DataStream",
+    "SimulatedFeed": "DataStream",
+    "BarFileStream": "BarFile",
+    "BaseStrategy": "Strategy",
+    "MomentumStrategy": "Strategy",
+    "SmaCrossStrategy": "Strategy",
+    "PositionManager": "Position",
+    "RiskLimits": "Portfolio",
+    "BacktestExecution": "Execution",
+    "LiveExecution": "Execution",
+    "AsyncLiveExecution": "Execution",
+    "ReplayExecution": "Execution",
+    "ShardedExecution": "Sharding",
+    "ParameterSweep": "Sweep",
+    "RobustnessAnalysis": "Robustness",
+    "JournalRecorder": "Journal",
+    "JournalReplayStream": "Journal",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
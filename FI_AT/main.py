@@ -1,33 +1,41 @@
-from DataStream import MockDataStream
-from Strategy import MomentumStrategy, SmaCrossStrategy
-from Position import PositionManager
-from SignalHub import SignalHub
-from Execution import BacktestExecution
-from Evaluation import Evaluation
+from .DataStream import MockDataStream
+from .Strategy import MomentumStrategy, SmaCrossStrategy
+from .Position import PositionManager
+from .SignalHub import SignalHub
+from .Execution import BacktestExecution
+from .Evaluation import Evaluation
 
-# 1. 데이터 스트림 준비 (Mock)
-data_stream = MockDataStream('1d', 'KTB')
 
-# 2. 포지션 매니저 준비
-position_manager = PositionManager()
+def main():
+    # 1. 데이터 스트림 준비 (Mock)
+    data_stream = MockDataStream('1d', 'KTB')
 
-# 3. SignalHub 생성
-signal_hub = SignalHub(data_stream, position_manager)
+    # 2. 포지션 매니저 준비
+    position_manager = PositionManager()
 
-# 4. 전략 생성 및 등록
-momentum_strategy = MomentumStrategy()
-signal_hub.add_strategy(SmaCrossStrategy())
+    # 3. SignalHub 생성
+    signal_hub = SignalHub(data_stream, position_manager)
 
-# 5. 백테스트 실행
-# (MockDataStream은 get_data에서 항상 최신 1개 row만 반환하므로, 1회만 실행)
-backtest = BacktestExecution(signal_hub, position_manager)
-backtest.run()
+    # 4. 전략 생성 및 등록
+    momentum_strategy = MomentumStrategy()
+    signal_hub.add_strategy(SmaCrossStrategy())
 
-# 6. 결과 출력
-position_manager.summary()
+    # 5. 백테스트 실행
+    # (MockDataStream은 get_data에서 항상 최신 1개 row만 반환하므로, 1회만 실행)
+    # vectorized=True: rule_vectorized를 구현한 전략은 전체 시계열을 한 번에 계산 (결과는 bar-by-bar와 동일)
+    backtest = BacktestExecution(signal_hub, position_manager, vectorized=True)
+    backtest.run()
 
+    # 6. 결과 출력
+    position_manager.summary()
 
-# 7. 평가
-evaluator = Evaluation(position_manager)
-evaluator.summary("MomentumStrategy")
-evaluator.summary("SmaCrossStrategy")
\ No newline at end of file
+
+    # 7. 평가
+    evaluator = Evaluation(position_manager)
+    evaluator.summary("MomentumStrategy")
+    evaluator.summary("SmaCrossStrategy")
+
+
+# python -m FI_AT.main (import만 할 때는 실행하지 않음)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from FI_AT.DataStream import DATA_DIR, SimulatedFeed
+from FI_AT.Execution import AsyncLiveExecution
+from FI_AT.Position import PositionManager
+from FI_AT.SignalHub import SignalHub
+from FI_AT.Strategy import SmaCrossStrategy
+
+
+class BrokenFeed(SimulatedFeed):
+    async def publish(self, interval, target_asset, frame):
+        if frame.index[0] >= 10:
+            raise OSError("feed lost")
+        await super().publish(interval, target_asset, frame)
+
+
+def _execution(sources, interval="1d", feed_class=SimulatedFeed):
+    position_manager = PositionManager()
+    signal_hub = SignalHub(feed_class(sources), position_manager)
+    strategy = SmaCrossStrategy()
+    strategy.set_parameters(interval=interval)
+    signal_hub.add_strategy(strategy)
+    return AsyncLiveExecution(signal_hub, position_manager)
+
+
+@pytest.fixture
+def prices():
+    return pd.read_csv(f"{DATA_DIR}/KTB_1d.csv")
+
+
+def test_runs_to_end_of_feed(prices):
+    execution = _execution({("1d", "KTB"): prices})
+    execution.run()
+    assert execution.bar_count == len(prices)
+
+
+def test_subscription_without_source_raises(prices):
+    execution = _execution({("1d", "KTB"): prices}, interval="1m")
+    with pytest.raises(ValueError, match="no source"):
+        execution.run()
+
+
+def test_replay_error_propagates(prices):
+    execution = _execution({("1d", "KTB"): prices}, feed_class=BrokenFeed)
+    with pytest.raises(OSError, match="feed lost"):
+        execution.run()
@@ -0,0 +1,53 @@
+import importlib.util
+import threading
+
+import pandas as pd
+
+from FI_AT.BacktestJobs import JobManager, ResultCache, code_version, data_fingerprint, make_key
+from FI_AT.Strategy import MomentumStrategy, SmaCrossStrategy
+
+
+def test_fingerprint_follows_content():
+    df = pd.DataFrame({"Date": ["2024-01-02", "2024-01-03"], "close": [100.0, 101.0]})
+    edited = df.copy()
+    edited.loc[1, "close"] = 101.5
+    assert data_fingerprint(df) == data_fingerprint(df.copy())
+    assert data_fingerprint(df) != data_fingerprint(edited)
+
+
+def test_code_version_follows_source(tmp_path):
+    source = tmp_path / "rule_module.py"
+    source.write_text("THRESHOLD = 1\n")
+    spec = importlib.util.spec_from_file_location("rule_module", source)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    before = code_version(module)
+    source.write_text("THRESHOLD = 2\n")
+    assert code_version(module) != before
+    # 같은 파일은 한 번만 반영
+    assert code_version(MomentumStrategy, SmaCrossStrategy) == code_version(SmaCrossStrategy)
+
+
+def test_key_includes_code_version():
+    params = {"short_window": 5}
+    assert make_key("SmaCrossStrategy", params, "fp", "v1") == make_key("SmaCrossStrategy", params, "fp", "v1")
+    assert make_key("SmaCrossStrategy", params, "fp", "v1") != make_key("SmaCrossStrategy", params, "fp", "v2")
+
+
+def test_eviction_keeps_unfinished_jobs():
+    release = threading.Event()
+    manager = JobManager(ResultCache(), max_workers=1, keep_jobs=2)
+    try:
+        running = manager.submit("running", lambda progress: release.wait(5))
+        queued = manager.submit("queued", lambda progress: "queued")
+        for i in range(3):
+            manager.cache.put(f"cached{i}", i)
+            manager.submit(f"cached{i}", lambda progress: None)
+        # 끝난(캐시) job만 제거되고 실행/대기 중인 job과 방금 반환한 job은 남음
+        assert manager.get(running) is not None and manager.get(queued) is not None
+        assert len(manager._jobs) == 3
+    finally:
+        release.set()
+        manager.shutdown()
+    assert manager.get(queued).result == "queued"
+    assert len(manager._jobs) == 2
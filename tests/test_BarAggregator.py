@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from FI_AT.BarAggregator import BarAggregator, aggregate
+from FI_AT.DBConnection import resample_price
+
+
+def _minute_bars(n, unit, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    return pd.DataFrame({
+        "trade_date": pd.date_range("2024-01-02 09:00", periods=n, freq="1min").as_unit(unit),
+        "open": close + rng.standard_normal(n) * 0.1,
+        "high": close + 1.0,
+        "low": close - 1.0,
+        "close": close,
+        "volume": rng.integers(0, 100, n).astype(float),
+    })
+
+
+@pytest.mark.parametrize("unit", ["ns", "us", "s"])
+@pytest.mark.parametrize("interval", [5, 60])
+def test_aggregate_equals_resample(unit, interval):
+    df = _minute_bars(1000, unit)
+    result = aggregate(df, interval)
+    expected = resample_price(df, interval)
+    assert result["trade_date"].dtype == expected["trade_date"].dtype
+    assert result.equals(expected)
+
+
+def test_streamed_bar_keeps_input_unit():
+    aggregator = BarAggregator([5])
+    aggregator.update(pd.Timestamp("2024-01-02 09:00").as_unit("us"), 1.0, 2.0, 0.5, 1.5, 10.0)
+    assert aggregator.current(5)["trade_date"].dtype == "datetime64[us]"
+    assert aggregator.current(60)["trade_date"].dtype == "datetime64[us]"
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from FI_AT.BarStore import BarSeries
+
+
+def _bars(start, n, **columns):
+    data = {"trade_date": pd.date_range(start, periods=n, freq="1min")}
+    data.update(columns)
+    return pd.DataFrame(data)
+
+
+def test_integer_volume_accepts_missing_and_fractional_values():
+    series = BarSeries.from_frame(_bars("2024-01-02 09:00", 2, close=[100.0, 101.0], volume=[10, 20]))
+    assert series.column("volume").dtype == np.float64
+
+    series.append(_bars("2024-01-02 09:02", 1, close=[102.0]))
+    series.append(_bars("2024-01-02 09:03", 1, close=[103.0], volume=[1.5]))
+    np.testing.assert_array_equal(series.column("volume"), [10.0, 20.0, np.nan, 1.5])
+
+
+def test_non_float_column_rejects_lossy_append():
+    series = BarSeries({"volume": np.int64}, capacity=4)
+    series.append(_bars("2024-01-02 09:00", 1, volume=[10]))
+    with pytest.raises(ValueError, match="cannot be stored"):
+        series.append(_bars("2024-01-02 09:01", 1, volume=[1.5]))
+    with pytest.raises(ValueError, match="missing"):
+        series.append(_bars("2024-01-02 09:02", 1))
+    assert len(series) == 1
@@ -0,0 +1,95 @@
+from itertools import islice
+
+import pytest
+
+from FI_AT.DBConnection import ConnectionPool, stream_rows
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.closed = False
+
+    def execute(self, sql, params):
+        pass
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.closed = False
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self.rows)
+
+    def ping(self, reconnect=False):
+        if self.closed:
+            raise ConnectionError("closed")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    connections = []
+
+    def factory():
+        conn = FakeConnection([(i,) for i in range(10)])
+        connections.append(conn)
+        return conn
+
+    pool = ConnectionPool(factory=factory, size=2, timeout=0.1)
+    pool.connections = connections
+    return pool
+
+
+def _stream(pool):
+    return stream_rows("SELECT", (), chunk_size=3, pool=pool, cursor_class=object)
+
+
+def test_full_stream_returns_connection(pool):
+    assert [row for rows in _stream(pool) for row in rows] == [(i,) for i in range(10)]
+    assert pool._created == 1
+    assert pool._idle.qsize() == 1
+    assert not pool.connections[0].closed
+
+
+@pytest.mark.parametrize("abandon", ["close", "islice", "break", "gc"])
+def test_abandoned_stream_frees_pool_slot(pool, abandon):
+    for _ in range(3):
+        stream = _stream(pool)
+        if abandon == "close":
+            next(stream)
+            stream.close()
+        elif abandon == "islice":
+            list(islice(stream, 1))
+            stream.close()
+        elif abandon == "break":
+            for _rows in stream:
+                break
+            stream.close()
+        else:
+            next(stream)
+            del stream
+    # 덜 읽은 연결은 재사용하지 않고 폐기
+    assert pool._created == 0
+    assert pool._idle.qsize() == 0
+    assert all(conn.closed for conn in pool.connections)
+    with pool.connection() as conn:
+        assert not conn.closed
+
+
+def test_error_inside_connection_discards(pool):
+    with pytest.raises(RuntimeError):
+        with pool.connection():
+            raise RuntimeError("query failed")
+    assert pool._created == 0
+    assert pool.connections[0].closed
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from FI_AT.BarStore import BarCursor, BarSeries
+from FI_AT.Benchmark import build, synthetic_ohlcv
+from FI_AT.DataStream import HistoricalDataStream
+from FI_AT.Execution import BacktestExecution
+
+
+def _gapped(n=400, seed=3):
+    # 자산마다 bar 시각이 다른 긴 형식 데이터 (한 자산에 bar가 없는 시계 step이 생김)
+    df = synthetic_ohlcv(n, ["A0", "A1"], seed=seed)
+    rng = np.random.default_rng(seed)
+    return df[rng.random(len(df)) > 0.3].reset_index(drop=True)
+
+
+def test_cursor_matches_searchsorted():
+    series = BarSeries.from_frame(_gapped().query("asset == 'A0'").drop(columns=["interval", "asset"]))
+    times = series.times
+    cursor = BarCursor(series)
+    queries = np.concatenate([np.unique(np.r_[times, times + 30 * 10**9]), times[::-7], times[[0, -1, 5, 5, 3]]])
+    for t in queries:
+        i = int(np.searchsorted(times, t))
+        expected = i if i < len(times) and times[i] == t else -1
+        assert cursor.seek(int(t)) == expected
+
+
+def test_reused_frames_match_fresh_frames():
+    stream = HistoricalDataStream(_gapped())
+    keys = stream.store.keys()
+    reused = HistoricalDataStream(_gapped(), reuse_frames=True)
+    for t in stream.timeline():
+        stream.set_time(t)
+        reused.set_time(t)
+        for key in keys:
+            fresh, frame = stream.get_data(*key), reused.get_data(*key)
+            if fresh.empty:
+                assert frame.empty
+                continue
+            pd.testing.assert_frame_equal(frame, fresh)
+            # 같은 bar를 다시 읽으면 같은 객체
+            assert reused.get_data(*key) is frame
+
+
+@pytest.mark.parametrize("share_indicators", [True, False])
+def test_event_loop_with_reused_frames(share_indicators):
+    df = _gapped()
+    books = []
+    for reuse in (False, True):
+        _, position_manager, signal_hub = build(df, 4)
+        if not share_indicators:
+            for strategy in signal_hub.get_strategies():
+                strategy.use_registry(None)
+        BacktestExecution(signal_hub, position_manager, reuse_frames=reuse).run()
+        books.append({name: position_manager.get_equity(name) for name in position_manager.positions})
+        assert sum(len(position_manager.get_fills(name)) for name in position_manager.positions) > 0
+    assert books[0].keys() == books[1].keys()
+    for name in books[0]:
+        np.testing.assert_array_equal(books[0][name], books[1][name])
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from FI_AT.Downsample import downsample, lttb_indices, minmax_indices
+
+
+@pytest.mark.parametrize("n_out", [0, 1, 2, 3, 4, 5, 7, 10, 99])
+def test_output_within_n_out_and_keeps_ends(n_out):
+    y = np.random.default_rng(0).normal(size=1000).cumsum()
+    for idx in (minmax_indices(y, n_out), lttb_indices(np.arange(len(y)), y, n_out)):
+        assert len(idx) <= max(n_out, 2)
+        assert idx[0] == 0 and idx[-1] == len(y) - 1
+        assert np.all(np.diff(idx) > 0)
+
+
+def test_short_series_unchanged():
+    y = np.arange(5.0)
+    np.testing.assert_array_equal(minmax_indices(y, 5), np.arange(5))
+    np.testing.assert_array_equal(lttb_indices(y, y, 1), np.array([0, 4]))
+    x, _ = downsample(y, y, 2)
+    np.testing.assert_array_equal(x, [0.0, 4.0])
+
+
+def test_minmax_keeps_spike():
+    y = np.zeros(1000)
+    y[537] = 50.0
+    assert 537 in minmax_indices(y, 10)
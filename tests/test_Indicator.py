@@ -0,0 +1,34 @@
+import numpy as np
+
+from FI_AT.Indicator import SMA, RollingStd
+
+
+def _updates(indicator, values):
+    return np.array([indicator.update(x) for x in values])
+
+
+def test_nan_only_blanks_its_window():
+    values = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0])
+    expected = [np.nan] * 5 + [5.0, 6.0, 7.0, 8.0]
+    np.testing.assert_array_equal(_updates(SMA(3), values), expected)
+    np.testing.assert_array_equal(SMA(3).compute(values), expected)
+    assert np.isfinite(_updates(RollingStd(3), values)[-4:]).all()
+
+
+def test_large_value_leaving_window_does_not_cancel():
+    values = np.array([1e16, 1.0, 1.0, 1.0, 1.0])
+    assert _updates(SMA(3), values)[-1] == 1.0
+    assert SMA(3).compute(values)[-1] == 1.0
+    assert _updates(RollingStd(3), values)[-1] == 0.0
+    assert RollingStd(3).compute(values)[-1] == 0.0
+
+
+def test_update_matches_compute():
+    rng = np.random.default_rng(0)
+    values = rng.normal(100.0, 1.0, 500)
+    values[rng.integers(0, 500, 10)] = np.nan
+    values[rng.integers(0, 500, 5)] = np.inf
+    values[rng.integers(0, 500, 5)] = 1e15
+    for cls in (SMA, RollingStd):
+        for window in (2, 3, 20):
+            np.testing.assert_array_equal(_updates(cls(window), values), cls(window).compute(values))
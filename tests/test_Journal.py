@@ -0,0 +1,43 @@
+from FI_AT.Benchmark import build, make_strategy, synthetic_ohlcv
+from FI_AT.Execution import BacktestExecution, ReplayExecution
+from FI_AT.Journal import JournalRecorder, JournalReplayStream
+from FI_AT.Position import PositionManager
+from FI_AT.SignalHub import SignalHub
+
+
+def _record(path):
+    bars = synthetic_ohlcv(200, ["A0", "A1"], seed=5)
+    _, position_manager, signal_hub = build(bars, 4)
+    with JournalRecorder(path) as recorder:
+        signal_hub.recorder = recorder
+        BacktestExecution(signal_hub, position_manager).run()
+    return signal_hub.get_strategies(), position_manager
+
+
+def _replay(path, strategies):
+    position_manager = PositionManager()
+    signal_hub = SignalHub(JournalReplayStream(path), position_manager)
+    for strategy in strategies:
+        signal_hub.add_strategy(strategy)
+    return ReplayExecution(signal_hub, position_manager).verify(), position_manager
+
+
+def test_verify_round_trip(tmp_path):
+    path = str(tmp_path / "session.jnl")
+    recorded, books = _record(path)
+    keys = [SignalHub.feed_key(strategy) for strategy in recorded]
+    mismatches, replayed = _replay(path, [make_strategy(i, asset, interval) for i, (interval, asset) in enumerate(keys)])
+    assert mismatches == []
+    assert {name: replayed.get_position(name) for name in replayed.positions} == \
+        {name: books.get_position(name) for name in books.positions}
+    assert sum(len(books.get_fills(name)) for name in books.positions) > 0
+
+
+def test_verify_reports_changed_strategy(tmp_path):
+    path = str(tmp_path / "session.jnl")
+    recorded, _ = _record(path)
+    keys = [SignalHub.feed_key(strategy) for strategy in recorded]
+    strategies = [make_strategy(i, asset, interval) for i, (interval, asset) in enumerate(keys)]
+    strategies[0].set_parameters(short_window=2)
+    mismatches, _ = _replay(path, strategies)
+    assert mismatches
@@ -0,0 +1,38 @@
+from FI_AT.DataStream import MockDataStream
+from FI_AT.Execution import BacktestExecution
+from FI_AT.Portfolio import Portfolio
+from FI_AT.Position import PositionManager
+from FI_AT.SignalHub import SignalHub
+from FI_AT.Strategy import MomentumStrategy, SmaCrossStrategy
+
+
+def _run(vectorized):
+    position_manager = PositionManager(portfolio=Portfolio())
+    signal_hub = SignalHub(MockDataStream('1d', 'KTB'), position_manager)
+    signal_hub.add_strategy(SmaCrossStrategy())
+    signal_hub.add_strategy(MomentumStrategy())
+    BacktestExecution(signal_hub, position_manager, vectorized=vectorized).run()
+    return position_manager.portfolio.snapshot()
+
+
+def test_vectorized_run_keeps_drawdown_path():
+    # 한도가 없어도 portfolio가 있으면 bar-by-bar와 같은 peak/낙폭 경로를 기록
+    vectorized, event = _run(True), _run(False)
+    assert vectorized == event
+    assert event["max_drawdown"] > 0
+
+
+def test_portfolio_marked_once_per_feed_bar():
+    portfolio = Portfolio()
+    position_manager = PositionManager(portfolio=portfolio)
+    signal_hub = SignalHub(MockDataStream('1d', 'KTB'), position_manager)
+    for _ in range(3):
+        signal_hub.add_strategy(SmaCrossStrategy())
+        signal_hub.add_strategy(MomentumStrategy())
+    calls = []
+    mark = portfolio.mark
+    portfolio.mark = lambda asset, price: (calls.append(asset), mark(asset, price))
+    BacktestExecution(signal_hub, position_manager).run()
+    # bar당 피드 1번 + 체결 시 on_fill에서 1번 (구독 전략 수와 무관)
+    n_bars = len(position_manager.get_equity("SmaCrossStrategy")) // 3
+    assert len(calls) == n_bars + portfolio.fills
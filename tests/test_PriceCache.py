@@ -0,0 +1,47 @@
+import pandas as pd
+
+from FI_AT.PriceCache import COLUMNS, PriceCache
+
+
+class FakeFetch:
+    # DB 대신 메모리 table에서 [from_dt, to_dt) 구간을 돌려줌
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.calls = []
+
+    def __call__(self, symbol, from_dt, to_dt):
+        self.calls.append((pd.Timestamp(from_dt), pd.Timestamp(to_dt)))
+        start, end = pd.Timestamp(from_dt), pd.Timestamp(to_dt)
+        rows = [r for r in self.rows if start <= r["trade_date"] < end]
+        return pd.DataFrame(rows, columns=["trade_date"] + COLUMNS)
+
+
+def _row(ts, price):
+    return {"trade_date": ts, "open": price, "high": price, "low": price, "close": price, "volume": 1}
+
+
+def test_late_row_is_fetched_on_next_call(tmp_path):
+    now = pd.Timestamp.now().floor("min")
+    start = now - pd.Timedelta(hours=3)
+    fetch = FakeFetch([_row(now - pd.Timedelta(hours=2), 100.0)])
+    cache = PriceCache(fetch, root=str(tmp_path), ingest_lag=900)
+
+    assert len(cache.get("KTB", start, now)) == 1
+
+    # 첫 조회 뒤에 DB에 들어온 지난 시각의 row
+    fetch.rows.append(_row(now - pd.Timedelta(minutes=5), 101.0))
+    df = cache.get("KTB", start, now)
+    assert list(df["close"]) == [100.0, 101.0]
+
+    # 적재가 끝났다고 보는 구간은 다시 조회하지 않음
+    since = fetch.calls[-1][0]
+    assert since >= now - pd.Timedelta(seconds=900) - pd.Timedelta(minutes=1)
+
+
+def test_old_range_is_cached(tmp_path):
+    fetch = FakeFetch([_row(pd.Timestamp("2024-01-02 09:00"), 100.0)])
+    cache = PriceCache(fetch, root=str(tmp_path))
+    cache.get("KTB", "2024-01-01", "2024-01-03")
+    cache.get("KTB", "2024-01-01", "2024-01-03")
+    assert len(fetch.calls) == 1
+    assert cache.stats["hits"] == 1
@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pytest
+
+from FI_AT.Benchmark import build, synthetic_ohlcv
+from FI_AT.Execution import BacktestExecution
+from FI_AT.Sharding import ShardedExecution
+from FI_AT.Strategy import SmaCrossStrategy
+
+
+class CrashOnce(SmaCrossStrategy):
+    # worker 안에서 crash_at 번째 bar에 프로세스를 종료 (flag 파일이 있으면 재시작 후에는 정상 실행)
+    def __init__(self, flag, crash_at):
+        super().__init__()
+        self._name = "CrashOnce"
+        self.flag = flag
+        self.crash_at = crash_at
+        self.calls = 0
+
+    def rule(self, frame):
+        self.calls += 1
+        if self.calls == self.crash_at and not os.path.exists(self.flag):
+            open(self.flag, "w").close()
+            os._exit(3)
+        return super().rule(frame)
+
+
+@pytest.fixture(scope="module")
+def bars():
+    return synthetic_ohlcv(300, ["A0", "A1"], seed=3)
+
+
+def _run(bars, sharded, extra=None, **kwargs):
+    _, position_manager, signal_hub = build(bars, 4)
+    if extra is not None:
+        extra.set_parameters(interval="1m", target_asset="A0")
+        signal_hub.add_strategy(extra)
+    if sharded:
+        ShardedExecution(signal_hub, position_manager, **kwargs).run()
+    else:
+        BacktestExecution(signal_hub, position_manager).run()
+    return position_manager
+
+
+def _assert_same_books(a, b):
+    assert a.positions.keys() == b.positions.keys()
+    assert sum(len(a.get_fills(name)) for name in a.positions) > 0
+    for name in a.positions:
+        np.testing.assert_array_equal(a.get_fills(name), b.get_fills(name))
+        np.testing.assert_array_equal(a.get_equity(name), b.get_equity(name))
+
+
+def test_sharded_matches_serial(bars):
+    _assert_same_books(_run(bars, False), _run(bars, True, n_workers=2))
+
+
+@pytest.mark.parametrize("max_history", [None, 50])
+def test_worker_crash_restarts_and_matches_serial(bars, tmp_path, capsys, max_history):
+    flag = str(tmp_path / "crashed")
+    serial = _run(bars, False, SmaCrossStrategy())
+    sharded = _run(bars, True, CrashOnce(flag, crash_at=120), n_workers=2, max_history=max_history)
+    assert os.path.exists(flag)
+    assert "restarting" in capsys.readouterr().out
+    serial.positions["CrashOnce"] = serial.positions.pop("SmaCrossStrategy")
+    _assert_same_books(serial, sharded)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from FI_AT.DataStream import HistoricalDataStream
+from FI_AT.Execution import BacktestExecution
+from FI_AT.Portfolio import Portfolio
+from FI_AT.Position import PositionManager
+from FI_AT.SignalHub import SignalHub
+from FI_AT.Strategy import SmaCrossStrategy
+
+
+def _prices():
+    rng = np.random.default_rng(7)
+    times = pd.date_range("2024-01-02 09:00", periods=300, freq="1min")
+    frames = []
+    for asset, drift in (("A", 0.0), ("B", 0.05)):
+        close = 100 + np.cumsum(rng.normal(drift, 1.0, len(times)))
+        frames.append(pd.DataFrame({"trade_date": times, "asset": asset, "interval": "1m", "close": close}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _run(vectorized, move, portfolio=None):
+    df = _prices()
+    position_manager = PositionManager(portfolio=portfolio)
+    signal_hub = SignalHub(HistoricalDataStream(df), position_manager)
+    strategy = SmaCrossStrategy()
+    strategy.set_parameters(interval='1m', target_asset='A')
+    signal_hub.add_strategy(strategy)
+    if move:
+        strategy.set_parameters(target_asset='B')
+    BacktestExecution(signal_hub, position_manager, vectorized=vectorized).run()
+    return signal_hub, position_manager, df
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_feed_change_after_registration(vectorized):
+    signal_hub, position_manager, df = _run(vectorized, move=True)
+    assert list(signal_hub.get_subscriptions()) == [('1m', 'B')]
+    fills = position_manager.get_fills("SmaCrossStrategy")
+    assert len(fills)
+    b_prices = set(df.loc[df["asset"] == "B", "close"])
+    assert set(fills["price"]) <= b_prices
+
+
+def test_event_and_vectorized_agree_after_feed_change():
+    _, event, _ = _run(False, move=True)
+    _, vectorized, _ = _run(True, move=True)
+    assert np.array_equal(event.get_fills("SmaCrossStrategy")["price"], vectorized.get_fills("SmaCrossStrategy")["price"])
+
+
+def test_feed_change_reassigns_portfolio_asset():
+    signal_hub, position_manager, _ = _run(False, move=True, portfolio=Portfolio())
+    portfolio = position_manager.portfolio
+    assert portfolio.asset_of("SmaCrossStrategy") == 'B'
+    assert set(portfolio.net) <= {'B'}
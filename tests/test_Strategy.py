@@ -0,0 +1,36 @@
+import pandas as pd
+
+from FI_AT.Strategy import SmaCrossStrategy
+
+
+def _warm(strategy, n=30):
+    frames = [pd.DataFrame({"trade_date": [pd.Timestamp("2024-01-01") + pd.Timedelta(days=i)],
+                            "close": [100.0 + i]}) for i in range(n)]
+    for frame in frames:
+        strategy.rule(frame)
+
+
+def test_feed_keys_do_not_reset_indicators():
+    strategy = SmaCrossStrategy()
+    _warm(strategy)
+    short_ma = strategy.indicators['short_ma']
+    strategy.set_parameters(interval='1m', target_asset='B')
+    assert (strategy.interval, strategy.target_asset) == ('1m', 'B')
+    assert strategy.indicators['short_ma'] is short_ma
+    assert short_ma.ready
+    assert 'interval' not in strategy.get_parameters()
+
+
+def test_unchanged_parameter_keeps_state():
+    strategy = SmaCrossStrategy()
+    _warm(strategy)
+    strategy.set_parameters(short_window=strategy.short_window)
+    assert strategy.indicators['short_ma'].ready
+
+
+def test_changed_parameter_redeclares_indicators():
+    strategy = SmaCrossStrategy()
+    _warm(strategy)
+    strategy.set_parameters(short_window=7)
+    assert strategy.indicators['short_ma'].window == 7
+    assert not strategy.indicators['short_ma'].ready